@@ -3,28 +3,228 @@
 # Created: April 2025
 
 import argparse
+import collections
 import concurrent.futures
+import contextlib
+import csv
+import gzip
+import importlib
+import itertools
 import json
 import os
+import queue
+import random
 import re
+import signal
 import socket
+import sqlite3
 import sys
+import threading
 import time
-import whois
-import dns.resolver
-import requests
-from bs4 import BeautifulSoup
+import zlib
 from colorama import Fore, Style, init
-from datetime import datetime
-from requests.exceptions import RequestException, ConnectionError, Timeout
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 from urllib.parse import urlparse
 
+class LazyModule:
+    """Stand-in for a module that is imported on first attribute access, so a command only pays for what it uses.
+    
+    The import happens once under a lock, since the first access may come from
+    several worker threads at the same time. Listed submodules are imported along
+    with the package.
+    """
+    _lock = threading.Lock()
+    
+    def __init__(self, name, *submodules):
+        self._name = name
+        self._submodules = submodules
+        self._module = None
+    
+    def _load(self):
+        """Import the module now and return it."""
+        if self._module is None:
+            with LazyModule._lock:
+                if self._module is None:
+                    for submodule in self._submodules:
+                        importlib.import_module(f"{self._name}.{submodule}")
+                    self._module = importlib.import_module(self._name)
+        return self._module
+    
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+# Heavy dependencies load on first use: --version, --help and daemon clients never import them,
+# and a username search never loads WHOIS, DNS or HTML parsing code
+asyncio = LazyModule("asyncio")
+bs4 = LazyModule("bs4")
+dns = LazyModule("dns", "resolver")
+multiprocessing = LazyModule("multiprocessing")
+requests = LazyModule("requests")
+whois = LazyModule("whois")
+
 # Initialize colorama
 init(autoreset=True)
 
 # Version
 VERSION = "1.0.0"
 
+# Default number of concurrent probes for username searches
+DEFAULT_WORKERS = 10
+
+# Default connection caps for the asyncio probe engine
+DEFAULT_ASYNC_CONCURRENCY = 200
+DEFAULT_PER_HOST_LIMIT = 8
+
+# Per-request timeout in seconds; the read timeout never exceeds it
+REQUEST_TIMEOUT = 10
+
+# Adaptive timeouts: connect timeout, floor for learned read timeouts, and the multiple of a host's
+# p95 latency used as its read timeout once enough samples have been seen
+CONNECT_TIMEOUT = 3.05
+MIN_READ_TIMEOUT = 2.0
+TIMEOUT_LATENCY_FACTOR = 3
+LATENCY_WINDOW = 50
+MIN_LATENCY_SAMPLES = 5
+
+# Circuit breaker: consecutive failures before a host is skipped, and for how many seconds
+CIRCUIT_FAILURE_THRESHOLD = 5
+CIRCUIT_COOLDOWN = 60.0
+
+# Overall time allowed per username or domain, in seconds
+DEFAULT_TARGET_BUDGET = 60
+
+# Username permutations: rules in the order they are nested (case innermost, so
+# variants differing only in case are generated next to each other)
+PERMUTATION_RULES = ("separators", "leet", "suffix", "case")
+PERMUTATION_SEPARATORS = ("", ".", "_", "-")
+LEET_SUBSTITUTIONS = {"a": "4", "e": "3", "i": "1", "o": "0", "s": "5", "t": "7"}
+DEFAULT_PERMUTATION_SUFFIXES = "1-99"
+DEFAULT_DEDUPE_WINDOW = 100000
+
+# Connection reuse: site hostnames resolved before a run starts are kept for their DNS record's TTL,
+# at most ADDRESS_CACHE_TTL seconds
+ADDRESS_CACHE_TTL = 300
+ADDRESS_CACHE_SIZE = 10000
+PRERESOLVE_WORKERS = 16
+
+# Multi-process runs: work units handed to a worker process at a time, and how long units claimed
+# from a shared work queue stay reserved before another host may take them over
+SHARD_BATCH_SIZE = 16
+WORK_QUEUE_LEASE = 600
+WORK_QUEUE_FLUSH = 64
+
+# Daemon mode: a warm process that forks per invocation. Clients opt in by pointing FINDERBUSTER_DAEMON
+# at its socket; a job's output ends with DAEMON_EXIT_MARKER and its exit status
+DEFAULT_DAEMON_SOCKET = os.path.join(os.path.expanduser("~"), ".cache", "finderbuster", "daemon.sock")
+DAEMON_ENV = "FINDERBUSTER_DAEMON"
+DAEMON_EXIT_MARKER = b"\0FINDERBUSTER-EXIT "
+
+# API server (serve command): default listen address, and content types for streamed results
+DEFAULT_SERVE_HOST = "127.0.0.1"
+DEFAULT_SERVE_PORT = 8080
+STREAM_CONTENT_TYPES = {"ndjson": "application/x-ndjson", "sse": "text/event-stream"}
+
+# Monitor mode: where target states are kept, the base and longest check intervals in seconds (quiet targets
+# back off from one to the other), the random spread of each interval, targets checked per batch, and the
+# longest an idle monitor sleeps before looking at its schedule and watch list again
+DEFAULT_MONITOR_STORE = os.path.join(os.path.expanduser("~"), ".cache", "finderbuster", "monitor.sqlite3")
+DEFAULT_MONITOR_INTERVAL = 3600
+DEFAULT_MONITOR_MAX_INTERVAL = 86400
+DEFAULT_MONITOR_JITTER = 0.1
+DEFAULT_MONITOR_BATCH = 500
+MONITOR_IDLE_POLL = 60
+
+# Cached results a monitor always looks up afresh (pages still revalidate with conditional requests),
+# and profile fields left out of change tracking
+MONITOR_FRESH_OPERATIONS = ("site", "social", "dns", "ip", "http", "whois_raw")
+MONITOR_IGNORED_FIELDS = ("exists", "note", "profile_url", "username")
+
+# Body streaming limits for probes: stop reading after the budget even if no marker was seen
+PROBE_CHUNK_SIZE = 16 * 1024
+PROBE_BYTE_BUDGET = 512 * 1024
+
+# Unread bodies up to this size are drained after a probe so its keep-alive connection can be reused
+PROBE_DRAIN_LIMIT = 64 * 1024
+
+# HTML parser backends for profile extraction, fastest first, and how much of a page a head-only parse reads
+HTML_BACKENDS = ("selectolax", "lxml", "html.parser")
+HEAD_PARSE_LIMIT = 256 * 1024
+
+# Result cache location, size bound and per-operation time-to-live in seconds
+DEFAULT_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "finderbuster", "cache.sqlite3")
+DEFAULT_CACHE_ENTRIES = 200000
+CACHE_TTLS = {
+    "site": 6 * 3600,
+    "social": 6 * 3600,
+    "whois_raw": 3 * 86400,
+    "whois_server": 30 * 86400,
+    "dns": 3600,
+    "ip": 86400,
+    "http": 3600
+}
+
+# Stored responses for conditional requests: validators, verdicts and compressed page bodies,
+# bounded by entry count and total body size
+DEFAULT_RESPONSE_ENTRIES = 100000
+DEFAULT_RESPONSE_BYTES = 256 * 1024 * 1024
+
+# DNS record types collected for domains
+DNS_RECORD_TYPES = ["A", "AAAA", "MX", "NS", "TXT", "CNAME"]
+
+# Shared DNS resolver defaults: per-nameserver timeout in seconds and answer cache size
+DNS_TIMEOUT = 3
+DEFAULT_DNS_CACHE_SIZE = 50000
+
+# WHOIS over port 43: where TLD servers are looked up, per-server limits (queries at once and per second)
+# to avoid bans, socket timeout, longest wait for a server's turn, and largest response read
+IANA_WHOIS_SERVER = "whois.iana.org"
+WHOIS_PORT = 43
+WHOIS_SERVER_CONCURRENCY = 4
+WHOIS_SERVER_RATE = 2.0
+WHOIS_TIMEOUT = 10
+WHOIS_MAX_WAIT = 15
+WHOIS_MAX_RESPONSE = 1024 * 1024
+
+# Servers that need more than the bare domain in a query, referral lines pointing to the next server,
+# and the short replies servers send instead of a record when queried too often
+WHOIS_QUERY_FORMATS = {
+    "whois.denic.de": "-T dn,ace {}",
+    "whois.jprs.jp": "{}/e"
+}
+WHOIS_REFERRAL = re.compile(r"^[ \t]*(?:refer|whois|Registrar WHOIS Server|ReferralServer)[ \t]*:[ \t]*(?:r?whois://)?"
+                            r"([A-Za-z0-9-]+(?:\.[A-Za-z0-9-]+)+)", re.I | re.M)
+WHOIS_THROTTLED = re.compile(r"limit exceeded|exceeded .{0,30}(?:limit|quota)|too many (?:requests|queries|connections)|try again later",
+                             re.I)
+
+# Per-stage time limits in seconds for domain lookups
+DOMAIN_STAGE_TIMEOUTS = {
+    "whois": 20,
+    "dns": 5,
+    "ip": 15,
+    "http": 15
+}
+
+# Adaptive per-host rate limiting: starting, ceiling and floor rates in requests per second,
+# how many hosts are tracked at once, plus bounded exponential-backoff retries for throttled probes
+DEFAULT_HOST_RATE = 5.0
+MAX_HOST_RATE = 20.0
+MIN_HOST_RATE = 0.2
+MAX_TRACKED_HOSTS = 10000
+DEFAULT_MAX_RETRIES = 3
+BACKOFF_BASE = 1.0
+BACKOFF_MAX = 60.0
+
+# Responses that mean "slow down" rather than "profile exists" (999 is LinkedIn's bot block)
+THROTTLE_STATUS_CODES = (429, 503, 999)
+RATE_LIMITED_MESSAGE = "Rate limited (inconclusive)"
+CIRCUIT_OPEN_MESSAGE = "Skipped: host unavailable (inconclusive)"
+BUDGET_EXHAUSTED_MESSAGE = "Skipped: time budget exhausted (inconclusive)"
+
+# Metrics: latency histogram bucket bounds in seconds, and how often the Prometheus file is rewritten
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+METRICS_EXPORT_INTERVAL = 15
+
 # User-Agent for requests
 USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36"
 
@@ -45,165 +245,2770 @@ SITES = {
     "Instagram": {
         "url": "https://www.instagram.com/{}/",
         "error_type": "response_code",
-        "error_value": 404
+        "error_value": 404,
+        "tags": ["social", "photo"],
+        "profile": "instagram"
     },
     "Twitter/X": {
         "url": "https://twitter.com/{}",
         "error_type": "message",
-        "error_value": "This account doesn't exist"
+        "error_value": "This account doesn't exist",
+        "tags": ["social"],
+        "profile": "twitter"
     },
     "Facebook": {
         "url": "https://www.facebook.com/{}",
         "error_type": "response_code",
-        "error_value": 404
+        "error_value": 404,
+        "tags": ["social"]
     },
     "TikTok": {
         "url": "https://www.tiktok.com/@{}",
         "error_type": "message",
-        "error_value": "Couldn't find this account"
+        "error_value": "Couldn't find this account",
+        "tags": ["social", "video"]
     },
     "YouTube": {
         "url": "https://www.youtube.com/@{}",
         "error_type": "message",
-        "error_value": "404 Not Found"
+        "error_value": "404 Not Found",
+        "tags": ["video"]
     },
     "LinkedIn": {
         "url": "https://www.linkedin.com/in/{}",
         "error_type": "response_code",
-        "error_value": 404
+        "error_value": 404,
+        "tags": ["social", "professional"],
+        "profile": "linkedin"
     },
     "Reddit": {
         "url": "https://www.reddit.com/user/{}",
         "error_type": "response_code",
-        "error_value": 404
+        "error_value": 404,
+        "tags": ["social", "forum"]
     },
     "Pinterest": {
         "url": "https://www.pinterest.com/{}/",
         "error_type": "response_code",
-        "error_value": 404
+        "error_value": 404,
+        "tags": ["social", "photo"]
     },
     "GitHub": {
         "url": "https://github.com/{}",
         "error_type": "response_code",
-        "error_value": 404
+        "error_value": 404,
+        "tags": ["dev"],
+        "profile": "github"
     },
     "Tumblr": {
         "url": "https://{}.tumblr.com",
         "error_type": "response_code",
-        "error_value": 404
+        "error_value": 404,
+        "tags": ["social", "blog"]
     },
     "Medium": {
         "url": "https://medium.com/@{}",
         "error_type": "response_code",
-        "error_value": 404
+        "error_value": 404,
+        "tags": ["blog"]
     },
     "Quora": {
         "url": "https://www.quora.com/profile/{}",
         "error_type": "response_code",
-        "error_value": 404
+        "error_value": 404,
+        "tags": ["forum"]
     },
     "Twitch": {
         "url": "https://www.twitch.tv/{}",
         "error_type": "message",
-        "error_value": "Sorry. Unless you've got a time machine, that content is unavailable."
+        "error_value": "Sorry. Unless you've got a time machine, that content is unavailable.",
+        "tags": ["video", "gaming"]
     }
 }
 
+# Profile extraction selectors: field -> (CSS selector, attribute or None for the element text)
+OG_META_SELECTORS = {
+    "title": ('meta[property="og:title"]', "content"),
+    "description": ('meta[property="og:description"]', "content"),
+    "profile_pic_url": ('meta[property="og:image"]', "content")
+}
+
+GITHUB_PROFILE_SELECTORS = {
+    "full_name": ('span[itemprop="name"]', None),
+    "bio": ("div.p-note, div.user-profile-bio", None),
+    "location": ('li[itemprop="homeLocation"]', None),
+    "company": ('li[itemprop="worksFor"]', None),
+    "website": ('li[itemprop="url"] a', "href"),
+    "twitter": ('li[itemprop="social"] a[href*="twitter.com"], li[itemprop="social"] a[href*="//x.com"]', None),
+    "followers": ('a[href$="tab=followers"] span.text-bold', None),
+    "following": ('a[href$="tab=following"] span.text-bold', None),
+    "repositories": ('a[href$="tab=repositories"] span.Counter', None),
+    "contributions": ("div.js-yearly-contributions h2", None)
+}
+
+# Platforms supported by the social command, aliases, and how many extractions may run per platform at once
+SOCIAL_PLATFORMS = ("instagram", "twitter", "github", "linkedin")
+SOCIAL_PLATFORM_ALIASES = {"x": "twitter"}
+SOCIAL_PLATFORM_CONCURRENCY = {
+    "instagram": 2,
+    "twitter": 4,
+    "github": 8,
+    "linkedin": 2
+}
+DEFAULT_PLATFORM_CONCURRENCY = 4
+
+INSTAGRAM_SHARED_DATA = re.compile(r"window\._sharedData\s*=\s*(\{.*?\});?\s*</script>", re.S)
+HTML_HEAD_END = re.compile(r"</head\s*>", re.I)
+
+def read_targets(path):
+    """Yield targets from a file (or stdin when path is '-'), one per line."""
+    handle = sys.stdin if path == "-" else open(path, encoding="utf-8")
+    try:
+        for line in handle:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                yield line
+    finally:
+        if handle is not sys.stdin:
+            handle.close()
+
+def normalize_url(url):
+    """Normalize a URL for comparing requests: lowercase scheme and host, no default port or fragment."""
+    parts = urlparse(url)
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").rstrip(".")
+    netloc = host if parts.port in (None, {"http": 80, "https": 443}.get(scheme)) else f"{host}:{parts.port}"
+    return parts._replace(scheme=scheme, netloc=netloc, fragment="").geturl()
+
+def platform_key(platform):
+    """Normalize a social platform name, resolving aliases such as x -> twitter."""
+    platform = platform.strip().lower()
+    return SOCIAL_PLATFORM_ALIASES.get(platform, platform)
+
+def parse_permutation_rules(spec):
+    """Parse a comma-separated list of permutation rules ("all" for every rule)."""
+    rules = [rule.strip().lower() for rule in spec.split(",") if rule.strip()]
+    if rules == ["all"]:
+        return PERMUTATION_RULES
+    unknown = set(rules) - set(PERMUTATION_RULES)
+    if unknown or not rules:
+        raise ValueError(f"unknown permutation rule(s) '{', '.join(sorted(unknown)) or spec}'; "
+                         f"choose from {', '.join(PERMUTATION_RULES)}")
+    return tuple(rule for rule in PERMUTATION_RULES if rule in rules)
+
+def parse_suffixes(spec):
+    """Parse a numeric suffix spec such as "1-99,1990-2025,00-09" into (range, width) pairs.
+    
+    A bound written with a leading zero keeps its width, so 00-09 yields 00, 01, ... 09.
+    """
+    suffixes = []
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        start, _, stop = part.partition("-")
+        stop = stop or start
+        if not (start.isdigit() and stop.isdigit()) or int(stop) < int(start):
+            raise ValueError(f"invalid suffix range '{part}'")
+        width = len(start) if start.startswith("0") and len(start) > 1 else 0
+        suffixes.append((range(int(start), int(stop) + 1), width))
+    return suffixes
+
+def username_tokens(username):
+    """Split a username into words at separators and camelCase boundaries."""
+    spaced = re.sub(r"(?<=[a-z0-9])(?=[A-Z])", " ", username)
+    return [token for token in re.split(r"[\s._-]+", spaced) if token]
+
+def _separator_variants(username):
+    tokens = username_tokens(username)
+    if len(tokens) < 2:
+        yield username
+        return
+    for separator in PERMUTATION_SEPARATORS:
+        yield separator.join(tokens)
+
+def _leet_variants(username):
+    options = [(char, LEET_SUBSTITUTIONS[char.lower()]) if char.lower() in LEET_SUBSTITUTIONS else (char,)
+               for char in username]
+    for combination in itertools.product(*options):
+        yield "".join(combination)
+
+def _suffix_variants(username, suffixes):
+    yield username
+    for numbers, width in suffixes:
+        for number in numbers:
+            yield f"{username}{number:0{width}d}"
+
+def _case_variants(username):
+    yield from dict.fromkeys((username, username.lower(), username.upper(), username[:1].upper() + username[1:].lower()))
+
+def _expand(candidates, stage):
+    for candidate in candidates:
+        yield from stage(candidate)
+
+def permute_username(username, rules=PERMUTATION_RULES, suffixes=()):
+    """Lazily yield variants of a username, the username itself first.
+    
+    Each rule is a stage that turns one candidate into several, and the
+    stages are nested in PERMUTATION_RULES order. Only one candidate per
+    stage is alive at a time, so rules producing hundreds of thousands of
+    variants stream in constant memory. Repeats are not removed here; the
+    probe scheduler drops them per site with a DedupeWindow.
+    """
+    stages = {
+        "separators": _separator_variants,
+        "leet": _leet_variants,
+        "suffix": lambda candidate: _suffix_variants(candidate, suffixes),
+        "case": _case_variants,
+    }
+    candidates = iter([username])
+    for rule in PERMUTATION_RULES:
+        if rule in rules:
+            candidates = _expand(candidates, stages[rule])
+    
+    yield username
+    yield from (candidate for candidate in candidates if candidate != username)
+
+def permute_usernames(usernames, rules=PERMUTATION_RULES, suffixes=(), max_variants=None):
+    """Chain the variants of every username, at most max_variants each."""
+    for username in usernames:
+        yield from itertools.islice(permute_username(username, rules, suffixes), max_variants)
+
+class DedupeWindow:
+    """Remembers the most recent keys so repeats can be dropped without unbounded memory."""
+    
+    def __init__(self, size=DEFAULT_DEDUPE_WINDOW):
+        self.size = size
+        self.keys = collections.OrderedDict()
+        self.duplicates = 0
+    
+    def seen(self, key):
+        """Record key; returns True if it was already in the window."""
+        if key in self.keys:
+            self.keys.move_to_end(key)
+            self.duplicates += 1
+            return True
+        self.keys[key] = None
+        if len(self.keys) > self.size:
+            self.keys.popitem(last=False)
+        return False
+
+def read_profile_targets(path, platforms=None):
+    """Yield (platform, identifier) pairs from a CSV or JSON Lines file (or stdin when path is '-').
+    
+    CSV lines are "platform,identifier" (a header row is skipped) and JSON lines
+    are objects with "platform" and "identifier" keys. When platforms is given,
+    each line is a bare identifier profiled on every one of those platforms.
+    """
+    for line_number, line in enumerate(read_targets(path), 1):
+        if platforms:
+            for platform in platforms:
+                yield platform, line
+            continue
+        
+        try:
+            if line.startswith("{"):
+                entry = json.loads(line)
+                pair = (entry["platform"], entry["identifier"])
+            else:
+                pair = tuple(field.strip() for field in next(csv.reader([line]))[:2])
+                if pair == ("platform", "identifier"):
+                    continue
+            if len(pair) != 2 or not all(pair):
+                raise ValueError("expected a platform and an identifier")
+        except (ValueError, KeyError, TypeError) as e:
+            print(f"{Fore.YELLOW}[!] Skipping line {line_number} of {path}: {e}")
+            continue
+        yield pair
+
+class ResultSink:
+    """Base class for output sinks: write() records, then close()."""
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+    
+    def write(self, record):
+        raise NotImplementedError
+    
+    def close(self):
+        pass
+
+class JsonLinesSink(ResultSink):
+    """Output sink writing one JSON record per line, flushed as each record arrives.
+    
+    Optional gzip or zstd compression is flushed per record too, so output
+    written before a crash or Ctrl-C remains readable.
+    """
+    
+    def __init__(self, path, compression=None, append=False):
+        self.path = path
+        self.count = 0
+        mode = "a" if append else "w"
+        
+        if compression == "gzip":
+            self.handle = gzip.open(path, mode + "t", encoding="utf-8")
+        elif compression == "zstd":
+            try:
+                import zstandard
+            except ImportError:
+                raise RuntimeError("zstd compression requires the zstandard package (pip install zstandard)")
+            self.handle = zstandard.open(path, mode + "t", encoding="utf-8")
+        else:
+            self.handle = open(path, mode, encoding="utf-8")
+    
+    def write(self, record):
+        """Write and flush a single record."""
+        self.handle.write(json.dumps(record, default=str, separators=(",", ":")) + "\n")
+        self.handle.flush()
+        self.count += 1
+    
+    def close(self):
+        """Close the underlying file."""
+        self.handle.close()
+
+class JsonSink(ResultSink):
+    """Output sink collecting records and writing them as one JSON document on close."""
+    
+    def __init__(self, path, compression=None, compact=False):
+        self.path = path
+        self.compression = compression
+        self.indent = None if compact else 4
+        self.records = []
+        self.count = 0
+    
+    def write(self, record):
+        """Buffer a record until the sink is closed."""
+        self.records.append(record)
+        self.count += 1
+    
+    def close(self):
+        """Write the buffered records as a JSON list."""
+        write_json(self.path, self.records, self.compression, self.indent is None)
+
+def write_json(path, document, compression=None, compact=False):
+    """Write a single JSON document, optionally compressed."""
+    indent = None if compact else 4
+    if compression:
+        with JsonLinesSink(path, compression) as sink:
+            sink.handle.write(json.dumps(document, default=str, indent=indent))
+    else:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(document, f, default=str, indent=indent)
+
+def open_sink(path, fmt="jsonl", compression=None, compact=False, append=False):
+    """Open an output sink for the given format ("json" or "jsonl")."""
+    if fmt == "json":
+        if append:
+            raise ValueError("Only JSON Lines output can be appended to")
+        return JsonSink(path, compression, compact)
+    return JsonLinesSink(path, compression, append)
+
+def output_extension(fmt, compression=None):
+    """File extension for an output format and compression."""
+    return fmt + {"gzip": ".gz", "zstd": ".zst"}.get(compression, "")
+
+class Checkpoint:
+    """Journal of completed (target, unit) pairs that lets a batch run resume.
+    
+    Each finished unit is appended to journal.log in the run directory and
+    flushed immediately. Records are written to the output before they are
+    journaled, so an interrupted run may repeat a unit but never loses one.
+    The run's settings are kept in run.json so --resume can reopen the same
+    output file.
+    """
+    
+    def __init__(self, run_dir, resume=False):
+        self.run_dir = run_dir
+        self.journal_path = os.path.join(run_dir, "journal.log")
+        self.meta_path = os.path.join(run_dir, "run.json")
+        self.done = set()
+        
+        os.makedirs(run_dir, exist_ok=True)
+        if resume:
+            self._load()
+        
+        self.journal = open(self.journal_path, "a", encoding="utf-8")
+        
+        # Terminate a line cut short by a crash so the next entry starts cleanly
+        if self.journal.tell() and not self._ends_with_newline():
+            self.journal.write("\n")
+    
+    def _ends_with_newline(self):
+        """Check whether the journal file ends with a newline."""
+        with open(self.journal_path, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b"\n"
+    
+    def _load(self):
+        """Read completed units from an existing journal."""
+        if os.path.exists(self.journal_path):
+            with open(self.journal_path, encoding="utf-8") as f:
+                self.done.update(line.rstrip("\n") for line in f if line.strip())
+    
+    def is_done(self, target, unit):
+        """Tell whether a unit of work was completed in an earlier run."""
+        return f"{target}\t{unit}" in self.done
+    
+    def mark(self, target, unit):
+        """Record a unit of work as completed."""
+        key = f"{target}\t{unit}"
+        self.journal.write(key + "\n")
+        self.journal.flush()
+        self.done.add(key)
+    
+    def load_meta(self):
+        """Return the saved run settings, or None for a new run."""
+        if not os.path.exists(self.meta_path):
+            return None
+        with open(self.meta_path, encoding="utf-8") as f:
+            return json.load(f)
+    
+    def save_meta(self, meta):
+        """Save the run settings."""
+        with open(self.meta_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f, indent=4)
+    
+    def close(self, complete=False):
+        """Close the journal; a completed run's journal is compacted to one line per unit."""
+        self.journal.close()
+        if complete:
+            tmp_path = self.journal_path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.writelines(key + "\n" for key in sorted(self.done))
+            os.replace(tmp_path, self.journal_path)
+            
+            meta = self.load_meta() or {}
+            meta["complete"] = True
+            self.save_meta(meta)
+
+class WorkQueue:
+    """Work units shared through a SQLite file so several hosts can split one job.
+    
+    Every host adds the same units (repeats are ignored) and its worker
+    processes claim them in batches. A claimed batch is leased for `lease`
+    seconds; units left unfinished by a host that died can be claimed again
+    once their lease runs out. The file must live on a filesystem with
+    working locks, since SQLite relies on them between hosts.
+    """
+    
+    def __init__(self, path, lease=WORK_QUEUE_LEASE):
+        self.path = path
+        self.lease = lease
+        self.finished = []
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, timeout=60, isolation_level=None, check_same_thread=False)
+        self.conn.execute("CREATE TABLE IF NOT EXISTS units (id INTEGER PRIMARY KEY, unit TEXT UNIQUE NOT NULL, "
+                          "state INTEGER NOT NULL DEFAULT 0, owner TEXT, lease_until REAL)")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS units_state ON units (state, id)")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+    
+    def add(self, units, batch=500):
+        """Queue JSON-serializable units not queued yet, then mark the queue as fully loaded."""
+        units = iter(units)
+        while True:
+            rows = [(json.dumps(unit),) for unit in itertools.islice(units, batch)]
+            if not rows:
+                break
+            with self.lock, self.conn:
+                self.conn.execute("BEGIN IMMEDIATE")
+                self.conn.executemany("INSERT OR IGNORE INTO units (unit) VALUES (?)", rows)
+        with self.lock:
+            self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('loaded', '1')")
+    
+    def claim(self, owner, count=SHARD_BATCH_SIZE):
+        """Lease up to count pending (or abandoned) units to owner and return them."""
+        now = time.time()
+        with self.lock, self.conn:
+            self.conn.execute("BEGIN IMMEDIATE")
+            rows = self.conn.execute(
+                "SELECT id, unit FROM units WHERE state = 0 OR (state = 1 AND lease_until < ?) ORDER BY id LIMIT ?",
+                (now, count)
+            ).fetchall()
+            self.conn.executemany("UPDATE units SET state = 1, owner = ?, lease_until = ? WHERE id = ?",
+                                  [(owner, now + self.lease, unit_id) for unit_id, _ in rows])
+        return [json.loads(unit) for _, unit in rows]
+    
+    def iter_claims(self, owner, count=SHARD_BATCH_SIZE):
+        """Yield units claimed batch by batch until none is left to claim."""
+        while True:
+            units = self.claim(owner, count)
+            if units:
+                yield from units
+            elif self.is_loaded():
+                return
+            else:
+                # Another process is still adding units
+                time.sleep(1)
+    
+    def finish(self, unit):
+        """Mark a unit as done; marks are written in batches."""
+        self.finished.append((json.dumps(unit),))
+        if len(self.finished) >= WORK_QUEUE_FLUSH:
+            self.flush()
+    
+    def flush(self):
+        """Write pending done marks."""
+        with self.lock, self.conn:
+            self.conn.execute("BEGIN IMMEDIATE")
+            self.conn.executemany("UPDATE units SET state = 2, lease_until = NULL WHERE unit = ?", self.finished)
+        self.finished = []
+    
+    def is_loaded(self):
+        """Tell whether some host has finished adding the units."""
+        with self.lock:
+            return self.conn.execute("SELECT 1 FROM meta WHERE key = 'loaded'").fetchone() is not None
+    
+    def counts(self):
+        """Return the number of units pending, leased and done."""
+        with self.lock:
+            rows = dict(self.conn.execute("SELECT state, COUNT(*) FROM units GROUP BY state").fetchall())
+        return {"pending": rows.get(0, 0), "leased": rows.get(1, 0), "done": rows.get(2, 0)}
+    
+    def close(self):
+        """Write pending done marks and close the database."""
+        if self.finished:
+            self.flush()
+        self.conn.close()
+
+def _feed_batches(units, tasks, workers):
+    """Hand units to worker processes in batches, then tell each worker to stop."""
+    units = iter(units)
+    while True:
+        batch = [list(unit) if isinstance(unit, tuple) else unit for unit in itertools.islice(units, SHARD_BATCH_SIZE)]
+        if not batch:
+            break
+        tasks.put(batch)
+    for _ in range(workers):
+        tasks.put(None)
+
+def _iter_batches(tasks):
+    """Yield units from batches sent by _feed_batches until told to stop."""
+    while True:
+        batch = tasks.get()
+        if batch is None:
+            return
+        yield from batch
+
+def _shard_worker(command, options, settings, tasks, results, queue_path, worker_id):
+    """Entry point of a --workers process: run units from the parent or a shared work queue, sending records back."""
+    metrics = Metrics()
+    cache = ResultCache(settings["cache_path"], refresh=settings["refresh"], metrics=metrics) if settings["cache_path"] else None
+    finder = FinderBuster(cache=cache,
+                          resolver=make_resolver(*settings["resolver"]) if settings["resolver"] else None,
+                          rate_limiter=HostRateLimiter(*settings["rates"]),
+                          whois_client=WhoisClient(cache, metrics, *settings["whois"]),
+                          health=HostHealth(*settings["timeouts"]),
+                          metrics=metrics,
+                          **options)
+    finder.shares = settings["shares"]
+    work_queue = WorkQueue(queue_path) if queue_path else None
+    units = work_queue.iter_claims(f"{socket.gethostname()}:{os.getpid()}") if work_queue else _iter_batches(tasks)
+    
+    try:
+        if command == "username":
+            sites = {site.name: site for site in finder.sites}
+            jobs = ((username, site_name, sites[site_name]) for username, site_name in units)
+            records = finder._iter_jobs(jobs, settings["max_in_flight"])
+        elif command == "domain":
+            records = finder.iter_domain_results(units, settings["max_in_flight"])
+        else:
+            records = finder.iter_profile_results(map(tuple, units), settings["max_in_flight"], settings["per_platform"])
+        for record in records:
+            results.put((worker_id, "record", record))
+    except KeyboardInterrupt:
+        # Ctrl+C reaches every process in the group; the parent reports it
+        pass
+    except Exception as e:
+        results.put((worker_id, "error", f"{type(e).__name__}: {e}"))
+    finally:
+        if cache:
+            cache.close()
+        results.put((worker_id, "done", metrics.state()))
+
+def parse_retry_after(value):
+    """Parse a Retry-After header (seconds or HTTP date) into seconds, or None."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+def backoff_delay(attempt, retry_after=None):
+    """Delay before retry number attempt: jittered exponential backoff, at least Retry-After, capped."""
+    delay = BACKOFF_BASE * 2 ** attempt * random.uniform(0.5, 1.5)
+    return min(max(delay, retry_after or 0), BACKOFF_MAX)
+
+class HostRateLimiter:
+    """Per-host token buckets whose rate adapts to throttling responses.
+    
+    Each host starts at `rate` requests per second. A throttling response
+    halves the host's rate and pauses it for the given delay; each success
+    raises the rate again by a small step up to max_rate. Probes key buckets
+    by Site.host, so sites with a subdomain per username share one. Only the
+    max_hosts most recently used buckets are kept.
+    """
+    
+    def __init__(self, rate=DEFAULT_HOST_RATE, max_rate=MAX_HOST_RATE, min_rate=MIN_HOST_RATE, burst=None,
+                 max_hosts=MAX_TRACKED_HOSTS):
+        self.rate = rate
+        self.max_rate = max(max_rate, rate)
+        self.min_rate = min(min_rate, rate)
+        self.burst = burst or max(1.0, rate)
+        self.max_hosts = max_hosts
+        self.buckets = collections.OrderedDict()
+        self.lock = threading.Lock()
+    
+    def _bucket(self, host, now):
+        """Return the host's bucket, refilled up to now."""
+        bucket = self.buckets.get(host)
+        if bucket is None:
+            bucket = self.buckets[host] = {"rate": self.rate, "tokens": self.burst, "updated": now, "paused_until": 0.0}
+            if len(self.buckets) > self.max_hosts:
+                self.buckets.popitem(last=False)
+        else:
+            self.buckets.move_to_end(host)
+            bucket["tokens"] = min(self.burst, bucket["tokens"] + (now - bucket["updated"]) * bucket["rate"])
+            bucket["updated"] = now
+        return bucket
+    
+    def reserve(self, host, max_wait=None):
+        """Take a token for host and return how many seconds to wait before sending.
+        
+        Returns None without taking a token if the wait would exceed max_wait.
+        """
+        with self.lock:
+            now = time.monotonic()
+            bucket = self._bucket(host, now)
+            tokens = bucket["tokens"] - 1
+            wait = max(-tokens / bucket["rate"] if tokens < 0 else 0.0, bucket["paused_until"] - now)
+            if max_wait is not None and wait > max_wait:
+                return None
+            bucket["tokens"] = tokens
+            return wait
+    
+    def throttled(self, host, pause):
+        """Back off a host after a throttling response."""
+        with self.lock:
+            now = time.monotonic()
+            bucket = self._bucket(host, now)
+            bucket["rate"] = max(self.min_rate, bucket["rate"] / 2)
+            bucket["tokens"] = min(bucket["tokens"], 0.0)
+            bucket["paused_until"] = max(bucket["paused_until"], now + pause)
+    
+    def succeeded(self, host):
+        """Speed a host back up after a normal response."""
+        with self.lock:
+            bucket = self._bucket(host, time.monotonic())
+            bucket["rate"] = min(self.max_rate, bucket["rate"] + 0.1)
+
+class HostHealth:
+    """Per-host adaptive timeouts and circuit breaking.
+    
+    Read timeouts follow each host's recent latency (a multiple of its p95,
+    clamped between MIN_READ_TIMEOUT and max_read), and connect timeouts are
+    kept separate and short. After `threshold` consecutive timeouts or
+    connection failures a host's circuit opens and it is skipped for
+    `cooldown` seconds; then a single trial request decides whether it closes.
+    A host is only tracked once a request to it has been recorded, and only
+    the max_hosts most recently used hosts are kept.
+    """
+    
+    def __init__(self, connect=CONNECT_TIMEOUT, max_read=None, threshold=CIRCUIT_FAILURE_THRESHOLD, cooldown=CIRCUIT_COOLDOWN,
+                 max_hosts=MAX_TRACKED_HOSTS):
+        self.connect = connect
+        self.max_read = max_read or REQUEST_TIMEOUT
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.max_hosts = max_hosts
+        self.hosts = collections.OrderedDict()
+        self.lock = threading.Lock()
+    
+    def _host(self, host):
+        state = self.hosts.get(host)
+        if state is None:
+            state = self.hosts[host] = {"latencies": collections.deque(maxlen=LATENCY_WINDOW), "failures": 0,
+                                        "open_until": 0.0, "trial": False}
+            if len(self.hosts) > self.max_hosts:
+                self.hosts.popitem(last=False)
+        else:
+            self.hosts.move_to_end(host)
+        return state
+    
+    def acquire(self, host):
+        """Ask to send a request to host; returns (allowed, trial).
+        
+        Once a cooldown ends one request is let through as the trial, and the
+        caller must release() it when it ends without succeeding or failing.
+        """
+        with self.lock:
+            state = self.hosts.get(host)
+            if state is None or state["failures"] < self.threshold:
+                return True, False
+            if time.monotonic() < state["open_until"] or state["trial"]:
+                return False, False
+            state["trial"] = True
+            return True, True
+    
+    def timeout(self, host, remaining=None):
+        """Return a (connect, read) timeout for host, capped by the remaining budget if given."""
+        with self.lock:
+            state = self.hosts.get(host)
+            latencies = sorted(state["latencies"]) if state else []
+        
+        read = self.max_read
+        if len(latencies) >= MIN_LATENCY_SAMPLES:
+            p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+            read = min(self.max_read, max(MIN_READ_TIMEOUT, p95 * TIMEOUT_LATENCY_FACTOR))
+        connect = self.connect
+        if remaining is not None:
+            connect, read = max(0.1, min(connect, remaining)), max(0.1, min(read, remaining))
+        return connect, read
+    
+    def succeeded(self, host, seconds):
+        """Record a response from host and how long it took; closes an open circuit."""
+        with self.lock:
+            state = self._host(host)
+            state["latencies"].append(seconds)
+            state["failures"] = 0
+            state["trial"] = False
+    
+    def release(self, host):
+        """End the trial request that acquire() let through, so another may try if it neither succeeded nor failed."""
+        with self.lock:
+            self._host(host)["trial"] = False
+    
+    def failed(self, host):
+        """Record a timeout or connection failure; returns True if this opened the host's circuit."""
+        with self.lock:
+            state = self._host(host)
+            state["failures"] += 1
+            state["trial"] = False
+            if state["failures"] >= self.threshold:
+                opened = time.monotonic() >= state["open_until"]
+                state["open_until"] = time.monotonic() + self.cooldown
+                return opened
+            return False
+
+class TargetBudget:
+    """Overall time allowance per target (a username or domain), counted from its first request.
+    
+    A target's deadline is shared by its work between begin() and the matching
+    end(), and forgotten once none is left, so checking it again later starts
+    a fresh allowance and only targets in progress are kept. A request made
+    outside begin()/end() gets an allowance of its own.
+    """
+    
+    def __init__(self, seconds=None):
+        self.seconds = seconds
+        self.active = collections.Counter()
+        self.deadlines = {}
+        self.lock = threading.Lock()
+    
+    def begin(self, target):
+        """Mark work on target as started."""
+        with self.lock:
+            self.active[target] += 1
+    
+    def end(self, target, count=1):
+        """Mark count pieces of work on target as finished, dropping its deadline when none are left."""
+        with self.lock:
+            self.active[target] -= count
+            if self.active[target] <= 0:
+                del self.active[target]
+                self.deadlines.pop(target, None)
+    
+    def deadline(self, target):
+        """Return the monotonic time by which target's work must finish."""
+        if not self.seconds:
+            return float("inf")
+        with self.lock:
+            if target not in self.active:
+                return time.monotonic() + self.seconds
+            deadline = self.deadlines.get(target)
+            if deadline is None:
+                deadline = self.deadlines[target] = time.monotonic() + self.seconds
+            return deadline
+
+class SingleFlight:
+    """Collapse concurrent identical operations, keyed by normalized request, into one.
+    
+    The first caller for a key runs the operation; callers arriving while it is
+    in flight wait for it and share its result or exception. Nothing is kept
+    once it finishes, so this is not a cache. do() serves threads; shared() and
+    run() serve coroutines, with operations kept apart per event loop.
+    Followers are counted in coalesced_total, labelled with the key's first item.
+    """
+    
+    def __init__(self, metrics=None):
+        self.metrics = metrics or Metrics()
+        self.lock = threading.Lock()
+        self.calls = {}
+        self.tasks = {}
+    
+    @property
+    def in_flight(self):
+        """Number of operations currently running."""
+        return len(self.calls) + len(self.tasks)
+    
+    def do(self, key, function, *args):
+        """Return function(*args), or the outcome of an identical call already in flight."""
+        with self.lock:
+            call = self.calls.get(key)
+            leader = call is None
+            if leader:
+                call = self.calls[key] = concurrent.futures.Future()
+        if not leader:
+            self.metrics.inc("coalesced_total", kind=key[0])
+            return call.result()
+        
+        try:
+            result = function(*args)
+        except BaseException as e:
+            call.set_exception(e)
+            raise
+        finally:
+            with self.lock:
+                del self.calls[key]
+        call.set_result(result)
+        return result
+    
+    def shared(self, key, start):
+        """Return the asyncio future of the operation in flight for key, starting one from start() if there is none.
+        
+        Wait on it with asyncio.wait() or shield(), so a caller that is cancelled
+        does not cancel it for the others.
+        """
+        slot = (asyncio.get_running_loop(), key)
+        future = self.tasks.get(slot)
+        if future is not None:
+            self.metrics.inc("coalesced_total", kind=key[0])
+            return future
+        future = self.tasks[slot] = asyncio.ensure_future(start())
+        future.add_done_callback(lambda _: self.tasks.pop(slot, None))
+        return future
+    
+    async def run(self, key, start):
+        """Await the shared outcome of start() for key."""
+        return await asyncio.shield(self.shared(key, start))
+
+def is_conclusive(result):
+    """Tell whether a check_site result is a definitive answer worth caching."""
+    return result[2] in ("Profile exists", "Profile not found")
+
+class Site:
+    """A username-check site with its detection rules compiled once at load time.
+    
+    Besides the classic "error_type"/"error_value" pair, a definition may use:
+    
+    - "not_found_status": status codes meaning the profile does not exist
+    - "found_status": status codes required for the profile to exist
+    - "not_found_message": substrings whose presence means not found
+    - "not_found_regex": regexes whose match means not found
+    - "found_message": substrings that must all be present for the profile to exist
+    - "not_found_url": regex on the final URL after redirects (e.g. a login page)
+    - "tags": categories used to select subsets of sites
+    - "case_sensitive": whether usernames differing only in case are distinct
+      accounts (default false); used to skip duplicate permutation probes
+    - "profile": social platform whose extractor can parse this site's
+      profile page, used by the username --profile pipeline
+    - "probe": how much of the response to download: "head" (HEAD request,
+      status only), "status" (streamed GET closed once the status arrives),
+      "stream" (body read only until the verdict is known) or "get" (full
+      download). Defaults to "stream" for sites with body rules, else "status".
+    """
+    
+    FIELDS = {"url", "error_type", "error_value", "not_found_status", "found_status", "not_found_message",
+              "not_found_regex", "found_message", "not_found_url", "tags", "probe", "profile",
+              "case_sensitive"}
+    PROBES = ("head", "status", "stream", "get")
+    
+    def __init__(self, name, definition):
+        self.name = name
+        unknown = set(definition) - self.FIELDS
+        if unknown:
+            raise ValueError(f"Site '{name}': unknown field(s) {', '.join(sorted(unknown))}")
+        
+        self.url = definition.get("url")
+        if not isinstance(self.url, str) or "{}" not in self.url:
+            raise ValueError(f"Site '{name}': 'url' must be a string containing '{{}}' for the username")
+        
+        not_found_status = _as_list(definition.get("not_found_status"))
+        not_found_message = _as_list(definition.get("not_found_message"))
+        error_type = definition.get("error_type")
+        if error_type in ("response_code", "message") and definition.get("error_value") is None:
+            raise ValueError(f"Site '{name}': error_type '{error_type}' requires an 'error_value'")
+        if error_type == "response_code":
+            not_found_status.append(definition.get("error_value"))
+        elif error_type == "message":
+            not_found_message.append(definition.get("error_value"))
+        elif error_type is not None:
+            raise ValueError(f"Site '{name}': unknown error_type '{error_type}'")
+        
+        try:
+            self.not_found_status = frozenset(int(code) for code in not_found_status)
+            self.found_status = frozenset(int(code) for code in _as_list(definition.get("found_status")))
+            self.not_found_regex = tuple(re.compile(pattern) for pattern in _as_list(definition.get("not_found_regex")))
+            self.not_found_url = re.compile(definition["not_found_url"]) if definition.get("not_found_url") else None
+        except (TypeError, ValueError, re.error) as e:
+            raise ValueError(f"Site '{name}': invalid rule: {e}")
+        
+        self.not_found_message = tuple(str(message) for message in not_found_message)
+        self.found_message = tuple(str(message) for message in _as_list(definition.get("found_message")))
+        if not (self.not_found_status or self.found_status or self.not_found_message or self.not_found_regex
+                or self.found_message or self.not_found_url):
+            raise ValueError(f"Site '{name}': no detection rule defined")
+        
+        self.tags = frozenset(str(tag).lower() for tag in _as_list(definition.get("tags")))
+        # Rate limits and host health are kept per site host, leaving out a per-username subdomain label
+        self.host = ".".join(label for label in urlparse(self.url).netloc.split(".") if "{}" not in label)
+        self.case_sensitive = bool(definition.get("case_sensitive", False))
+        self.needs_body = bool(self.not_found_message or self.not_found_regex or self.found_message)
+        self.probe = definition.get("probe") or ("stream" if self.needs_body else "status")
+        if self.probe not in self.PROBES:
+            raise ValueError(f"Site '{name}': probe must be one of {', '.join(self.PROBES)}")
+        if self.needs_body and self.probe == "head":
+            raise ValueError(f"Site '{name}': body rules cannot be checked with a HEAD probe")
+        
+        self.profile = platform_key(definition["profile"]) if definition.get("profile") else None
+        if self.profile is not None and self.profile not in SOCIAL_PLATFORMS:
+            raise ValueError(f"Site '{name}': profile must be one of {', '.join(SOCIAL_PLATFORMS)}")
+        
+        self._encoded = {}
+    
+    def encoded_markers(self, encoding):
+        """Return (not_found, found) markers as bytes in the response encoding."""
+        if encoding not in self._encoded:
+            encode = lambda messages: tuple(message.encode(encoding, "replace") for message in messages)
+            self._encoded[encoding] = (encode(self.not_found_message), encode(self.found_message))
+        return self._encoded[encoding]
+    
+    def normalize(self, username):
+        """The form of a username this site treats as the same account."""
+        return username if self.case_sensitive else username.lower()
+    
+    def is_throttled(self, status_code):
+        """Tell whether a response is a throttling response rather than a real answer."""
+        return status_code in THROTTLE_STATUS_CODES and status_code not in self.not_found_status
+    
+    def evaluate(self, url, status_code, final_url="", text=""):
+        """Decide whether a profile exists from a site's response."""
+        not_found = (
+            status_code in self.not_found_status
+            or (self.found_status and status_code not in self.found_status)
+            or (self.not_found_url is not None and self.not_found_url.search(final_url))
+            or any(message in text for message in self.not_found_message)
+            or any(pattern.search(text) for pattern in self.not_found_regex)
+            or not all(message in text for message in self.found_message)
+        )
+        if not_found:
+            return False, url, "Profile not found"
+        return True, url, "Profile exists"
+
+def drain_response(response, limit=PROBE_DRAIN_LIMIT):
+    """Read the rest of a small streamed body so its connection returns to the pool; larger ones are left to close."""
+    length = response.headers.get("Content-Length", "")
+    if length.isdigit() and int(length) > limit:
+        return
+    read = 0
+    while read <= limit:
+        chunk = response.raw.read(PROBE_CHUNK_SIZE, decode_content=False)
+        if not chunk:
+            return
+        read += len(chunk)
+
+async def drain_async_response(response, limit=PROBE_DRAIN_LIMIT):
+    """Coroutine version of drain_response() for aiohttp responses."""
+    if response.content_length is not None and response.content_length > limit:
+        return
+    read = 0
+    async for chunk in response.content.iter_chunked(PROBE_CHUNK_SIZE):
+        read += len(chunk)
+        if read > limit:
+            return
+
+class BodyScanner:
+    """Read a response body chunk by chunk until a site's verdict is known or the byte budget runs out.
+    
+    Reading stops as soon as a not-found marker appears, or once every
+    found marker has been seen when the site has no not-found body rules.
+    """
+    
+    def __init__(self, site, encoding, budget=PROBE_BYTE_BUDGET):
+        self.site = site
+        self.encoding = encoding
+        self.budget = budget
+        self.not_found, self.found = site.encoded_markers(encoding)
+        self.overlap = max((len(marker) for marker in self.not_found + self.found), default=1) - 1
+        self.stop_on_found = bool(self.found) and not (site.not_found_message or site.not_found_regex)
+        self.seen = set()
+        self.buffer = bytearray()
+    
+    def feed(self, chunk):
+        """Add a chunk; returns True when no more of the body is needed."""
+        start = max(0, len(self.buffer) - self.overlap)
+        self.buffer += chunk
+        window = bytes(self.buffer[start:])
+        
+        if any(marker in window for marker in self.not_found):
+            return True
+        self.seen.update(marker for marker in self.found if marker in window)
+        if self.stop_on_found and len(self.seen) == len(self.found):
+            return True
+        return len(self.buffer) >= self.budget
+    
+    def text(self):
+        """The body read so far, decoded."""
+        return self.buffer.decode(self.encoding, "replace")
+
+def _as_list(value):
+    """Normalize a single value or list from a site definition into a list."""
+    if value is None:
+        return []
+    return list(value) if isinstance(value, (list, tuple)) else [value]
+
+def as_site(name, site_info):
+    """Accept either a compiled Site or a raw definition dict."""
+    return site_info if isinstance(site_info, Site) else Site(name, site_info)
+
+def load_site_definitions(path):
+    """Load site definitions from a JSON/YAML file, or every such file in a directory.
+    
+    A file holds either a mapping of site name to definition, or a list of
+    definitions that each carry a "name" field.
+    """
+    if os.path.isdir(path):
+        definitions = {}
+        for filename in sorted(os.listdir(path)):
+            if filename.endswith((".json", ".yaml", ".yml")):
+                definitions.update(load_site_definitions(os.path.join(path, filename)))
+        return definitions
+    
+    with open(path, encoding="utf-8") as f:
+        if path.endswith((".yaml", ".yml")):
+            try:
+                import yaml
+            except ImportError:
+                raise RuntimeError("YAML site files require PyYAML (pip install pyyaml)")
+            data = yaml.safe_load(f)
+        else:
+            data = json.load(f)
+    
+    if isinstance(data, list):
+        try:
+            data = {entry.pop("name"): entry for entry in data}
+        except (AttributeError, KeyError):
+            raise ValueError(f"{path}: every site in a list needs a 'name'")
+    if not isinstance(data, dict):
+        raise ValueError(f"{path}: expected a mapping or list of site definitions")
+    return data
+
+class SiteDatabase:
+    """Compiled site definitions indexed by tag."""
+    
+    def __init__(self, definitions):
+        self.sites = {name: Site(name, definition) for name, definition in definitions.items()}
+        self.by_tag = {}
+        for site in self.sites.values():
+            for tag in site.tags:
+                self.by_tag.setdefault(tag, []).append(site)
+    
+    @classmethod
+    def load(cls, paths=(), builtin=True):
+        """Build a database from the built-in SITES plus definition files or directories."""
+        definitions = dict(SITES) if builtin else {}
+        for path in paths:
+            definitions.update(load_site_definitions(path))
+        return cls(definitions)
+    
+    def select(self, tags=None):
+        """Return the sites carrying any of the given tags, or all sites."""
+        if not tags:
+            return list(self.sites.values())
+        
+        selected = {}
+        for tag in tags:
+            for site in self.by_tag.get(tag.lower(), ()):
+                selected[site.name] = site
+        return [site for name, site in self.sites.items() if name in selected]
+
+_html_backend = None
+
+def html_backend():
+    """Return the fastest installed HTML parser backend."""
+    global _html_backend
+    if _html_backend is None:
+        for backend in HTML_BACKENDS:
+            try:
+                if backend == "selectolax":
+                    import selectolax.lexbor
+                elif backend == "lxml":
+                    import lxml
+            except ImportError:
+                continue
+            _html_backend = backend
+            break
+    return _html_backend
+
+def html_head(text, limit=HEAD_PARSE_LIMIT):
+    """Cut a page down to its <head> section, looking at no more than limit characters."""
+    window = text[:limit]
+    end = HTML_HEAD_END.search(window)
+    return window[:end.end()] if end else window
+
+class HtmlDocument:
+    """CSS selector lookups over a parsed page, backed by selectolax, lxml or html.parser.
+    
+    With head_only=True only the <head> section is parsed, which is all the
+    Open Graph extractors need and a small fraction of a typical profile page.
+    """
+    
+    def __init__(self, text, head_only=False, backend=None):
+        self.backend = backend or html_backend()
+        if head_only:
+            text = html_head(text)
+        
+        if self.backend == "selectolax":
+            from selectolax.lexbor import LexborHTMLParser
+            self.tree = LexborHTMLParser(text)
+        else:
+            self.tree = bs4.BeautifulSoup(text, self.backend)
+    
+    def first(self, selector, attribute=None):
+        """Return the text (or an attribute) of the first element matching selector, or None."""
+        if self.backend == "selectolax":
+            node = self.tree.css_first(selector)
+            if node is None:
+                return None
+            return node.attributes.get(attribute) if attribute else node.text().strip()
+        
+        node = self.tree.select_one(selector)
+        if node is None:
+            return None
+        return node.get(attribute) if attribute else node.get_text().strip()
+    
+    def extract(self, selectors):
+        """Apply a {field: (selector, attribute)} map, leaving out fields that did not match."""
+        fields = {}
+        for field, (selector, attribute) in selectors.items():
+            value = self.first(selector, attribute)
+            if value is not None:
+                fields[field] = value
+        return fields
+
+class AddressCache:
+    """A TTL cache of site host addresses, so connections after the first to a site skip the lookup.
+    
+    Only hosts passed to prime() are cached, each for its A record's TTL
+    (capped at ttl). It is used by the connections of the adapter() it builds
+    and nothing else; name resolution elsewhere in the process is untouched.
+    """
+    
+    def __init__(self, ttl=ADDRESS_CACHE_TTL, max_entries=ADDRESS_CACHE_SIZE):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.entries = collections.OrderedDict()
+        self.ttls = {}
+        self.lock = threading.Lock()
+    
+    def lookup(self, host, port):
+        """Return the addresses of a primed host, resolving it again once they expire; None for any other host."""
+        ttl = self.ttls.get(host)
+        if ttl is None:
+            return None
+        
+        key = (host, port)
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry and entry[0] > time.monotonic():
+                self.entries.move_to_end(key)
+                return list(entry[1])
+        
+        family = requests.packages.urllib3.util.connection.allowed_gai_family()
+        try:
+            infos = socket.getaddrinfo(host, port, family, socket.SOCK_STREAM)
+        except OSError:
+            return None
+        addresses = list(dict.fromkeys(info[4][0] for info in infos))
+        with self.lock:
+            self.entries[key] = (time.monotonic() + ttl, tuple(addresses))
+            self.entries.move_to_end(key)
+            if len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+        return addresses
+    
+    def connect(self, connection, new_conn):
+        """Open a urllib3 connection's socket with new_conn(), trying each cached address of its host in turn."""
+        host = connection._dns_host
+        addresses = self.lookup(host, connection.port)
+        if not addresses:
+            return new_conn()
+        
+        error = None
+        for address in addresses:
+            connection._dns_host = address
+            try:
+                return new_conn()
+            except (OSError, requests.packages.urllib3.exceptions.HTTPError) as e:
+                error = e
+            finally:
+                connection._dns_host = host
+        raise error
+    
+    def adapter(self, **kwargs):
+        """Build a requests HTTPAdapter whose direct connections to primed hosts take their addresses from this cache."""
+        cache = self
+        
+        class CachedAddressAdapter(requests.adapters.HTTPAdapter):
+            def init_poolmanager(self, *args, **kwargs):
+                super().init_poolmanager(*args, **kwargs)
+                pools = self.poolmanager.pool_classes_by_scheme
+                self.poolmanager.pool_classes_by_scheme = {scheme: cache._pool_class(pool) for scheme, pool in pools.items()}
+        
+        return CachedAddressAdapter(**kwargs)
+    
+    def _pool_class(self, pool_class):
+        """Subclass a urllib3 connection pool so its connections resolve through the cache."""
+        cache = self
+        
+        class Connection(pool_class.ConnectionCls):
+            def _new_conn(self):
+                return cache.connect(self, super()._new_conn)
+        
+        return type(pool_class.__name__, (pool_class,), {"ConnectionCls": Connection})
+    
+    def prime(self, urls, resolver=None, timeout=DNS_TIMEOUT):
+        """Resolve the hosts of urls in parallel, waiting at most timeout seconds, and cache them from now on.
+        
+        resolver (a dnspython Resolver) supplies each host's record TTL; without
+        one, or when it has no answer, hosts are kept for the default ttl.
+        Lookup failures are ignored here; the real request reports them.
+        """
+        targets = set()
+        for url in urls:
+            parsed = urlparse(url)
+            if parsed.hostname and "{}" not in parsed.netloc:
+                targets.add((parsed.hostname, parsed.port or (443 if parsed.scheme == "https" else 80)))
+        if not targets:
+            return
+        
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=min(len(targets), PRERESOLVE_WORKERS))
+        futures = [executor.submit(self._prime, host, port, resolver) for host, port in targets]
+        concurrent.futures.wait(futures, timeout=timeout)
+        executor.shutdown(wait=False)
+    
+    def _prime(self, host, port, resolver):
+        ttl = self.ttl
+        if resolver is not None and not re.fullmatch(r"[\d.]+|.*:.*", host):
+            try:
+                ttl = min(ttl, resolver.resolve(host, "A").rrset.ttl)
+            except Exception:
+                pass
+        self.ttls.setdefault(host, ttl)
+        self.lookup(host, port)
+
+class _HttpxBody:
+    """File-like view of a streamed httpx response, as requests expects of Response.raw."""
+    
+    def __init__(self, response):
+        self.response = response
+        self.chunks = None
+    
+    def stream(self, chunk_size, decode_content=True):
+        import httpx
+        try:
+            yield from self.response.iter_bytes(chunk_size)
+        except httpx.TimeoutException as e:
+            raise requests.exceptions.ReadTimeout(e)
+        except httpx.HTTPError as e:
+            raise requests.ConnectionError(e)
+    
+    def read(self, amount=None, decode_content=True):
+        if self.chunks is None:
+            self.chunks = self.stream(amount or PROBE_CHUNK_SIZE)
+        return next(self.chunks, b"")
+    
+    def close(self):
+        self.response.close()
+
+class Http2Adapter:
+    """requests transport adapter (the send/close interface of BaseAdapter) that speaks HTTP/2
+    through httpx to hosts that offer it.
+    
+    HTTP/2 is negotiated per host over TLS (ALPN), so hosts without it fall
+    back to HTTP/1.1 on the same pooled client. Concurrent probes to an
+    HTTP/2 host share one multiplexed connection instead of a pool of them.
+    The session's TLS settings (verify, cert) and proxies are honoured, with
+    one client kept for each combination in use.
+    """
+    
+    def __init__(self, pool_maxsize=DEFAULT_WORKERS, pool_connections=10):
+        try:
+            import httpx
+            import h2
+        except ImportError:
+            raise RuntimeError("HTTP/2 support requires httpx with h2 (pip install 'httpx[http2]')")
+        self.httpx = httpx
+        self.limits = httpx.Limits(max_connections=pool_maxsize * pool_connections, max_keepalive_connections=pool_maxsize * pool_connections)
+        self.clients = {}
+        self.lock = threading.Lock()
+    
+    def _client(self, verify, cert, proxy):
+        """Return the pooled client for these TLS and proxy settings, creating it on first use."""
+        key = (verify, cert, proxy)
+        with self.lock:
+            client = self.clients.get(key)
+            if client is None:
+                import ssl
+                if verify is False:
+                    context = ssl.create_default_context()
+                    context.check_hostname = False
+                    context.verify_mode = ssl.CERT_NONE
+                elif isinstance(verify, str) and os.path.isdir(verify):
+                    context = ssl.create_default_context(capath=verify)
+                elif isinstance(verify, str):
+                    context = ssl.create_default_context(cafile=verify)
+                else:
+                    context = ssl.create_default_context()
+                if isinstance(cert, tuple):
+                    context.load_cert_chain(*cert)
+                elif cert:
+                    context.load_cert_chain(cert)
+                client = self.clients[key] = self.httpx.Client(http2=True, limits=self.limits, follow_redirects=False,
+                                                               verify=context, proxy=proxy)
+            return client
+    
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        connect, read = timeout if isinstance(timeout, tuple) else (timeout, timeout)
+        client = self._client(verify, cert, requests.utils.select_proxy(request.url, proxies or {}))
+        outgoing = client.build_request(request.method, request.url, headers=dict(request.headers), content=request.body,
+                                        timeout=self.httpx.Timeout(read, connect=connect))
+        try:
+            response = client.send(outgoing, stream=True)
+        except self.httpx.ConnectTimeout as e:
+            raise requests.exceptions.ConnectTimeout(e, request=request)
+        except self.httpx.TimeoutException as e:
+            raise requests.exceptions.ReadTimeout(e, request=request)
+        except self.httpx.HTTPError as e:
+            raise requests.ConnectionError(e, request=request)
+        
+        result = requests.Response()
+        result.status_code = response.status_code
+        result.reason = response.reason_phrase
+        result.headers = requests.structures.CaseInsensitiveDict(response.headers)
+        result.encoding = requests.utils.get_encoding_from_headers(result.headers)
+        result.raw = _HttpxBody(response)
+        result.url = request.url
+        result.request = request
+        result.connection = self
+        return result
+    
+    def close(self):
+        with self.lock:
+            for client in self.clients.values():
+                client.close()
+            self.clients.clear()
+
+def make_resolver(nameservers=None, timeout=DNS_TIMEOUT, cache_size=DEFAULT_DNS_CACHE_SIZE):
+    """Build a DNS resolver with an LRU answer cache that honours record TTLs."""
+    resolver = dns.resolver.Resolver()
+    if nameservers:
+        resolver.nameservers = list(nameservers)
+    resolver.timeout = timeout
+    resolver.lifetime = DOMAIN_STAGE_TIMEOUTS["dns"]
+    resolver.cache = dns.resolver.LRUCache(cache_size)
+    return resolver
+
+class WhoisClient:
+    """WHOIS over port 43 with cached IANA referrals and per-server limits.
+    
+    A TLD's registry server is asked of IANA once and remembered, in the result
+    cache too when there is one; concurrent lookups in the same TLD share
+    that one referral query through flights. Thin registries such as .com name the
+    registrar's own server, which is queried next; the record is both replies.
+    Every server gets at most max_concurrency queries at once and rate queries
+    per second, and is backed off when it answers with a rate-limit notice.
+    lookup() blocks and suits thread pools; lookup_async() runs on an event loop.
+    """
+    
+    def __init__(self, cache=None, metrics=None, max_concurrency=WHOIS_SERVER_CONCURRENCY, rate=WHOIS_SERVER_RATE,
+                 timeout=WHOIS_TIMEOUT, max_retries=DEFAULT_MAX_RETRIES, iana_server=IANA_WHOIS_SERVER, port=WHOIS_PORT,
+                 flights=None):
+        self.cache = cache
+        self.metrics = metrics or Metrics()
+        self.flights = flights or SingleFlight(self.metrics)
+        self.max_concurrency = max_concurrency
+        self.rate = rate
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.iana_server = iana_server
+        self.port = port
+        self.rate_limiter = HostRateLimiter(rate, max_rate=rate)
+        self.servers = {}
+        self.slots = {}
+        self.async_slots = {}
+        self.lock = threading.Lock()
+    
+    def lookup(self, domain):
+        """Return the raw WHOIS record for domain: {"server", "referral", "text"}."""
+        tld = domain.rstrip(".").rsplit(".", 1)[-1].lower()
+        server = self._known_server(tld) or self.flights.do(("whois_server", tld), self._ask_iana, tld)
+        text = self.query(server, domain)
+        referral = self._referral(text, server)
+        if referral:
+            try:
+                text += "\n" + self.query(referral, domain)
+            except (OSError, RuntimeError):
+                referral = None
+        return {"server": server, "referral": referral, "text": text}
+    
+    async def lookup_async(self, domain):
+        """Coroutine version of lookup()."""
+        tld = domain.rstrip(".").rsplit(".", 1)[-1].lower()
+        server = self._known_server(tld) or await self.flights.run(("whois_server", tld), lambda: self._ask_iana_async(tld))
+        text = await self.query_async(server, domain)
+        referral = self._referral(text, server)
+        if referral:
+            try:
+                text += "\n" + await self.query_async(referral, domain)
+            except (OSError, RuntimeError, asyncio.TimeoutError):
+                referral = None
+        return {"server": server, "referral": referral, "text": text}
+    
+    def query(self, server, query):
+        """Send one query to server and return its reply, within the server's limits."""
+        with self._slot(server):
+            for attempt in range(self.max_retries + 1):
+                time.sleep(self._turn(server))
+                with self.metrics.timer("whois", server=server):
+                    with socket.create_connection((server, self.port), timeout=self.timeout) as conn:
+                        conn.sendall(self._request(server, query))
+                        data = bytearray()
+                        while len(data) < WHOIS_MAX_RESPONSE:
+                            chunk = conn.recv(16384)
+                            if not chunk:
+                                break
+                            data += chunk
+                text = self._decode(data)
+                if not self._throttled(server, text, attempt):
+                    return text
+        raise RuntimeError(f"WHOIS server {server} is rate limiting queries")
+    
+    async def query_async(self, server, query):
+        """Coroutine version of query()."""
+        async with self._async_slot(server):
+            for attempt in range(self.max_retries + 1):
+                await asyncio.sleep(self._turn(server))
+                with self.metrics.timer("whois", server=server):
+                    reader, writer = await asyncio.wait_for(asyncio.open_connection(server, self.port), self.timeout)
+                    try:
+                        writer.write(self._request(server, query))
+                        await writer.drain()
+                        data = bytearray()
+                        while len(data) < WHOIS_MAX_RESPONSE:
+                            chunk = await asyncio.wait_for(reader.read(16384), self.timeout)
+                            if not chunk:
+                                break
+                            data += chunk
+                    finally:
+                        writer.close()
+                text = self._decode(data)
+                if not self._throttled(server, text, attempt):
+                    return text
+        raise RuntimeError(f"WHOIS server {server} is rate limiting queries")
+    
+    def _slot(self, server):
+        """Semaphore bounding the queries a thread pool sends to server at once."""
+        with self.lock:
+            slot = self.slots.get(server)
+            if slot is None:
+                slot = self.slots[server] = threading.BoundedSemaphore(self.max_concurrency)
+            return slot
+    
+    def _async_slot(self, server):
+        """Semaphore bounding the queries the running event loop sends to server at once."""
+        key = (asyncio.get_running_loop(), server)
+        slot = self.async_slots.get(key)
+        if slot is None:
+            slot = self.async_slots[key] = asyncio.Semaphore(self.max_concurrency)
+        return slot
+    
+    def _turn(self, server):
+        """Seconds to wait for server's rate limit; raises RuntimeError if the queue is too long."""
+        wait = self.rate_limiter.reserve(server, WHOIS_MAX_WAIT)
+        if wait is None:
+            raise RuntimeError(f"WHOIS server {server} is busy; try again later")
+        return wait
+    
+    def _throttled(self, server, text, attempt):
+        """Back a server off if text is a rate-limit notice rather than a record."""
+        if len(text) > 1000 or not WHOIS_THROTTLED.search(text):
+            self.rate_limiter.succeeded(server)
+            return False
+        self.metrics.inc("whois_throttled_total", server=server)
+        self.rate_limiter.throttled(server, backoff_delay(attempt))
+        return True
+    
+    @staticmethod
+    def _request(server, query):
+        return (WHOIS_QUERY_FORMATS.get(server, "{}").format(query) + "\r\n").encode("idna" if query.isascii() else "utf-8")
+    
+    @staticmethod
+    def _decode(data):
+        try:
+            return bytes(data).decode("utf-8")
+        except UnicodeDecodeError:
+            return bytes(data).decode("latin-1")
+    
+    def _referral(self, text, server):
+        """The next server named in a reply, if it is a different one."""
+        match = WHOIS_REFERRAL.search(text)
+        referral = match.group(1).lower().rstrip(".") if match else None
+        return referral if referral and referral != server else None
+    
+    def _known_server(self, tld):
+        """The registry server already known for tld, if any."""
+        server = self.servers.get(tld)
+        if server is None and self.cache:
+            server = self.servers[tld] = self.cache.get("whois_server", tld)
+        return server
+    
+    def _ask_iana(self, tld):
+        """Look up tld's registry server with IANA, unless a lookup that just finished has learned it."""
+        return self._known_server(tld) or self._remember_server(tld, self.query(self.iana_server, tld))
+    
+    async def _ask_iana_async(self, tld):
+        """Coroutine version of _ask_iana()."""
+        return self._known_server(tld) or self._remember_server(tld, await self.query_async(self.iana_server, tld))
+    
+    def _remember_server(self, tld, iana_reply):
+        """Record the registry server IANA named for tld."""
+        match = WHOIS_REFERRAL.search(iana_reply)
+        if not match:
+            raise RuntimeError(f"No WHOIS server is known for .{tld}")
+        server = self.servers[tld] = match.group(1).lower().rstrip(".")
+        if self.cache:
+            self.cache.set("whois_server", tld, server)
+        return server
+
+def parse_whois(domain, record, include_raw=False):
+    """Pull registrar, dates, name servers and contacts out of a raw WHOIS record.
+    
+    Records are cached raw and parsed on every read, so they can be re-parsed
+    (by a newer parser, say) without querying again.
+    """
+    entry = whois.WhoisEntry.load(domain, record["text"])
+    whois_data = {
+        "registrar": entry.get("registrar"),
+        "creation_date": str(entry.get("creation_date")) if entry.get("creation_date") else None,
+        "expiration_date": str(entry.get("expiration_date")) if entry.get("expiration_date") else None,
+        "updated_date": str(entry.get("updated_date")) if entry.get("updated_date") else None,
+        "name_servers": entry.get("name_servers"),
+        "status": entry.get("status"),
+        "emails": entry.get("emails"),
+        "country": entry.get("country"),
+        "org": entry.get("org"),
+        "whois_server": record["referral"] or record["server"]
+    }
+    if include_raw:
+        whois_data["raw"] = record["text"]
+    return whois_data
+
+def run_stage_graph(executor, stages, metrics=None, budget=None):
+    """Run interdependent stages on an executor, starting each as soon as its dependencies finish.
+    
+    stages maps a name to (function, dependencies, timeout). Each function is
+    called with a dict of its dependencies' results. A stage that raises or
+    runs past its timeout yields {"error": ...} instead, and dependents still
+    run with that value. Returns a dict of results by stage name. With
+    metrics, each stage is timed and its failures are counted. budget caps
+    the whole graph: no stage may run past it, whatever its own timeout.
+    """
+    def run(name, function, inputs):
+        if metrics is None:
+            return function(inputs)
+        with metrics.timer("stage", stage=name):
+            return function(inputs)
+    
+    results = {}
+    waiting = dict(stages)
+    pending = {}
+    deadlines = {}
+    overall = time.monotonic() + budget if budget else float("inf")
+    
+    while waiting or pending:
+        ready = [name for name, (_, deps, _) in waiting.items() if all(dep in results for dep in deps)]
+        for name in ready:
+            function, deps, timeout = waiting.pop(name)
+            future = executor.submit(run, name, function, {dep: results[dep] for dep in deps})
+            pending[future] = name
+            deadlines[name] = min(time.monotonic() + timeout, overall)
+        
+        if not pending:
+            break
+        
+        wait_time = max(0, min(deadlines[name] for name in pending.values()) - time.monotonic())
+        done, _ = concurrent.futures.wait(pending, timeout=wait_time, return_when=concurrent.futures.FIRST_COMPLETED)
+        for future in done:
+            name = pending.pop(future)
+            try:
+                results[name] = future.result()
+            except Exception as e:
+                results[name] = {"error": str(e)}
+            if metrics and isinstance(results[name], dict) and "error" in results[name]:
+                metrics.inc("stage_errors_total", stage=name, error="failed")
+        
+        # Abandon stages past their deadline; the worker thread finishes in the background
+        now = time.monotonic()
+        for future, name in list(pending.items()):
+            if deadlines[name] <= now:
+                del pending[future]
+                future.cancel()
+                results[name] = {"error": f"Timed out after {stages[name][2]}s" if deadlines[name] < overall
+                                 else f"Time budget of {budget}s exhausted"}
+                if metrics:
+                    metrics.inc("stage_errors_total", stage=name, error="timeout")
+    
+    for name in waiting:
+        results[name] = {"error": "Unresolved dependencies"}
+    return results
+
+class Metrics:
+    """Thread-safe counters, gauges and latency histograms.
+    
+    Series are identified by a name plus keyword labels (e.g. site="GitHub").
+    A snapshot can be printed as a summary, dumped as JSON or rendered in the
+    Prometheus text exposition format.
+    """
+    
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counters = {}
+        self.gauges = {}
+        self.timers = {}
+        self.lock = threading.Lock()
+        self.started = time.monotonic()
+    
+    @staticmethod
+    def _key(name, labels):
+        return name, tuple(sorted(labels.items()))
+    
+    def inc(self, name, value=1, **labels):
+        """Add value to a counter."""
+        key = self._key(name, labels)
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+    
+    def gauge(self, name, delta, **labels):
+        """Move a gauge up or down by delta."""
+        key = self._key(name, labels)
+        with self.lock:
+            self.gauges[key] = self.gauges.get(key, 0) + delta
+    
+    def observe(self, name, seconds, **labels):
+        """Record one duration in a histogram."""
+        key = self._key(name, labels)
+        with self.lock:
+            timer = self.timers.get(key)
+            if timer is None:
+                timer = self.timers[key] = {"count": 0, "sum": 0.0, "max": 0.0, "buckets": [0] * len(self.buckets)}
+            timer["count"] += 1
+            timer["sum"] += seconds
+            timer["max"] = max(timer["max"], seconds)
+            for index, bound in enumerate(self.buckets):
+                if seconds <= bound:
+                    timer["buckets"][index] += 1
+                    break
+    
+    @contextlib.contextmanager
+    def timer(self, name, **labels):
+        """Time a block into the "<name>_seconds" histogram, counting it as in flight while it runs."""
+        self.gauge("in_flight", 1, operation=name)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(f"{name}_seconds", time.perf_counter() - start, **labels)
+            self.gauge("in_flight", -1, operation=name)
+    
+    def state(self):
+        """Return the raw series, for merging into another Metrics (e.g. across processes)."""
+        with self.lock:
+            return {"counters": dict(self.counters), "gauges": dict(self.gauges),
+                    "timers": {key: dict(timer, buckets=list(timer["buckets"])) for key, timer in self.timers.items()}}
+    
+    def merge(self, state):
+        """Add the series of another Metrics' state() to this one."""
+        with self.lock:
+            for key, value in state["counters"].items():
+                self.counters[key] = self.counters.get(key, 0) + value
+            for key, value in state["gauges"].items():
+                self.gauges[key] = self.gauges.get(key, 0) + value
+            for key, timer in state["timers"].items():
+                mine = self.timers.get(key)
+                if mine is None:
+                    self.timers[key] = timer
+                    continue
+                mine["count"] += timer["count"]
+                mine["sum"] += timer["sum"]
+                mine["max"] = max(mine["max"], timer["max"])
+                mine["buckets"] = [a + b for a, b in zip(mine["buckets"], timer["buckets"])]
+    
+    def quantile(self, timer, q):
+        """Estimate a quantile from a histogram as the upper bound of the bucket it falls in."""
+        target = q * timer["count"]
+        seen = 0
+        for bound, count in zip(self.buckets, timer["buckets"]):
+            seen += count
+            if seen >= target:
+                return min(bound, timer["max"])
+        return timer["max"]
+    
+    def snapshot(self):
+        """Return all series as plain, JSON-serializable data."""
+        with self.lock:
+            counters = [{"name": name, "labels": dict(labels), "value": value}
+                        for (name, labels), value in sorted(self.counters.items())]
+            gauges = [{"name": name, "labels": dict(labels), "value": value}
+                      for (name, labels), value in sorted(self.gauges.items())]
+            timers = []
+            for (name, labels), timer in sorted(self.timers.items()):
+                timers.append({
+                    "name": name,
+                    "labels": dict(labels),
+                    "count": timer["count"],
+                    "sum": round(timer["sum"], 6),
+                    "avg": round(timer["sum"] / timer["count"], 6),
+                    "p50": self.quantile(timer, 0.5),
+                    "p95": self.quantile(timer, 0.95),
+                    "p99": self.quantile(timer, 0.99),
+                    "max": round(timer["max"], 6),
+                    "buckets": dict(zip([str(bound) for bound in self.buckets], itertools.accumulate(timer["buckets"])))
+                })
+        return {"uptime_seconds": round(time.monotonic() - self.started, 3), "counters": counters, "gauges": gauges,
+                "timers": timers}
+    
+    def write_json(self, path):
+        """Write a snapshot to a JSON file."""
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.snapshot(), f, indent=4)
+    
+    def prometheus_text(self, prefix="finderbuster"):
+        """Render all series in the Prometheus text exposition format."""
+        def labels_text(labels, extra=None):
+            items = list(labels.items()) + (extra or [])
+            if not items:
+                return ""
+            escape = lambda value: str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+            return "{" + ",".join(f'{key}="{escape(value)}"' for key, value in items) + "}"
+        
+        snapshot = self.snapshot()
+        lines = []
+        declared = set()
+        for kind, series in (("counter", snapshot["counters"]), ("gauge", snapshot["gauges"])):
+            for entry in series:
+                name = f"{prefix}_{entry['name']}"
+                if name not in declared:
+                    lines.append(f"# TYPE {name} {kind}")
+                    declared.add(name)
+                lines.append(f"{name}{labels_text(entry['labels'])} {entry['value']}")
+        
+        for entry in snapshot["timers"]:
+            name = f"{prefix}_{entry['name']}"
+            if name not in declared:
+                lines.append(f"# TYPE {name} histogram")
+                declared.add(name)
+            for bound, count in entry["buckets"].items():
+                lines.append(f"{name}_bucket{labels_text(entry['labels'], [('le', bound)])} {count}")
+            lines.append(f"{name}_bucket{labels_text(entry['labels'], [('le', '+Inf')])} {entry['count']}")
+            lines.append(f"{name}_sum{labels_text(entry['labels'])} {entry['sum']}")
+            lines.append(f"{name}_count{labels_text(entry['labels'])} {entry['count']}")
+        
+        lines.append(f"# TYPE {prefix}_uptime_seconds gauge")
+        lines.append(f"{prefix}_uptime_seconds {snapshot['uptime_seconds']}")
+        return "\n".join(lines) + "\n"
+    
+    def print_summary(self, top=10):
+        """Print the slowest series of each timer and the counter totals."""
+        snapshot = self.snapshot()
+        print(f"\n{Fore.YELLOW}[*] Statistics after {snapshot['uptime_seconds']:.1f}s")
+        
+        groups = {}
+        for entry in snapshot["timers"]:
+            groups.setdefault(entry["name"], []).append(entry)
+        for name, entries in groups.items():
+            total = sum(entry["count"] for entry in entries)
+            print(f"{Fore.CYAN}[*] {name}: {total} timed")
+            for entry in sorted(entries, key=lambda entry: entry["p95"], reverse=True)[:top]:
+                label = ", ".join(str(value) for value in entry["labels"].values()) or "all"
+                print(f"    {label:<24} n={entry['count']:<6} avg {entry['avg'] * 1000:8.1f} ms   "
+                      f"p95 <={entry['p95'] * 1000:8.1f} ms   max {entry['max'] * 1000:8.1f} ms")
+        
+        totals = {}
+        for entry in snapshot["counters"]:
+            totals.setdefault(entry["name"], []).append(entry)
+        for name, entries in totals.items():
+            detail = ", ".join(f"{'/'.join(str(value) for value in entry['labels'].values()) or 'all'}: {entry['value']}"
+                               for entry in sorted(entries, key=lambda entry: entry["value"], reverse=True)[:top])
+            print(f"{Fore.CYAN}[*] {name}: {sum(entry['value'] for entry in entries)} ({detail})")
+
+class MetricsExporter:
+    """Publish metrics while a long job runs: a Prometheus text file rewritten
+    every interval seconds and/or an HTTP endpoint serving /metrics."""
+    
+    def __init__(self, metrics, path=None, port=None, interval=METRICS_EXPORT_INTERVAL):
+        self.metrics = metrics
+        self.path = path
+        self.port = port
+        self.interval = interval
+        self.stopped = threading.Event()
+        self.server = None
+    
+    def start(self):
+        """Start the file writer and/or HTTP server in background threads."""
+        if self.path:
+            threading.Thread(target=self._write_loop, daemon=True).start()
+        if self.port:
+            import http.server
+            metrics = self.metrics
+            
+            class Handler(http.server.BaseHTTPRequestHandler):
+                def do_GET(self):
+                    if self.path.split("?")[0] not in ("/", "/metrics"):
+                        self.send_error(404)
+                        return
+                    body = metrics.prometheus_text().encode()
+                    self.send_response(200)
+                    self.send_header("Content-Type", "text/plain; version=0.0.4")
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                
+                def log_message(self, format, *args):
+                    pass
+            
+            self.server = http.server.ThreadingHTTPServer(("127.0.0.1", self.port), Handler)
+            self.server.daemon_threads = True
+            threading.Thread(target=self.server.serve_forever, daemon=True).start()
+            print(f"{Fore.YELLOW}[*] Serving metrics on http://127.0.0.1:{self.port}/metrics")
+        return self
+    
+    def _write_loop(self):
+        while not self.stopped.wait(self.interval):
+            self.write_file()
+    
+    def write_file(self):
+        """Atomically replace the Prometheus text file."""
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            f.write(self.metrics.prometheus_text())
+        os.replace(temp_path, self.path)
+    
+    def close(self):
+        """Stop exporting, writing the file one last time."""
+        self.stopped.set()
+        if self.path:
+            self.write_file()
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+
+class ResultCache:
+    """Persistent SQLite cache of lookup results keyed by (operation, target, site).
+    
+    Entries expire after the TTL configured for their operation in CACHE_TTLS,
+    and the oldest entries are evicted once the store exceeds max_entries.
+    With refresh=True lookups always miss, but fresh results are still stored.
+    
+    The same database keeps HTTP validators (ETag, Last-Modified) per
+    response key (a page URL, or "<site>:<url>" for a site's probe verdict)
+    with the verdict and, where the whole page was read, the body. They
+    outlive result TTLs, so later scans can send conditional requests and
+    reuse the stored answer when the server replies 304 Not Modified.
+    """
+    
+    EVICT_EVERY = 1000
+    
+    def __init__(self, path=DEFAULT_CACHE_PATH, max_entries=DEFAULT_CACHE_ENTRIES, ttls=None, refresh=False, metrics=None,
+                 max_responses=DEFAULT_RESPONSE_ENTRIES, max_response_bytes=DEFAULT_RESPONSE_BYTES):
+        self.path = path
+        self.metrics = metrics
+        self.max_entries = max_entries
+        self.max_responses = max_responses
+        self.max_response_bytes = max_response_bytes
+        self.ttls = dict(CACHE_TTLS, **(ttls or {}))
+        self.refresh = refresh
+        self.lock = threading.Lock()
+        self.writes = 0
+        
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            "operation TEXT NOT NULL, target TEXT NOT NULL, site TEXT NOT NULL, "
+            "value TEXT NOT NULL, stored REAL NOT NULL, expires REAL NOT NULL, "
+            "PRIMARY KEY (operation, target, site))"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS results_stored ON results (stored)")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, etag TEXT, last_modified TEXT, status INTEGER NOT NULL, "
+            "verdict TEXT, body BLOB, size INTEGER NOT NULL, stored REAL NOT NULL)"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS responses_stored ON responses (stored)")
+    
+    def get(self, operation, target, site="", case_sensitive=False):
+        """Return the cached value, or None if missing or expired.
+        
+        Targets are matched case-insensitively unless case_sensitive is set
+        (usernames on sites where JohnDoe and johndoe are different accounts).
+        """
+        if self.refresh:
+            return None
+        
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT value FROM results WHERE operation = ? AND target = ? AND site = ? AND expires > ?",
+                (operation, target if case_sensitive else target.lower(), site, time.time())
+            ).fetchone()
+        if self.metrics:
+            self.metrics.inc("cache_lookups_total", operation=operation, result="hit" if row else "miss")
+        return json.loads(row[0]) if row else None
+    
+    def set(self, operation, target, value, site="", case_sensitive=False):
+        """Store a value with the TTL of its operation."""
+        now = time.time()
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO results (operation, target, site, value, stored, expires) VALUES (?, ?, ?, ?, ?, ?)",
+                (operation, target if case_sensitive else target.lower(), site, json.dumps(value, default=str), now,
+                 now + self.ttls.get(operation, 3600))
+            )
+            self.writes += 1
+            if self.writes % self.EVICT_EVERY == 0:
+                self._evict(now)
+    
+    def revalidation(self, key, need_verdict=False, need_body=False):
+        """Return (stored response, conditional request headers) for a response key, or (None, {}).
+        
+        A stored response only qualifies if it holds what the caller needs
+        back on a 304: the verdict of a probe, or the page body.
+        """
+        if self.refresh:
+            return None, {}
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT etag, last_modified, status, verdict, body FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None or (need_verdict and row[3] is None) or (need_body and row[4] is None):
+            return None, {}
+        
+        etag, last_modified, status, verdict, body = row
+        stored = {"status": status, "verdict": json.loads(verdict) if verdict else None,
+                  "body": zlib.decompress(body).decode("utf-8") if body is not None else None}
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        return stored, headers
+    
+    def store_response(self, key, headers, status, verdict=None, body=None):
+        """Keep a response's validators with its verdict and/or body; responses without validators are skipped.
+        
+        If the validators are unchanged, a verdict or body already stored is
+        kept when the new response does not carry one.
+        """
+        etag, last_modified = headers.get("ETag"), headers.get("Last-Modified")
+        if not (etag or last_modified):
+            return
+        blob = zlib.compress(body.encode("utf-8")) if body is not None else None
+        with self.lock:
+            self.conn.execute(
+                "INSERT INTO responses (key, etag, last_modified, status, verdict, body, size, stored) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?) ON CONFLICT (key) DO UPDATE SET "
+                "verdict = COALESCE(excluded.verdict, CASE WHEN etag IS excluded.etag AND last_modified IS excluded.last_modified "
+                "THEN verdict END), "
+                "body = COALESCE(excluded.body, CASE WHEN etag IS excluded.etag AND last_modified IS excluded.last_modified "
+                "THEN body END), "
+                "size = CASE WHEN excluded.body IS NULL AND etag IS excluded.etag AND last_modified IS excluded.last_modified "
+                "THEN size ELSE excluded.size END, "
+                "etag = excluded.etag, last_modified = excluded.last_modified, status = excluded.status, stored = excluded.stored",
+                (key, etag, last_modified, status, json.dumps(verdict) if verdict is not None else None, blob,
+                 len(blob or b""), time.time())
+            )
+            self.writes += 1
+            if self.writes % self.EVICT_EVERY == 0:
+                self._evict(time.time())
+    
+    def touch_response(self, key):
+        """Mark a stored response as just revalidated, so eviction keeps it."""
+        with self.lock:
+            self.conn.execute("UPDATE responses SET stored = ? WHERE key = ?", (time.time(), key))
+    
+    def _evict(self, now):
+        """Drop expired entries, then the oldest ones beyond max_entries, and trim stored responses."""
+        self.conn.execute("DELETE FROM results WHERE expires <= ?", (now,))
+        excess = self.conn.execute("SELECT COUNT(*) FROM results").fetchone()[0] - self.max_entries
+        if excess > 0:
+            self.conn.execute(
+                "DELETE FROM results WHERE rowid IN (SELECT rowid FROM results ORDER BY stored LIMIT ?)", (excess,)
+            )
+        
+        # Keep the newest responses that fit in both the entry and the byte bound
+        self.conn.execute(
+            "DELETE FROM responses WHERE key IN (SELECT key FROM ("
+            "SELECT key, ROW_NUMBER() OVER newest AS position, SUM(size) OVER newest AS running FROM responses "
+            "WINDOW newest AS (ORDER BY stored DESC)) WHERE position > ? OR running > ?)",
+            (self.max_responses, self.max_response_bytes)
+        )
+    
+    def close(self):
+        """Apply the size bound and close the database."""
+        with self.lock:
+            self._evict(time.time())
+            self.conn.close()
+
+def revalidated(cache, metrics, site, key, stored, keep_body=False):
+    """Answer a probe from a stored response after a 304 Not Modified, as _probe_once would."""
+    cache.touch_response(key)
+    metrics.inc("revalidations_total", site=site.name, result="not_modified")
+    page = (stored["status"], stored["body"]) if keep_body else None
+    return tuple(stored["verdict"]), None, page
+
+class AsyncProbeEngine:
+    """Run site probes as coroutines on one pooled aiohttp session.
+    
+    A global semaphore bounds the number of probes in flight, while the
+    connector caps connections per host and keeps them alive for reuse.
+    """
+    
+    def __init__(self, max_concurrency=DEFAULT_ASYNC_CONCURRENCY, per_host=DEFAULT_PER_HOST_LIMIT, timeout=REQUEST_TIMEOUT,
+                 cache=None, rate_limiter=None, max_retries=DEFAULT_MAX_RETRIES, profiler=None, metrics=None,
+                 health=None, budget=None, flights=None):
+        self.max_concurrency = max_concurrency
+        self.per_host = per_host
+        self.timeout = timeout
+        self.cache = cache
+        self.rate_limiter = rate_limiter or HostRateLimiter()
+        self.max_retries = max_retries
+        self.profiler = profiler
+        self.metrics = metrics or Metrics()
+        self.health = health or HostHealth(max_read=timeout)
+        self.budget = budget or TargetBudget()
+        self.flights = flights or SingleFlight(self.metrics)
+        self.session = None
+        self.semaphore = None
+    
+    async def __aenter__(self):
+        try:
+            import aiohttp
+        except ImportError:
+            raise RuntimeError("The async engine requires aiohttp (pip install aiohttp)")
+        
+        connector = aiohttp.TCPConnector(limit=self.max_concurrency, limit_per_host=self.per_host,
+                                         keepalive_timeout=30, ttl_dns_cache=300)
+        self.session = aiohttp.ClientSession(connector=connector, headers={"User-Agent": USER_AGENT},
+                                             timeout=aiohttp.ClientTimeout(total=self.timeout))
+        self.semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        await self.session.close()
+    
+    async def _cache_call(self, method, *args):
+        """Run a ResultCache method in the default executor so SQLite never blocks the event loop."""
+        return await asyncio.get_running_loop().run_in_executor(None, method, *args)
+    
+    async def check_site(self, site_name, site_info, username):
+        """Check if username exists on a specific site; same contract as FinderBuster.check_site."""
+        site = as_site(site_name, site_info)
+        cached = await self._cache_call(self.cache.get, "site", username, site_name, site.case_sensitive) if self.cache else None
+        if cached is not None:
+            return tuple(cached)
+        
+        result, _ = await self._probe_site(site, username)
+        if self.cache and is_conclusive(result):
+            await self._cache_call(self.cache.set, "site", username, list(result), site_name, site.case_sensitive)
+        return result
+    
+    async def check_site_profile(self, site_name, site_info, username):
+        """Like check_site, but on a hit also return the profile parsed by profiler from the same response."""
+        site = as_site(site_name, site_info)
+        if not site.profile:
+            return await self.check_site(site_name, site, username) + (None,)
+        
+        loop = asyncio.get_running_loop()
+        cached = await self._cache_call(self.cache.get, "site", username, site_name, site.case_sensitive) if self.cache else None
+        if cached is not None:
+            result, page = tuple(cached), None
+        else:
+            result, page = await self._probe_site(site, username, keep_body=True)
+            if self.cache and is_conclusive(result):
+                await self._cache_call(self.cache.set, "site", username, list(result), site_name, site.case_sensitive)
+        
+        if not result[0]:
+            return result + (None,)
+        # Parsing is CPU-bound (and a cache hit may need a fetch), so keep it off the event loop
+        record = await loop.run_in_executor(None, self.profiler, site.profile, username, page)
+        return result + (record["results"],)
+    
+    async def _probe_site(self, site, username, keep_body=False):
+        """Probe a site for a username, sharing the probe with an identical one already in flight."""
+        url = site.url.format(username)
+        return await self.flights.run(("probe", site.name, normalize_url(url), keep_body),
+                                      lambda: self._probe_url(site, url, username, keep_body))
+    
+    async def _probe_url(self, site, url, username, keep_body=False):
+        """Probe a site's URL for a username over the network, backing off while the host throttles us."""
+        import aiohttp
+        host = site.host
+        deadline = self.budget.deadline(username)
+        
+        for attempt in range(self.max_retries + 1):
+            if time.monotonic() >= deadline:
+                self.metrics.inc("probe_errors_total", site=site.name, error="budget_exhausted")
+                return (None, url, BUDGET_EXHAUSTED_MESSAGE), None
+            allowed, trial = self.health.acquire(host)
+            if not allowed:
+                self.metrics.inc("probe_errors_total", site=site.name, error="circuit_open")
+                return (None, url, CIRCUIT_OPEN_MESSAGE), None
+            
+            # A circuit's trial request must be settled however it ends, or the host stays skipped for good
+            try:
+                wait = self.rate_limiter.reserve(host, min(BACKOFF_MAX, deadline - time.monotonic()))
+                if wait is None:
+                    break
+                await asyncio.sleep(wait)
+                
+                async with self.semaphore:
+                    remaining = deadline - time.monotonic()
+                    connect, read = self.health.timeout(host, remaining if remaining != float("inf") else None)
+                    timeout = aiohttp.ClientTimeout(total=remaining if remaining != float("inf") else None,
+                                                    sock_connect=connect, sock_read=read)
+                    start = time.perf_counter()
+                    try:
+                        with self.metrics.timer("probe", site=site.name):
+                            result, retry_after, page = await self._probe_once(site, url, keep_body, timeout)
+                    except asyncio.TimeoutError:
+                        if time.monotonic() >= deadline:
+                            self.metrics.inc("probe_errors_total", site=site.name, error="budget_exhausted")
+                            return (None, url, BUDGET_EXHAUSTED_MESSAGE), None
+                        self.metrics.inc("probe_errors_total", site=site.name, error="timeout")
+                        self._host_failed(host)
+                        return (None, url, "Request timed out"), None
+                    except aiohttp.ClientConnectionError:
+                        self.metrics.inc("probe_errors_total", site=site.name, error="connection")
+                        self._host_failed(host)
+                        return (None, url, "Connection error"), None
+                    except aiohttp.ClientError as e:
+                        self.metrics.inc("probe_errors_total", site=site.name, error="request")
+                        return (None, url, f"Request error: {str(e)}"), None
+                    self.health.succeeded(host, time.perf_counter() - start)
+            finally:
+                if trial:
+                    self.health.release(host)
+            
+            if result is not None:
+                self.rate_limiter.succeeded(host)
+                return result, page
+            self.metrics.inc("probe_retries_total", site=site.name)
+            self.rate_limiter.throttled(host, backoff_delay(attempt, retry_after))
+        
+        self.metrics.inc("probe_errors_total", site=site.name, error="rate_limited")
+        return (None, url, RATE_LIMITED_MESSAGE), None
+    
+    def _host_failed(self, host):
+        """Count a failure against host, announcing when its circuit opens."""
+        if self.health.failed(host):
+            self.metrics.inc("circuit_opened_total", host=host)
+            print(f"{Fore.YELLOW}[!] {host} keeps failing; skipping it for {self.health.cooldown:.0f}s")
+    
+    async def _probe_once(self, site, url, keep_body=False, timeout=None):
+        """Send one probe; returns (result, None, page), or (None, retry_after, None) if throttled.
+        
+        With keep_body the whole response is read and page is (status, text), otherwise None.
+        """
+        method = self.session.head if site.probe == "head" and not keep_body else self.session.get
+        key = f"{site.name}:{url}"
+        stored, headers = await self._cache_call(self.cache.revalidation, key, True, keep_body) if self.cache else (None, {})
+        
+        async with method(url, allow_redirects=True, timeout=timeout, headers=headers) as response:
+            if response.status == 304 and stored:
+                return await self._cache_call(revalidated, self.cache, self.metrics, site, key, stored, keep_body)
+            full = keep_body or (site.needs_body and site.probe == "get")
+            if site.is_throttled(response.status):
+                await drain_async_response(response)
+                return None, parse_retry_after(response.headers.get("Retry-After")), None
+            
+            text = ""
+            if full:
+                body = await response.read()
+                self.metrics.inc("bytes_received_total", len(body), site=site.name)
+                text = body.decode(response.charset or "utf-8", "replace")
+            elif site.needs_body:
+                scanner = BodyScanner(site, response.charset or "utf-8")
+                async for chunk in response.content.iter_chunked(PROBE_CHUNK_SIZE):
+                    if scanner.feed(chunk):
+                        break
+                self.metrics.inc("bytes_received_total", len(scanner.buffer), site=site.name)
+                text = scanner.text()
+            page = (response.status, text) if keep_body else None
+            result = site.evaluate(url, response.status, str(response.url), text)
+            if self.cache:
+                await self._cache_call(self.cache.store_response, key, response.headers, response.status, result,
+                                       text if full else None)
+            if not full:
+                await drain_async_response(response)
+            return result, None, page
+    
+    async def iter_results(self, jobs, max_in_flight):
+        """Yield (job, future) pairs as probes complete, keeping at most max_in_flight running."""
+        pending = {}
+        check = self.check_site_profile if self.profiler else self.check_site
+        
+        def submit(count):
+            for job in itertools.islice(jobs, count):
+                username, site_name, site_info = job
+                pending[asyncio.ensure_future(check(site_name, site_info, username))] = job
+        
+        submit(max_in_flight)
+        while pending:
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for future in done:
+                yield pending.pop(future), future
+            submit(len(done))
+
 class FinderBuster:
-    def __init__(self):
+    def __init__(self, max_workers=DEFAULT_WORKERS, engine="thread", per_host=DEFAULT_PER_HOST_LIMIT, cache=None, resolver=None,
+                 rate_limiter=None, max_retries=DEFAULT_MAX_RETRIES, sites=None, profile=False, metrics=None,
+                 health=None, budget=DEFAULT_TARGET_BUDGET, pool_size=None, http2=False, preresolve=True, workers=1,
+                 work_queue=None, flights=None, whois_client=None, whois_raw=False):
+        self.sites = sites if sites is not None else SiteDatabase(SITES).select()
+        self.profile = profile
+        self.metrics = metrics or Metrics()
+        self.health = health or HostHealth()
+        self.budget = TargetBudget(budget)
+        # Identical probes, page downloads, DNS queries and domain lookups in flight at once share one result
+        self.flights = flights or SingleFlight(self.metrics)
+        self.max_workers = max_workers
+        self.engine = engine
+        self.per_host = per_host
+        self.cache = cache
+        self._resolver = resolver
+        self._whois_client = whois_client
+        self.whois_raw = whois_raw
+        self.rate_limiter = rate_limiter or HostRateLimiter()
+        self.max_retries = max_retries
+        self._stage_executor = None
+        self.preresolve = preresolve
+        self.pool_size = pool_size
+        self.http2 = http2
+        self.workers = workers
+        self.work_queue = work_queue
+        # Number of processes sharing per-site limits, so each takes its part of them
+        self.shares = 1
+        # Site hostnames resolved up front are cached for this session's connections only
+        self.addresses = AddressCache() if preresolve else None
         self.session = requests.Session()
         self.session.headers.update({"User-Agent": USER_AGENT})
+        
+        # Size the connection pool to the worker count so concurrent probes don't discard connections,
+        # and keep a pool for every site (or every domain in flight) so none is evicted mid-run
+        pool_size = pool_size or max_workers
+        pool_connections = max(len(self.sites), max_workers, 10)
+        if preresolve:
+            adapter = self.addresses.adapter(pool_connections=pool_connections, pool_maxsize=pool_size)
+        else:
+            adapter = requests.adapters.HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_size)
+        self.session.mount("https://", Http2Adapter(pool_size, pool_connections) if http2 else adapter)
+        self.session.mount("http://", adapter)
         self.results = {}
         self.output_dir = "finderbuster_results"
-        
-        # Create output directory if it doesn't exist
-        if not os.path.exists(self.output_dir):
-            os.makedirs(self.output_dir)
+    
+    def _cache_get(self, operation, target, site="", case_sensitive=False):
+        """Look up a cached result if caching is enabled."""
+        return self.cache.get(operation, target, site, case_sensitive) if self.cache else None
+    
+    def _cache_set(self, operation, target, value, site="", case_sensitive=False):
+        """Store a result if caching is enabled."""
+        if self.cache:
+            self.cache.set(operation, target, value, site, case_sensitive)
     
     def print_banner(self):
         """Print the banner of the tool."""
         print(BANNER)
     
-    def save_results(self, filename):
-        """Save results to a JSON file."""
+    def output_path(self, filename, fmt="json", compression=None):
+        """Build a timestamped path for an output file in the results directory, creating the directory on first use."""
+        os.makedirs(self.output_dir, exist_ok=True)
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filepath = os.path.join(self.output_dir, f"{filename}_{timestamp}.json")
+        return os.path.join(self.output_dir, f"{filename}_{timestamp}.{output_extension(fmt, compression)}")
+    
+    def save_results(self, filename, fmt="json", compression=None, compact=False, filepath=None):
+        """Save results to a JSON (or JSON Lines) file."""
+        filepath = filepath or self.output_path(filename, fmt, compression)
         
-        with open(filepath, 'w') as f:
-            json.dump(self.results, f, indent=4)
+        if fmt == "json":
+            write_json(filepath, self.results, compression, compact)
+        else:
+            with open_sink(filepath, fmt, compression) as sink:
+                sink.write(self.results)
         
         print(f"{Fore.GREEN}[+] Results saved to {filepath}")
         return filepath
     
     def check_username(self, username):
         """Check username across various social media platforms."""
-        print(f"\n{Fore.YELLOW}[*] Looking for username '{username}' across {len(SITES)} platforms...")
+        print(f"\n{Fore.YELLOW}[*] Looking for username '{username}' across {len(self.sites)} platforms...")
         self.results["username_search"] = {"input": username, "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"), "results": {}}
         
-        # Use ThreadPoolExecutor to check sites concurrently
-        with concurrent.futures.ThreadPoolExecutor(max_workers=10) as executor:
-            future_to_site = {
-                executor.submit(self.check_site, site_name, site_info, username): site_name
-                for site_name, site_info in SITES.items()
+        for record in self.iter_username_results([username]):
+            self._print_site_result(record)
+            self.results["username_search"]["results"][record["site"]] = {
+                "exists": record["exists"],
+                "url": record["url"],
+                "message": record["message"]
             }
-            
-            for future in concurrent.futures.as_completed(future_to_site):
-                site_name = future_to_site[future]
-                try:
-                    exists, profile_url, message = future.result()
-                    
-                    if exists:
-                        print(f"{Fore.GREEN}[+] {site_name}: {profile_url} - {message}")
-                    else:
-                        print(f"{Fore.RED}[-] {site_name}: {message}")
-                    
-                    self.results["username_search"]["results"][site_name] = {
-                        "exists": exists,
-                        "url": profile_url,
-                        "message": message
-                    }
-                    
-                except Exception as e:
-                    print(f"{Fore.RED}[!] Error checking {site_name}: {str(e)}")
-                    self.results["username_search"]["results"][site_name] = {
-                        "exists": False,
-                        "url": SITES[site_name]["url"].format(username),
-                        "message": f"Error: {str(e)}"
-                    }
+            if "profile" in record:
+                self.results["username_search"]["results"][record["site"]]["profile"] = record["profile"]
         
         # Summary
         found_count = sum(1 for site in self.results["username_search"]["results"].values() if site["exists"])
-        print(f"\n{Fore.YELLOW}[*] Username search complete. Found on {found_count} out of {len(SITES)} platforms.")
+        print(f"\n{Fore.YELLOW}[*] Username search complete. Found on {found_count} out of {len(self.sites)} platforms.")
         
         return self.results["username_search"]
     
+    def check_usernames(self, usernames, sink, max_in_flight=None, checkpoint=None, dedupe=None):
+        """Check many usernames through one shared worker pool, streaming each result to sink as it completes."""
+        print(f"\n{Fore.YELLOW}[*] Bulk username search across {len(self.sites)} platforms with {self.max_workers} workers...")
+        
+        skip = checkpoint.is_done if checkpoint else None
+        probe_count = found_count = 0
+        for record in self.iter_username_results(usernames, max_in_flight, skip, dedupe):
+            self._print_site_result(record, show_username=True)
+            sink.write(record)
+            if checkpoint:
+                checkpoint.mark(record["username"], record["site"])
+            probe_count += 1
+            found_count += bool(record["exists"])
+        
+        print(f"\n{Fore.YELLOW}[*] Bulk search complete. {probe_count} checks run, {found_count} profiles found.")
+        if dedupe:
+            print(f"{Fore.YELLOW}[*] Skipped {dedupe.duplicates} duplicate probes of equivalent usernames.")
+        return found_count
+    
+    def iter_username_results(self, usernames, max_in_flight=None, skip=None, dedupe=None):
+        """Yield one result per (username, site) job as soon as it completes.
+        
+        Jobs from all usernames are interleaved on a single pool, and at most
+        max_in_flight of them are queued at once so huge inputs stream through
+        in constant memory. Jobs for which skip(username, site_name) is true
+        are left out, as are jobs whose site-normalized username the dedupe
+        window has recently seen for that site.
+        """
+        max_in_flight = max_in_flight or self.max_workers * 4
+        jobs = ((username, site.name, site) for username in usernames for site in self.sites
+                if not (dedupe and dedupe.seen((site.name, site.normalize(username))))
+                and not (skip and skip(username, site.name)))
+        
+        if self.sharded:
+            yield from self._iter_sharded("username", ((username, site_name) for username, site_name, _ in jobs), max_in_flight)
+        else:
+            yield from self._iter_jobs(jobs, max_in_flight)
+    
+    def _iter_jobs(self, jobs, max_in_flight):
+        """Run (username, site_name, site) jobs on this process's engine, yielding records as they complete.
+        
+        A username's time budget runs from its first job until its last one
+        completes, so one checked again later starts with a fresh allowance.
+        """
+        if self.preresolve:
+            self.addresses.prime((site.url for site in self.sites), self.resolver)
+        outstanding = collections.Counter()
+        lock = threading.Lock()
+        
+        def budgeted():
+            # Hold the budget of the username being queued too, so it cannot lapse between two batches of its jobs
+            current = None
+            try:
+                for job in jobs:
+                    if job[0] != current:
+                        if current is not None:
+                            self.budget.end(current)
+                        current = job[0]
+                        self.budget.begin(current)
+                    with lock:
+                        outstanding[current] += 1
+                    self.budget.begin(current)
+                    yield job
+            finally:
+                if current is not None:
+                    self.budget.end(current)
+        
+        if self.engine == "async":
+            results = self._iter_async_results(budgeted(), max_in_flight)
+        else:
+            results = self._iter_thread_results(budgeted(), max_in_flight)
+        try:
+            for record in results:
+                with lock:
+                    outstanding[record["username"]] -= 1
+                self.budget.end(record["username"])
+                yield record
+        finally:
+            results.close()
+            for username, count in outstanding.items():
+                if count:
+                    self.budget.end(username, count)
+    
+    @property
+    def sharded(self):
+        """Whether work is spread over worker processes instead of run here."""
+        return self.workers > 1 or self.work_queue is not None
+    
+    def _iter_sharded(self, command, units, max_in_flight, per_platform=None):
+        """Spread units over worker processes (and other hosts sharing the work queue), yielding their records here.
+        
+        Each worker runs the usual engine with --concurrency of its own and a
+        share of the per-site rate. Records are written by this process, so
+        output, checkpoints and stats stay in one place.
+        """
+        context = multiprocessing.get_context("spawn")
+        results = context.Queue(maxsize=max_in_flight * 2)
+        tasks = None
+        if self.work_queue:
+            threading.Thread(target=self.work_queue.add, args=(units,), daemon=True).start()
+        else:
+            tasks = context.Queue(maxsize=self.workers * 2)
+            threading.Thread(target=_feed_batches, args=(units, tasks, self.workers), daemon=True).start()
+        
+        options = {"max_workers": self.max_workers, "engine": self.engine, "per_host": self.per_host,
+                   "max_retries": self.max_retries, "sites": self.sites, "profile": self.profile,
+                   "budget": self.budget.seconds, "pool_size": self.pool_size, "http2": self.http2,
+                   "preresolve": self.preresolve, "whois_raw": self.whois_raw}
+        settings = {"cache_path": self.cache.path if self.cache else None, "refresh": bool(self.cache and self.cache.refresh),
+                    "resolver": (self._resolver.nameservers, self._resolver.timeout) if self._resolver else None,
+                    "whois": (max(1, self.whois_client.max_concurrency // self.workers), self.whois_client.rate / self.workers),
+                    "rates": (self.rate_limiter.rate / self.workers, self.rate_limiter.max_rate / self.workers), "timeouts": (self.health.connect, self.health.max_read),
+                    "shares": self.workers, "max_in_flight": max(self.max_workers, max_in_flight // self.workers), "per_platform": per_platform}
+        queue_path = self.work_queue.path if self.work_queue else None
+        processes = [context.Process(target=_shard_worker, args=(command, options, settings, tasks, results, queue_path, index),
+                                     daemon=True) for index in range(self.workers)]
+        for process in processes:
+            process.start()
+        print(f"{Fore.YELLOW}[*] Running on {self.workers} worker processes"
+              + (f" sharing work queue {queue_path}" if queue_path else ""))
+        
+        running = set(range(self.workers))
+        exited = set()
+        while running:
+            try:
+                worker_id, kind, payload = results.get(timeout=1)
+            except queue.Empty:
+                # A worker found dead on two polls in a row has crashed without reporting
+                for index in exited & running:
+                    print(f"{Fore.RED}[!] Worker {index} exited unexpectedly (exit code {processes[index].exitcode})")
+                    running.discard(index)
+                exited = {index for index in running if not processes[index].is_alive()}
+                continue
+            
+            if kind == "record":
+                yield payload
+                if self.work_queue:
+                    self.work_queue.finish(self._shard_unit(command, payload))
+            elif kind == "error":
+                print(f"{Fore.RED}[!] Worker {worker_id} failed: {payload}")
+            else:
+                self.metrics.merge(payload)
+                running.discard(worker_id)
+        
+        for process in processes:
+            process.join()
+        if self.work_queue:
+            self.work_queue.flush()
+            counts = self.work_queue.counts()
+            print(f"{Fore.YELLOW}[*] Work queue: {counts['done']} units done, {counts['leased']} leased, {counts['pending']} pending")
+    
+    @staticmethod
+    def _shard_unit(command, record):
+        """The work unit a record answers, as it was queued."""
+        if command == "username":
+            return [record["username"], record["site"]]
+        if command == "domain":
+            return record["input"]
+        return [record["platform"], record["identifier"]]
+    
+    def _iter_thread_results(self, jobs, max_in_flight):
+        """Run jobs on a shared thread pool, yielding records as they complete."""
+        check = self.check_site_profile if self.profile else self.check_site
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            pending = {}
+            
+            def submit(count):
+                for username, site_name, site_info in itertools.islice(jobs, count):
+                    future = executor.submit(check, site_name, site_info, username)
+                    pending[future] = (username, site_name, site_info)
+            
+            submit(max_in_flight)
+            while pending:
+                done, _ = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    username, site_name, site_info = pending.pop(future)
+                    yield self._site_record(future, username, site_name, site_info)
+                submit(len(done))
+    
+    def _iter_async_results(self, jobs, max_in_flight):
+        """Run jobs on the asyncio engine in a background loop and yield records here."""
+        records = queue.Queue(maxsize=max_in_flight)
+        done = object()
+        
+        async def produce():
+            async with AsyncProbeEngine(self.max_workers, self.per_host, self.health.max_read, cache=self.cache,
+                                        rate_limiter=self.rate_limiter, max_retries=self.max_retries,
+                                        profiler=self.profile_record if self.profile else None, metrics=self.metrics,
+                                        health=self.health, budget=self.budget, flights=self.flights) as engine:
+                async for (username, site_name, site_info), future in engine.iter_results(jobs, max_in_flight):
+                    record = self._site_record(future, username, site_name, site_info)
+                    await asyncio.get_running_loop().run_in_executor(None, records.put, record)
+        
+        def run():
+            try:
+                asyncio.run(produce())
+            except Exception as e:
+                records.put(e)
+            records.put(done)
+        
+        threading.Thread(target=run, daemon=True).start()
+        while True:
+            item = records.get()
+            if item is done:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    
+    def _site_record(self, future, username, site_name, site_info):
+        """Turn a finished check_site future into a result record."""
+        profile = None
+        try:
+            exists, profile_url, message, *profile = future.result()
+            profile = profile[0] if profile else None
+        except Exception as e:
+            exists, profile_url, message = False, site_info.url.format(username), f"Error: {str(e)}"
+        
+        record = {"username": username, "site": site_name, "exists": exists, "url": profile_url, "message": message}
+        if profile is not None:
+            record["profile"] = profile
+        return record
+    
+    def _print_site_result(self, record, show_username=False):
+        """Print a single username/site result."""
+        label = f"{record['site']} ({record['username']})" if show_username else record["site"]
+        if record["exists"] is None:
+            print(f"{Fore.YELLOW}[?] {label}: {record['message']}")
+        elif record["exists"]:
+            print(f"{Fore.GREEN}[+] {label}: {record['url']} - {record['message']}")
+            for key, value in record.get("profile", {}).items():
+                if key not in ("profile_url", "exists", "note"):
+                    print(f"{Fore.GREEN}    {key}: {value}")
+        elif record["message"].startswith("Error: "):
+            print(f"{Fore.RED}[!] Error checking {label}: {record['message'][len('Error: '):]}")
+        else:
+            print(f"{Fore.RED}[-] {label}: {record['message']}")
+    
     def check_site(self, site_name, site_info, username):
         """Check if username exists on a specific site."""
-        url = site_info["url"].format(username)
-        error_type = site_info["error_type"]
-        error_value = site_info["error_value"]
+        site = as_site(site_name, site_info)
+        cached = self._cache_get("site", username, site_name, site.case_sensitive)
+        if cached is not None:
+            return tuple(cached)
         
-        try:
-            response = self.session.get(url, timeout=10, allow_redirects=True)
+        result, _ = self._probe_site(site, username)
+        if is_conclusive(result):
+            self._cache_set("site", username, list(result), site_name, site.case_sensitive)
+        return result
+    
+    def check_site_profile(self, site_name, site_info, username):
+        """Like check_site, but on a hit also parse the profile from the response that found it."""
+        site = as_site(site_name, site_info)
+        if not site.profile:
+            return self.check_site(site_name, site, username) + (None,)
+        
+        cached = self._cache_get("site", username, site_name, site.case_sensitive)
+        if cached is not None:
+            result, page = tuple(cached), None
+        else:
+            result, page = self._probe_site(site, username, keep_body=True)
+            if is_conclusive(result):
+                self._cache_set("site", username, list(result), site_name, site.case_sensitive)
+        
+        if not result[0]:
+            return result + (None,)
+        return result + (self.profile_record(site.profile, username, page)["results"],)
+    
+    def _probe_site(self, site, username, keep_body=False):
+        """Probe a site for a username, sharing the probe with an identical one already in flight."""
+        url = site.url.format(username)
+        return self.flights.do(("probe", site.name, normalize_url(url), keep_body), self._probe_url, site, url, username, keep_body)
+    
+    def _probe_url(self, site, url, username, keep_body=False):
+        """Probe a site's URL for a username over the network, backing off while the host throttles us."""
+        host = site.host
+        deadline = self.budget.deadline(username)
+        
+        for attempt in range(self.max_retries + 1):
+            # Dead hosts and exhausted budgets are skipped instead of tying up a worker
+            if time.monotonic() >= deadline:
+                self.metrics.inc("probe_errors_total", site=site.name, error="budget_exhausted")
+                return (None, url, BUDGET_EXHAUSTED_MESSAGE), None
+            allowed, trial = self.health.acquire(host)
+            if not allowed:
+                self.metrics.inc("probe_errors_total", site=site.name, error="circuit_open")
+                return (None, url, CIRCUIT_OPEN_MESSAGE), None
             
-            if error_type == "response_code":
-                if response.status_code != error_value:
-                    return True, url, "Profile exists"
-                else:
-                    return False, url, "Profile not found"
+            # A circuit's trial request must be settled however it ends, or the host stays skipped for good
+            try:
+                # Give up rather than tie up a worker when the host is backed off for too long
+                wait = self.rate_limiter.reserve(host, min(BACKOFF_MAX, deadline - time.monotonic()))
+                if wait is None:
+                    break
+                time.sleep(wait)
+                
+                remaining = deadline - time.monotonic()
+                timeout = self.health.timeout(host, remaining if remaining != float("inf") else None)
+                start = time.perf_counter()
+                try:
+                    with self.metrics.timer("probe", site=site.name):
+                        result, retry_after, page = self._probe_once(site, url, keep_body, timeout)
+                except requests.ConnectionError:
+                    self.metrics.inc("probe_errors_total", site=site.name, error="connection")
+                    self._host_failed(host)
+                    return (None, url, "Connection error"), None
+                except requests.Timeout:
+                    if time.monotonic() >= deadline:
+                        self.metrics.inc("probe_errors_total", site=site.name, error="budget_exhausted")
+                        return (None, url, BUDGET_EXHAUSTED_MESSAGE), None
+                    self.metrics.inc("probe_errors_total", site=site.name, error="timeout")
+                    self._host_failed(host)
+                    return (None, url, "Request timed out"), None
+                except requests.RequestException as e:
+                    self.metrics.inc("probe_errors_total", site=site.name, error="request")
+                    return (None, url, f"Request error: {str(e)}"), None
+                self.health.succeeded(host, time.perf_counter() - start)
+            finally:
+                if trial:
+                    self.health.release(host)
             
-            elif error_type == "message":
-                if error_value not in response.text:
-                    return True, url, "Profile exists"
-                else:
-                    return False, url, "Profile not found"
+            if result is not None:
+                self.rate_limiter.succeeded(host)
+                return result, page
+            self.metrics.inc("probe_retries_total", site=site.name)
+            self.rate_limiter.throttled(host, backoff_delay(attempt, retry_after))
+        
+        self.metrics.inc("probe_errors_total", site=site.name, error="rate_limited")
+        return (None, url, RATE_LIMITED_MESSAGE), None
+    
+    def _host_failed(self, host):
+        """Count a failure against host, announcing when its circuit opens."""
+        if self.health.failed(host):
+            self.metrics.inc("circuit_opened_total", host=host)
+            print(f"{Fore.YELLOW}[!] {host} keeps failing; skipping it for {self.health.cooldown:.0f}s")
+    
+    def _guarded_get(self, url, **kwargs):
+        """GET through the shared session using the host's adaptive timeouts and circuit breaker."""
+        host = urlparse(url).netloc
+        allowed, trial = self.health.acquire(host)
+        if not allowed:
+            raise requests.ConnectionError(f"{host} is unavailable (skipped after repeated failures)")
+        
+        start = time.perf_counter()
+        try:
+            response = self._shared_get(url, self.health.timeout(host), **kwargs)
+        except (requests.ConnectionError, requests.Timeout):
+            self._host_failed(host)
+            raise
+        finally:
+            if trial:
+                self.health.release(host)
+        self.health.succeeded(host, time.perf_counter() - start)
+        return response
+    
+    def _shared_get(self, url, timeout, headers=None):
+        """Download a whole response, sharing it with an identical request (same URL and headers) already in flight."""
+        headers = headers or {}
+        key = ("http", normalize_url(url), tuple(sorted(headers.items())))
+        return self.flights.do(key, lambda: self.session.get(url, timeout=timeout, headers=headers))
+    
+    def _probe_once(self, site, url, keep_body=False, timeout=None):
+        """Send one probe; returns (result, None, page), or (None, retry_after, None) if throttled.
+        
+        With keep_body the whole response is downloaded and page is (status_code, text), otherwise None.
+        timeout is a (connect, read) tuple, by default the host's adaptive timeouts.
+        """
+        timeout = timeout or self.health.timeout(urlparse(url).netloc)
+        key = f"{site.name}:{url}"
+        stored, headers = self.cache.revalidation(key, True, keep_body) if self.cache else (None, {})
+        if site.probe == "head" and not keep_body:
+            response = self.session.head(url, timeout=timeout, allow_redirects=True, headers=headers)
+            if response.status_code == 304 and stored:
+                return revalidated(self.cache, self.metrics, site, key, stored, keep_body)
+            if site.is_throttled(response.status_code):
+                return None, parse_retry_after(response.headers.get("Retry-After")), None
+            result = site.evaluate(url, response.status_code, response.url)
+            self._store_response(key, response, result)
+            return result, None, None
+        
+        # Streamed responses drain what is left of a small body before closing, so the connection is reused;
+        # whole ones may be shared with a profile download of the same page
+        full = keep_body or site.probe == "get"
+        if full:
+            response = self._shared_get(url, timeout, headers)
+        else:
+            response = self.session.get(url, timeout=timeout, allow_redirects=True, stream=True, headers=headers)
+        with response:
+            if response.status_code == 304 and stored:
+                return revalidated(self.cache, self.metrics, site, key, stored, keep_body)
+            if site.is_throttled(response.status_code):
+                if not full:
+                    drain_response(response)
+                return None, parse_retry_after(response.headers.get("Retry-After")), None
             
-        except ConnectionError:
-            return False, url, "Connection error"
-        except Timeout:
-            return False, url, "Request timed out"
-        except RequestException as e:
-            return False, url, f"Request error: {str(e)}"
+            text = ""
+            if keep_body or (site.needs_body and site.probe == "get"):
+                self.metrics.inc("bytes_received_total", len(response.content), site=site.name)
+                text = response.text
+            elif site.needs_body:
+                scanner = BodyScanner(site, response.encoding or "utf-8")
+                for chunk in response.iter_content(PROBE_CHUNK_SIZE):
+                    if scanner.feed(chunk):
+                        break
+                self.metrics.inc("bytes_received_total", len(scanner.buffer), site=site.name)
+                text = scanner.text()
+            page = (response.status_code, text) if keep_body else None
+            result = site.evaluate(url, response.status_code, response.url, text)
+            self._store_response(key, response, result, text if keep_body or (site.needs_body and site.probe == "get") else None)
+            if not full:
+                drain_response(response)
+            return result, None, page
+    
+    def _store_response(self, key, response, result=None, body=None):
+        """Keep a response's validators (with its verdict or body) for conditional requests on later scans."""
+        if self.cache and (result is None or is_conclusive(result)):
+            self.cache.store_response(key, response.headers, response.status_code, list(result) if result else None, body)
     
     def get_domain_info(self, domain):
         """Gather extensive domain information including WHOIS, DNS, and server details."""
@@ -216,417 +3021,518 @@ class FinderBuster:
             self.results["domain_info"]["results"]["error"] = "Invalid domain format"
             return self.results["domain_info"]
         
-        # Get WHOIS information
-        try:
-            print(f"{Fore.CYAN}[*] Fetching WHOIS information...")
-            whois_info = whois.whois(domain)
-            self.results["domain_info"]["results"]["whois"] = {
-                "registrar": whois_info.registrar,
-                "creation_date": str(whois_info.creation_date) if whois_info.creation_date else None,
-                "expiration_date": str(whois_info.expiration_date) if whois_info.expiration_date else None,
-                "updated_date": str(whois_info.updated_date) if whois_info.updated_date else None,
-                "name_servers": whois_info.name_servers,
-                "status": whois_info.status,
-                "emails": whois_info.emails,
-                "country": whois_info.country,
-                "org": whois_info.org
-            }
-            
-            print(f"{Fore.GREEN}[+] WHOIS: Registrar: {whois_info.registrar}")
-            print(f"{Fore.GREEN}[+] WHOIS: Creation Date: {whois_info.creation_date}")
-            print(f"{Fore.GREEN}[+] WHOIS: Expiration Date: {whois_info.expiration_date}")
-            if whois_info.name_servers:
-                print(f"{Fore.GREEN}[+] WHOIS: Name Servers: {', '.join(whois_info.name_servers) if isinstance(whois_info.name_servers, list) else whois_info.name_servers}")
+        print(f"{Fore.CYAN}[*] Fetching WHOIS, DNS, IP and HTTP information concurrently...")
+        self.results["domain_info"]["results"] = self._gather_domain_info(domain)
+        self._print_domain_info(self.results["domain_info"]["results"])
+        
+        print(f"\n{Fore.YELLOW}[*] Domain information gathering complete for {domain}")
+        return self.results["domain_info"]
+    
+    def check_domains(self, domains, sink, max_in_flight=None, checkpoint=None):
+        """Profile many domains concurrently, streaming each record to sink as it completes."""
+        print(f"\n{Fore.YELLOW}[*] Bulk domain lookup with {self.max_workers} workers...")
+        count = 0
+        
+        if checkpoint:
+            domains = (domain for domain in domains if not checkpoint.is_done(domain, "domain"))
+        
+        for record in self.iter_domain_results(domains, max_in_flight):
+            sink.write(record)
+            if checkpoint:
+                checkpoint.mark(record["input"], "domain")
+            count += 1
+            
+            results = record["results"]
+            if "error" in results:
+                print(f"{Fore.RED}[!] {record['input']}: {results['error']}")
+            else:
+                ip = results["ip"].get("address", "no IP")
+                status = results["http"].get("status_code", "no HTTP")
+                print(f"{Fore.GREEN}[+] {record['input']}: {ip}, HTTP {status}, registrar: {results['whois'].get('registrar')}")
+        
+        print(f"\n{Fore.YELLOW}[*] Bulk domain lookup complete. {count} domains processed.")
+        return count
+    
+    def iter_domain_results(self, domains, max_in_flight=None):
+        """Yield one record per domain as soon as all of its stages finish, with bounded parallelism."""
+        max_in_flight = max_in_flight or self.max_workers * 2
+        if self.sharded:
+            yield from self._iter_sharded("domain", domains, max_in_flight)
+            return
+        domains = iter(domains)
+        
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            pending = {}
+            
+            def submit(count):
+                for domain in itertools.islice(domains, count):
+                    pending[executor.submit(self._domain_record, domain)] = domain
+            
+            submit(max_in_flight)
+            while pending:
+                done, _ = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    domain = pending.pop(future)
+                    try:
+                        yield future.result()
+                    except Exception as e:
+                        yield {"input": domain, "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"), "results": {"error": str(e)}}
+                submit(len(done))
+    
+    def _domain_record(self, domain):
+        """Gather one domain into a standalone record, sharing the lookup with one already in flight for it."""
+        record = self.flights.do(("domain", domain.lower()), self._gather_domain_record, domain)
+        return dict(record, input=domain)
+    
+    def _gather_domain_record(self, domain):
+        """Look a domain up and build its record."""
+        record = {"input": domain, "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
+        if not self._is_valid_domain(domain):
+            record["results"] = {"error": "Invalid domain format"}
+        else:
+            record["results"] = self._gather_domain_info(domain)
+        return record
+    
+    def _gather_domain_info(self, domain):
+        """Run the WHOIS, DNS, IP and HTTP stages as a dependency graph and assemble the results."""
+        stages = {"whois": (lambda deps: self._domain_whois(domain), (), DOMAIN_STAGE_TIMEOUTS["whois"])}
+        for record_type in DNS_RECORD_TYPES:
+            stages[f"dns:{record_type}"] = (lambda deps, record_type=record_type: self._domain_dns(domain, record_type),
+                                            (), DOMAIN_STAGE_TIMEOUTS["dns"])
+        
+        # IP geolocation only needs the A records; everything else starts immediately
+        stages["ip"] = (lambda deps: self._domain_ip(domain, deps["dns:A"]), ("dns:A",), DOMAIN_STAGE_TIMEOUTS["ip"])
+        stages["http"] = (lambda deps: self._domain_http(domain), (), DOMAIN_STAGE_TIMEOUTS["http"])
+        
+        outputs = run_stage_graph(self.stage_executor, stages, self.metrics, self.budget.seconds)
+        return {
+            "whois": outputs["whois"],
+            "dns": {record_type: outputs[f"dns:{record_type}"] for record_type in DNS_RECORD_TYPES},
+            "ip": outputs["ip"],
+            "http": outputs["http"]
+        }
+    
+    @property
+    def stage_executor(self):
+        """Thread pool shared by domain lookup stages, sized for max_workers domains at once."""
+        if self._stage_executor is None:
+            self._stage_executor = concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers * (len(DNS_RECORD_TYPES) + 3))
+        return self._stage_executor
+    
+    @property
+    def resolver(self):
+        """DNS resolver shared by every domain lookup."""
+        if self._resolver is None:
+            self._resolver = make_resolver()
+        return self._resolver
+    
+    @property
+    def whois_client(self):
+        """WHOIS client shared by every domain lookup, holding the per-server limits."""
+        if self._whois_client is None:
+            self._whois_client = WhoisClient(self.cache, self.metrics, flights=self.flights)
+        return self._whois_client
+    
+    def _domain_whois(self, domain):
+        """WHOIS stage: registrar, dates, name servers and contacts, parsed from the raw record."""
+        record = self._cache_get("whois_raw", domain)
+        if record is None:
+            try:
+                record = self.whois_client.lookup(domain)
+            except Exception as e:
+                return {"error": str(e)}
+            self._cache_set("whois_raw", domain, record)
+        
+        try:
+            return parse_whois(domain, record, self.whois_raw)
+        except Exception as e:
+            return {"error": str(e)}
+    
+    def _domain_dns(self, domain, record_type):
+        """DNS stage: records of one type, or an error dict."""
+        records = self._cache_get("dns", domain, record_type)
+        if records is not None:
+            return records
+        
+        try:
+            answers = self.flights.do(("dns", domain.lower().rstrip("."), record_type), self.resolver.resolve, domain, record_type)
+            records = [str(answer) for answer in answers]
+        except (dns.resolver.NoAnswer, dns.resolver.NXDOMAIN):
+            records = []
+        except dns.resolver.NoNameservers:
+            # Treated as no records, but it is a server failure so it is not cached
+            return []
+        except Exception as e:
+            return {"error": str(e)}
+        
+        self._cache_set("dns", domain, records, record_type)
+        return records
+    
+    def _domain_ip(self, domain, a_records):
+        """IP stage: address taken from the A records, plus geolocation."""
+        ip_data = self._cache_get("ip", domain)
+        if ip_data is not None:
+            return ip_data
+        
+        if isinstance(a_records, dict):
+            return a_records
+        if not a_records:
+            return {"error": "No A records found"}
+        
+        ip = a_records[0]
+        ip_data = {"address": ip}
         
+        # Get IP geolocation (optional)
+        try:
+            geo_response = self._guarded_get(f"https://ipinfo.io/{ip}/json")
+            if geo_response.status_code == 200:
+                ip_data["geolocation"] = geo_response.json()
+                self._cache_set("ip", domain, ip_data)
+            else:
+                ip_data["geolocation_error"] = f"HTTP {geo_response.status_code}"
         except Exception as e:
-            print(f"{Fore.RED}[!] Error fetching WHOIS information: {str(e)}")
-            self.results["domain_info"]["results"]["whois"] = {"error": str(e)}
+            ip_data["geolocation_error"] = str(e)
         
-        # Get DNS Records
-        print(f"{Fore.CYAN}[*] Fetching DNS records...")
-        self.results["domain_info"]["results"]["dns"] = {}
+        return ip_data
+    
+    def _domain_http(self, domain):
+        """HTTP stage: status, headers and redirect chain."""
+        http_data = self._cache_get("http", domain)
+        if http_data is None:
+            http_data = self._fetch_http_info(domain)
+            if "error" not in http_data:
+                self._cache_set("http", domain, http_data)
+        return http_data
+    
+    def _print_domain_info(self, results):
+        """Print gathered domain information section by section."""
+        whois_data = results["whois"]
+        if "error" in whois_data:
+            print(f"{Fore.RED}[!] Error fetching WHOIS information: {whois_data['error']}")
+        else:
+            print(f"{Fore.GREEN}[+] WHOIS: Registrar: {whois_data['registrar']}")
+            print(f"{Fore.GREEN}[+] WHOIS: Creation Date: {whois_data['creation_date']}")
+            print(f"{Fore.GREEN}[+] WHOIS: Expiration Date: {whois_data['expiration_date']}")
+            if whois_data["name_servers"]:
+                print(f"{Fore.GREEN}[+] WHOIS: Name Servers: {', '.join(whois_data['name_servers']) if isinstance(whois_data['name_servers'], list) else whois_data['name_servers']}")
         
-        for record_type in ["A", "AAAA", "MX", "NS", "TXT", "CNAME"]:
-            try:
-                answers = dns.resolver.resolve(domain, record_type)
-                records = [str(answer) for answer in answers]
-                self.results["domain_info"]["results"]["dns"][record_type] = records
-                
+        for record_type, records in results["dns"].items():
+            if isinstance(records, dict):
+                print(f"{Fore.RED}[!] Error fetching {record_type} records: {records['error']}")
+            elif records:
                 print(f"{Fore.GREEN}[+] DNS {record_type} Records: {', '.join(records)}")
-            
-            except (dns.resolver.NoAnswer, dns.resolver.NXDOMAIN, dns.resolver.NoNameservers):
-                self.results["domain_info"]["results"]["dns"][record_type] = []
+            else:
                 print(f"{Fore.YELLOW}[-] No {record_type} records found")
-            
-            except Exception as e:
-                self.results["domain_info"]["results"]["dns"][record_type] = {"error": str(e)}
-                print(f"{Fore.RED}[!] Error fetching {record_type} records: {str(e)}")
-        
-        # Get IP Information
-        try:
-            print(f"{Fore.CYAN}[*] Fetching IP information...")
-            ip = socket.gethostbyname(domain)
-            self.results["domain_info"]["results"]["ip"] = {"address": ip}
-            
-            print(f"{Fore.GREEN}[+] IP Address: {ip}")
-            
-            # Get IP geolocation (optional)
-            try:
-                geo_response = self.session.get(f"https://ipinfo.io/{ip}/json", timeout=10)
-                if geo_response.status_code == 200:
-                    geo_data = geo_response.json()
-                    self.results["domain_info"]["results"]["ip"]["geolocation"] = geo_data
-                    
-                    print(f"{Fore.GREEN}[+] IP Location: {geo_data.get('city', 'N/A')}, {geo_data.get('region', 'N/A')}, {geo_data.get('country', 'N/A')}")
-                    print(f"{Fore.GREEN}[+] IP Organization: {geo_data.get('org', 'N/A')}")
-            
-            except Exception as e:
-                print(f"{Fore.YELLOW}[-] Could not fetch IP geolocation: {str(e)}")
         
-        except Exception as e:
-            print(f"{Fore.RED}[!] Error resolving IP: {str(e)}")
-            self.results["domain_info"]["results"]["ip"] = {"error": str(e)}
+        ip_data = results["ip"]
+        if "error" in ip_data:
+            print(f"{Fore.RED}[!] Error resolving IP: {ip_data['error']}")
+        else:
+            print(f"{Fore.GREEN}[+] IP Address: {ip_data['address']}")
+            if "geolocation" in ip_data:
+                geo_data = ip_data["geolocation"]
+                print(f"{Fore.GREEN}[+] IP Location: {geo_data.get('city', 'N/A')}, {geo_data.get('region', 'N/A')}, {geo_data.get('country', 'N/A')}")
+                print(f"{Fore.GREEN}[+] IP Organization: {geo_data.get('org', 'N/A')}")
+            else:
+                print(f"{Fore.YELLOW}[-] Could not fetch IP geolocation: {ip_data.get('geolocation_error', 'N/A')}")
         
-        # Get HTTP Server Information
+        http_data = results["http"]
+        if "error" in http_data:
+            print(f"{Fore.RED}[!] Error fetching HTTP information: {http_data['error']}")
+        else:
+            print(f"{Fore.GREEN}[+] HTTP Status: {http_data['status_code']}")
+            print(f"{Fore.GREEN}[+] Server: {http_data['headers'].get('Server', 'N/A')}")
+            print(f"{Fore.GREEN}[+] X-Powered-By: {http_data['headers'].get('X-Powered-By', 'N/A')}")
+            if "redirects" in http_data:
+                print(f"{Fore.GREEN}[+] Redirects: {' -> '.join(http_data['redirects'])} -> {http_data['final_url']}")
+    
+    def _fetch_http_info(self, domain):
+        """Fetch HTTP server details for a domain, falling back to plain HTTP on SSL errors."""
+        # Domains are one-off lookups, so they get the default timeouts and are not tracked as hosts
+        timeout = (self.health.connect, self.health.max_read)
         try:
-            print(f"{Fore.CYAN}[*] Fetching HTTP server information...")
-            url = f"https://{domain}"
-            response = requests.get(url, timeout=10, allow_redirects=True)
-            
-            self.results["domain_info"]["results"]["http"] = {
-                "status_code": response.status_code,
-                "headers": dict(response.headers),
-                "final_url": response.url
-            }
-            
-            print(f"{Fore.GREEN}[+] HTTP Status: {response.status_code}")
-            print(f"{Fore.GREEN}[+] Server: {response.headers.get('Server', 'N/A')}")
-            print(f"{Fore.GREEN}[+] X-Powered-By: {response.headers.get('X-Powered-By', 'N/A')}")
-            
-            # Check for redirects
-            if response.history:
-                redirects = [h.url for h in response.history]
-                self.results["domain_info"]["results"]["http"]["redirects"] = redirects
-                print(f"{Fore.GREEN}[+] Redirects: {' -> '.join(redirects)} -> {response.url}")
+            response = self._shared_get(f"https://{domain}", timeout)
         
         except requests.exceptions.SSLError:
             # Try HTTP if HTTPS fails
             try:
-                url = f"http://{domain}"
-                response = requests.get(url, timeout=10, allow_redirects=True)
-                
-                self.results["domain_info"]["results"]["http"] = {
-                    "status_code": response.status_code,
-                    "headers": dict(response.headers),
-                    "final_url": response.url
-                }
-                
-                print(f"{Fore.GREEN}[+] HTTP Status: {response.status_code}")
-                print(f"{Fore.GREEN}[+] Server: {response.headers.get('Server', 'N/A')}")
-            
+                response = self._shared_get(f"http://{domain}", timeout)
             except Exception as e:
-                print(f"{Fore.RED}[!] Error fetching HTTP information: {str(e)}")
-                self.results["domain_info"]["results"]["http"] = {"error": str(e)}
+                return {"error": str(e)}
         
         except Exception as e:
-            print(f"{Fore.RED}[!] Error fetching HTTP information: {str(e)}")
-            self.results["domain_info"]["results"]["http"] = {"error": str(e)}
+            return {"error": str(e)}
         
-        print(f"\n{Fore.YELLOW}[*] Domain information gathering complete for {domain}")
-        return self.results["domain_info"]
+        self.metrics.inc("bytes_received_total", len(response.content), site="domain_http")
+        http_data = {
+            "status_code": response.status_code,
+            "headers": dict(response.headers),
+            "final_url": response.url
+        }
+        
+        # Check for redirects
+        if response.history:
+            http_data["redirects"] = [h.url for h in response.history]
+        
+        return http_data
     
     def get_social_media_profile(self, platform, identifier):
         """Extract profile information from social media platforms."""
         print(f"\n{Fore.YELLOW}[*] Extracting profile information from {platform} for '{identifier}'...")
-        self.results["social_profile"] = {"platform": platform, "identifier": identifier, "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"), "results": {}}
-        
-        if platform.lower() == "instagram":
-            return self._get_instagram_profile(identifier)
-        elif platform.lower() == "twitter" or platform.lower() == "x":
-            return self._get_twitter_profile(identifier)
-        elif platform.lower() == "github":
-            return self._get_github_profile(identifier)
-        elif platform.lower() == "linkedin":
-            return self._get_linkedin_profile(identifier)
+        record = self.profile_record(platform, identifier)
+        self.results["social_profile"] = record
+        
+        results = record["results"]
+        if results.get("error", "").startswith("Unsupported platform"):
+            print(f"{Fore.RED}[!] {results['error']}")
+            print(f"{Fore.YELLOW}[*] Supported platforms: {', '.join(SOCIAL_PLATFORMS)}")
+        elif "error" in results:
+            print(f"{Fore.RED}[-] {record['platform']} profile {identifier}: {results['error']}")
         else:
-            print(f"{Fore.RED}[!] Unsupported platform: {platform}")
-            print(f"{Fore.YELLOW}[*] Supported platforms: instagram, twitter, github, linkedin")
-            self.results["social_profile"]["results"]["error"] = f"Unsupported platform: {platform}"
-            return self.results["social_profile"]
+            for key, value in results.items():
+                print(f"{Fore.GREEN}[+] {key}: {value}")
+        return record
     
-    def _get_instagram_profile(self, username):
-        """Extract profile information from Instagram."""
-        try:
-            url = f"https://www.instagram.com/{username}/"
-            response = self.session.get(url, timeout=10)
-            
-            if response.status_code == 404:
-                print(f"{Fore.RED}[-] Instagram profile not found: {username}")
-                self.results["social_profile"]["results"]["error"] = "Profile not found"
-                return self.results["social_profile"]
-            
-            # Try to extract profile information from the HTML
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # Look for the JSON data in the page
-            script_tag = soup.find('script', string=re.compile('window._sharedData'))
-            if script_tag:
-                json_text = script_tag.string.split('window._sharedData = ')[1][:-1]
-                data = json.loads(json_text)
-                
-                if 'entry_data' in data and 'ProfilePage' in data['entry_data']:
-                    profile = data['entry_data']['ProfilePage'][0]['graphql']['user']
-                    
-                    self.results["social_profile"]["results"] = {
-                        "username": profile.get('username'),
-                        "full_name": profile.get('full_name'),
-                        "biography": profile.get('biography'),
-                        "followers": profile.get('edge_followed_by', {}).get('count'),
-                        "following": profile.get('edge_follow', {}).get('count'),
-                        "posts_count": profile.get('edge_owner_to_timeline_media', {}).get('count'),
-                        "is_private": profile.get('is_private'),
-                        "is_verified": profile.get('is_verified'),
-                        "profile_pic_url": profile.get('profile_pic_url_hd'),
-                        "external_url": profile.get('external_url')
-                    }
-                    
-                    print(f"{Fore.GREEN}[+] Username: {profile.get('username')}")
-                    print(f"{Fore.GREEN}[+] Full Name: {profile.get('full_name')}")
-                    print(f"{Fore.GREEN}[+] Biography: {profile.get('biography')}")
-                    print(f"{Fore.GREEN}[+] Followers: {profile.get('edge_followed_by', {}).get('count')}")
-                    print(f"{Fore.GREEN}[+] Following: {profile.get('edge_follow', {}).get('count')}")
-                    print(f"{Fore.GREEN}[+] Posts: {profile.get('edge_owner_to_timeline_media', {}).get('count')}")
-                    print(f"{Fore.GREEN}[+] Private: {profile.get('is_private')}")
-                    print(f"{Fore.GREEN}[+] Verified: {profile.get('is_verified')}")
-                    print(f"{Fore.GREEN}[+] External URL: {profile.get('external_url')}")
-                    
-                    return self.results["social_profile"]
-            
-            # Fallback method using meta tags
-            meta_properties = {
-                "og:title": "title",
-                "og:description": "description",
-                "og:image": "profile_pic_url"
-            }
-            
-            for prop, key in meta_properties.items():
-                meta_tag = soup.find('meta', property=prop)
-                if meta_tag:
-                    self.results["social_profile"]["results"][key] = meta_tag.get('content')
+    def check_profiles(self, targets, sink, max_in_flight=None, per_platform=None, checkpoint=None):
+        """Profile many (platform, identifier) pairs concurrently, streaming each record to sink as it completes."""
+        print(f"\n{Fore.YELLOW}[*] Bulk profile extraction with {self.max_workers} workers...")
+        count = 0
+        found = 0
+        
+        if checkpoint:
+            targets = ((platform, identifier) for platform, identifier in targets
+                       if not checkpoint.is_done(identifier, f"social:{platform_key(platform)}"))
+        
+        for record in self.iter_profile_results(targets, max_in_flight, per_platform):
+            sink.write(record)
+            if checkpoint:
+                checkpoint.mark(record["identifier"], f"social:{record['platform']}")
+            count += 1
             
-            if self.results["social_profile"]["results"]:
-                for key, value in self.results["social_profile"]["results"].items():
-                    print(f"{Fore.GREEN}[+] {key}: {value}")
-                
-                self.results["social_profile"]["results"]["profile_url"] = url
-                self.results["social_profile"]["results"]["note"] = "Limited data extracted due to Instagram restrictions"
-                return self.results["social_profile"]
+            results = record["results"]
+            if "error" in results:
+                print(f"{Fore.RED}[-] {record['platform']}/{record['identifier']}: {results['error']}")
+            else:
+                found += 1
+                name = results.get("full_name") or results.get("title") or results.get("profile_url")
+                print(f"{Fore.GREEN}[+] {record['platform']}/{record['identifier']}: {name}")
+        
+        print(f"\n{Fore.YELLOW}[*] Bulk profile extraction complete. {found} of {count} profiles extracted.")
+        return count
+    
+    def iter_profile_results(self, targets, max_in_flight=None, per_platform=None):
+        """Yield one record per (platform, identifier) pair as soon as its extraction finishes.
+        
+        Each platform has its own concurrency cap; pairs for a platform at its
+        cap wait in a per-platform queue, and no more than max_in_flight pairs
+        are held in memory at once.
+        """
+        max_in_flight = max_in_flight or self.max_workers * 4
+        if self.sharded:
+            yield from self._iter_sharded("social", ((platform_key(platform), identifier) for platform, identifier in targets),
+                                          max_in_flight, per_platform)
+            return
+        targets = iter(targets)
+        running = {}
+        waiting = {}
+        held = 0
+        
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            pending = {}
             
-            print(f"{Fore.YELLOW}[-] Could not extract detailed profile information from Instagram")
-            self.results["social_profile"]["results"]["error"] = "Could not extract profile information"
-            self.results["social_profile"]["results"]["profile_url"] = url
-            self.results["social_profile"]["results"]["exists"] = response.status_code == 200
+            def start(platform, identifier):
+                running[platform] = running.get(platform, 0) + 1
+                pending[executor.submit(self.profile_record, platform, identifier)] = (platform, identifier)
             
-            return self.results["social_profile"]
+            def fill():
+                nonlocal held
+                for platform, identifier in itertools.islice(targets, max_in_flight - held):
+                    held += 1
+                    platform = platform_key(platform)
+                    limit = per_platform or SOCIAL_PLATFORM_CONCURRENCY.get(platform, DEFAULT_PLATFORM_CONCURRENCY)
+                    limit = max(1, limit // self.shares)
+                    if running.get(platform, 0) < limit:
+                        start(platform, identifier)
+                    else:
+                        waiting.setdefault(platform, collections.deque()).append(identifier)
             
-        except Exception as e:
-            print(f"{Fore.RED}[!] Error extracting Instagram profile: {str(e)}")
-            self.results["social_profile"]["results"]["error"] = str(e)
-            return self.results["social_profile"]
+            fill()
+            while pending:
+                done, _ = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    platform, identifier = pending.pop(future)
+                    running[platform] -= 1
+                    held -= 1
+                    try:
+                        yield future.result()
+                    except Exception as e:
+                        yield {"platform": platform, "identifier": identifier,
+                               "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"), "results": {"error": str(e)}}
+                    if waiting.get(platform):
+                        start(platform, waiting[platform].popleft())
+                fill()
     
-    def _get_twitter_profile(self, username):
-        """Extract profile information from Twitter/X."""
+    def profile_record(self, platform, identifier, page=None):
+        """Extract one profile into a standalone record, serving it from the cache when possible.
+        
+        page is an already-downloaded (status_code, text) profile page to parse instead of fetching one.
+        """
+        platform = platform_key(platform)
+        record = {"platform": platform, "identifier": identifier, "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
+        if platform not in SOCIAL_PLATFORMS:
+            record["results"] = {"error": f"Unsupported platform: {platform}"}
+            return record
+        
+        cached = self._cache_get("social", identifier, platform) if page is None else None
+        if cached is not None:
+            record["results"] = cached
+            return record
+        
         try:
-            url = f"https://twitter.com/{username}"
-            response = self.session.get(url, timeout=10)
-            
-            if "This account doesn't exist" in response.text:
-                print(f"{Fore.RED}[-] Twitter/X profile not found: {username}")
-                self.results["social_profile"]["results"]["error"] = "Profile not found"
-                return self.results["social_profile"]
-            
-            # Try to extract profile information from the HTML
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # Extract meta information
-            meta_properties = {
-                "og:title": "title",
-                "og:description": "description",
-                "og:image": "profile_pic_url"
-            }
-            
-            for prop, key in meta_properties.items():
-                meta_tag = soup.find('meta', property=prop)
-                if meta_tag:
-                    self.results["social_profile"]["results"][key] = meta_tag.get('content')
+            with self.metrics.timer("profile", platform=platform):
+                results = getattr(self, f"_get_{platform}_profile")(identifier, page)
+        except Exception as e:
+            self.metrics.inc("profile_errors_total", platform=platform)
+            results = {"error": str(e)}
+        
+        # Cache extracted profiles and definite misses, but not transient errors
+        if results.get("error", "Profile not found") == "Profile not found":
+            self._cache_set("social", identifier, results, platform)
+        record["results"] = results
+        return record
+    
+    def _fetch_profile_page(self, url):
+        """Download a profile page as (status_code, text), revalidating a stored copy when there is one."""
+        stored, headers = self.cache.revalidation(url, need_body=True) if self.cache else (None, {})
+        response = self._guarded_get(url, headers=headers)
+        if response.status_code == 304 and stored:
+            self.cache.touch_response(url)
+            self.metrics.inc("revalidations_total", site=urlparse(url).netloc, result="not_modified")
+            return stored["status"], stored["body"]
+        
+        self.metrics.inc("bytes_received_total", len(response.content), site=urlparse(url).netloc)
+        self._store_response(url, response, body=response.text)
+        return response.status_code, response.text
+    
+    def _get_instagram_profile(self, username, page=None):
+        """Extract profile information from Instagram."""
+        url = f"https://www.instagram.com/{username}/"
+        status_code, text = page or self._fetch_profile_page(url)
+        
+        if status_code == 404:
+            return {"error": "Profile not found"}
+        
+        # Look for the JSON data embedded in the page, without building a DOM
+        shared_data = INSTAGRAM_SHARED_DATA.search(text)
+        if shared_data:
+            data = json.loads(shared_data.group(1))
             
-            if "title" in self.results["social_profile"]["results"]:
-                title = self.results["social_profile"]["results"]["title"]
-                self.results["social_profile"]["results"]["full_name"] = title.split("(")[0].strip() if "(" in title else title
+            if 'entry_data' in data and 'ProfilePage' in data['entry_data']:
+                profile = data['entry_data']['ProfilePage'][0]['graphql']['user']
                 
-                if "(" in title and ")" in title:
-                    self.results["social_profile"]["results"]["username"] = title.split("(")[1].split(")")[0].strip("@")
-            
-            if "description" in self.results["social_profile"]["results"]:
-                self.results["social_profile"]["results"]["bio"] = self.results["social_profile"]["results"]["description"]
-            
-            # Add profile URL
-            self.results["social_profile"]["results"]["profile_url"] = url
-            self.results["social_profile"]["results"]["exists"] = True
-            self.results["social_profile"]["results"]["note"] = "Limited data extracted due to Twitter/X API restrictions"
-            
-            for key, value in self.results["social_profile"]["results"].items():
-                print(f"{Fore.GREEN}[+] {key}: {value}")
-            
-            return self.results["social_profile"]
+                return {
+                    "username": profile.get('username'),
+                    "full_name": profile.get('full_name'),
+                    "biography": profile.get('biography'),
+                    "followers": profile.get('edge_followed_by', {}).get('count'),
+                    "following": profile.get('edge_follow', {}).get('count'),
+                    "posts_count": profile.get('edge_owner_to_timeline_media', {}).get('count'),
+                    "is_private": profile.get('is_private'),
+                    "is_verified": profile.get('is_verified'),
+                    "profile_pic_url": profile.get('profile_pic_url_hd'),
+                    "external_url": profile.get('external_url')
+                }
+        
+        # Fallback method using meta tags
+        profile_info = HtmlDocument(text, head_only=True).extract(OG_META_SELECTORS)
+        if profile_info:
+            profile_info["profile_url"] = url
+            profile_info["note"] = "Limited data extracted due to Instagram restrictions"
+            return profile_info
+        
+        return {
+            "error": "Could not extract profile information",
+            "profile_url": url,
+            "exists": status_code == 200
+        }
+    
+    def _get_twitter_profile(self, username, page=None):
+        """Extract profile information from Twitter/X."""
+        url = f"https://twitter.com/{username}"
+        status_code, text = page or self._fetch_profile_page(url)
+        
+        if "This account doesn't exist" in text:
+            return {"error": "Profile not found"}
+        
+        # Extract meta information from the page head
+        profile_info = HtmlDocument(text, head_only=True).extract(OG_META_SELECTORS)
+        
+        if "title" in profile_info:
+            title = profile_info["title"]
+            profile_info["full_name"] = title.split("(")[0].strip() if "(" in title else title
             
-        except Exception as e:
-            print(f"{Fore.RED}[!] Error extracting Twitter/X profile: {str(e)}")
-            self.results["social_profile"]["results"]["error"] = str(e)
-            return self.results["social_profile"]
+            if "(" in title and ")" in title:
+                profile_info["username"] = title.split("(")[1].split(")")[0].strip("@")
+        
+        if "description" in profile_info:
+            profile_info["bio"] = profile_info["description"]
+        
+        profile_info["profile_url"] = url
+        profile_info["exists"] = True
+        profile_info["note"] = "Limited data extracted due to Twitter/X API restrictions"
+        return profile_info
     
-    def _get_github_profile(self, username):
+    def _get_github_profile(self, username, page=None):
         """Extract profile information from GitHub."""
-        try:
-            url = f"https://github.com/{username}"
-            response = self.session.get(url, timeout=10)
-            
-            if response.status_code == 404:
-                print(f"{Fore.RED}[-] GitHub profile not found: {username}")
-                self.results["social_profile"]["results"]["error"] = "Profile not found"
-                return self.results["social_profile"]
-            
-            # Parse HTML
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # Extract profile information
-            profile_info = {
-                "username": username,
-                "profile_url": url,
-                "exists": True
-            }
-            
-            # Full name
-            name_element = soup.find("span", {"itemprop": "name"})
-            if name_element:
-                profile_info["full_name"] = name_element.text.strip()
-            
-            # Bio
-            bio_element = soup.find("div", {"class": "p-note"}) or soup.find("div", {"class": "user-profile-bio"})
-            if bio_element:
-                profile_info["bio"] = bio_element.text.strip()
-            
-            # Location
-            location_element = soup.find("li", {"itemprop": "homeLocation"})
-            if location_element:
-                profile_info["location"] = location_element.text.strip()
-            
-            # Company
-            company_element = soup.find("li", {"itemprop": "worksFor"})
-            if company_element:
-                profile_info["company"] = company_element.text.strip()
-            
-            # Website
-            website_element = soup.find("li", {"itemprop": "url"})
-            if website_element:
-                profile_info["website"] = website_element.find("a").get("href")
-            
-            # Twitter/X link
-            twitter_element = soup.find("li", {"itemprop": "social"})
-            if twitter_element and "twitter" in str(twitter_element).lower():
-                profile_info["twitter"] = twitter_element.find("a").text.strip()
-            
-            # Followers and following
-            followers_element = soup.find("span", {"class": "text-bold"}, string=re.compile(r"followers|Followers"))
-            if followers_element:
-                profile_info["followers"] = followers_element.text.strip()
-            
-            following_element = soup.find("span", {"class": "text-bold"}, string=re.compile(r"following|Following"))
-            if following_element:
-                profile_info["following"] = following_element.text.strip()
-            
-            # Repositories
-            repo_counter = soup.find("span", string=re.compile(r"Repositories"))
-            if repo_counter:
-                repo_number = repo_counter.find_previous("span", {"class": "Counter"})
-                if repo_number:
-                    profile_info["repositories"] = repo_number.text.strip()
-            
-            # Contributions
-            contributions_element = soup.find("h2", string=re.compile(r"contributions"))
-            if contributions_element:
-                contributions_text = contributions_element.text.strip()
-                match = re.search(r"(\d+) contributions", contributions_text)
-                if match:
-                    profile_info["contributions"] = match.group(1)
-            
-            self.results["social_profile"]["results"] = profile_info
-            
-            # Print results
-            for key, value in profile_info.items():
-                print(f"{Fore.GREEN}[+] {key}: {value}")
-            
-            return self.results["social_profile"]
-            
-        except Exception as e:
-            print(f"{Fore.RED}[!] Error extracting GitHub profile: {str(e)}")
-            self.results["social_profile"]["results"]["error"] = str(e)
-            return self.results["social_profile"]
+        url = f"https://github.com/{username}"
+        status_code, text = page or self._fetch_profile_page(url)
+        
+        if status_code == 404:
+            return {"error": "Profile not found"}
+        
+        profile_info = {
+            "username": username,
+            "profile_url": url,
+            "exists": True
+        }
+        profile_info.update(HtmlDocument(text).extract(GITHUB_PROFILE_SELECTORS))
+        
+        # Contributions heading reads "1,234 contributions in the last year"
+        if "contributions" in profile_info:
+            match = re.search(r"([\d,]+)\s+contributions", profile_info["contributions"])
+            if match:
+                profile_info["contributions"] = match.group(1)
+            else:
+                del profile_info["contributions"]
+        
+        return profile_info
     
-    def _get_linkedin_profile(self, profile_id):
+    def _get_linkedin_profile(self, profile_id, page=None):
         """Extract basic profile information from LinkedIn."""
-        try:
-            url = f"https://www.linkedin.com/in/{profile_id}"
-            response = self.session.get(url, timeout=10)
-            
-            if response.status_code == 404:
-                print(f"{Fore.RED}[-] LinkedIn profile not found: {profile_id}")
-                self.results["social_profile"]["results"]["error"] = "Profile not found"
-                return self.results["social_profile"]
-            
-            # Parse HTML
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # LinkedIn heavily protects profile data, so we can only extract meta information
-            meta_properties = {
-                "og:title": "title",
-                "og:description": "description",
-                "og:image": "profile_pic_url"
-            }
-            
-            profile_info = {
-                "profile_id": profile_id,
-                "profile_url": url,
-                "exists": response.status_code == 200
-            }
-            
-            for prop, key in meta_properties.items():
-                meta_tag = soup.find('meta', property=prop)
-                if meta_tag:
-                    profile_info[key] = meta_tag.get('content')
-            
-            # Try to extract name and headline
-            if "title" in profile_info:
-                title_parts = profile_info["title"].split(" | ")
-                if len(title_parts) >= 2:
-                    profile_info["full_name"] = title_parts[0]
-                    profile_info["headline"] = title_parts[1]
-            
-            # Add note about limitations
-            profile_info["note"] = "Limited data extracted due to LinkedIn restrictions. Full profile data requires authentication."
-            
-            self.results["social_profile"]["results"] = profile_info
-            
-            # Print results
-            for key, value in profile_info.items():
-                print(f"{Fore.GREEN}[+] {key}: {value}")
-            
-            return self.results["social_profile"]
-            
-        except Exception as e:
-            print(f"{Fore.RED}[!] Error extracting LinkedIn profile: {str(e)}")
-            self.results["social_profile"]["results"]["error"] = str(e)
-            return self.results["social_profile"]
+        url = f"https://www.linkedin.com/in/{profile_id}"
+        status_code, text = page or self._fetch_profile_page(url)
+        
+        if status_code == 404:
+            return {"error": "Profile not found"}
+        
+        # LinkedIn heavily protects profile data, so we can only extract meta information
+        profile_info = {
+            "profile_id": profile_id,
+            "profile_url": url,
+            "exists": status_code == 200
+        }
+        profile_info.update(HtmlDocument(text, head_only=True).extract(OG_META_SELECTORS))
+        
+        # Try to extract name and headline
+        if "title" in profile_info:
+            title_parts = profile_info["title"].split(" | ")
+            if len(title_parts) >= 2:
+                profile_info["full_name"] = title_parts[0]
+                profile_info["headline"] = title_parts[1]
+        
+        # Add note about limitations
+        profile_info["note"] = "Limited data extracted due to LinkedIn restrictions. Full profile data requires authentication."
+        return profile_info
 
     def _is_valid_domain(self, domain):
         """Check if a domain has a valid format."""
@@ -679,59 +3585,1010 @@ class FinderBuster:
         else:
             parser.print_help()
             sys.exit(1)
+
+class ApiServer:
+    """HTTP/JSON API over one long-lived FinderBuster, so every request shares its pools, caches and rate limits.
+    
+    Username probes run on one AsyncProbeEngine in the server's event loop;
+    domain and social lookups run on a bounded thread pool. Concurrent requests
+    for the same target share one in-flight lookup through the finder's
+    SingleFlight. Results come back as one
+    JSON document, or stream as NDJSON lines or server-sent events as each
+    site or platform answers.
+    """
+    
+    def __init__(self, finder, host=DEFAULT_SERVE_HOST, port=DEFAULT_SERVE_PORT, max_probes=DEFAULT_ASYNC_CONCURRENCY):
+        self.finder = finder
+        self.metrics = finder.metrics
+        self.host = host
+        self.port = port
+        self.max_probes = max_probes
+        self.engine = None
+        self.flights = finder.flights
+        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=finder.max_workers)
+        self.platform_slots = {}
+    
+    def app(self):
+        """Build the aiohttp application."""
+        from aiohttp import web
+        app = web.Application()
+        app.cleanup_ctx.append(self._engine_context)
+        app.router.add_get("/health", self.health)
+        app.router.add_get("/metrics", self.prometheus)
+        app.router.add_get("/username/{username}", self.username)
+        app.router.add_get("/domain/{domain}", self.domain)
+        app.router.add_get("/social/{platform}/{identifier}", self.social)
+        return app
+    
+    def run(self):
+        """Serve requests until interrupted."""
+        try:
+            from aiohttp import web
+        except ImportError:
+            raise RuntimeError("The serve command requires aiohttp (pip install aiohttp)")
+        
+        print(f"{Fore.GREEN}[+] Serving the FinderBuster API on http://{self.host}:{self.port}/ ({len(self.finder.sites)} sites)")
+        try:
+            web.run_app(self.app(), host=self.host, port=self.port, print=None, access_log=None)
+        finally:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+    
+    async def _engine_context(self, app):
+        """Keep one probe engine, and so one connection pool, open for the life of the server."""
+        finder = self.finder
+        async with AsyncProbeEngine(self.max_probes, finder.per_host, finder.health.max_read, cache=finder.cache,
+                                    rate_limiter=finder.rate_limiter, max_retries=finder.max_retries,
+                                    profiler=finder.profile_record if finder.profile else None, metrics=self.metrics,
+                                    health=finder.health, budget=finder.budget, flights=self.flights) as engine:
+            self.engine = engine
+            yield
+    
+    async def health(self, request):
+        """GET /health: liveness and a little state."""
+        from aiohttp import web
+        return web.json_response({"status": "ok", "version": VERSION, "sites": len(self.finder.sites),
+                                  "in_flight": self.flights.in_flight})
+    
+    async def prometheus(self, request):
+        """GET /metrics: metrics in the Prometheus text format."""
+        from aiohttp import web
+        return web.Response(body=self.metrics.prometheus_text().encode(),
+                            headers={"Content-Type": "text/plain; version=0.0.4"})
+    
+    async def username(self, request):
+        """GET /username/{username}: check a username on every site, or those picked with ?sites= and ?tags=."""
+        from aiohttp import web
+        username = request.match_info["username"]
+        try:
+            sites = self._select_sites(request.query)
+            fmt = self._format(request)
+        except ValueError as e:
+            return web.json_response({"error": str(e)}, status=400)
+        self.metrics.inc("api_requests_total", endpoint="username")
+        
+        # Concurrent requests for a username share its time budget; a later one starts afresh
+        self.finder.budget.begin(username)
+        tasks = [asyncio.ensure_future(self._check_site(site, username)) for site in sites]
+        try:
+            if fmt != "json":
+                return await self._stream(request, fmt, tasks, username)
+            results = {}
+            for record in await asyncio.gather(*tasks):
+                results[record["site"]] = {key: value for key, value in record.items() if key not in ("username", "site")}
+            return web.json_response({"input": username, "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                                      "results": results}, dumps=self._dumps)
+        finally:
+            for task in tasks:
+                task.cancel()
+            self.finder.budget.end(username)
+    
+    async def _check_site(self, site, username):
+        """Check one site for username; the engine shares the probe with concurrent requests for the same pair."""
+        check = self.engine.check_site_profile if self.finder.profile else self.engine.check_site
+        future = asyncio.ensure_future(check(site.name, site, username))
+        await asyncio.wait([future])
+        return self.finder._site_record(future, username, site.name, site)
+    
+    async def domain(self, request):
+        """GET /domain/{domain}: WHOIS, DNS, IP and HTTP information for a domain."""
+        from aiohttp import web
+        domain = request.match_info["domain"].lower()
+        if not self.finder._is_valid_domain(domain):
+            return web.json_response({"error": f"Invalid domain format: {domain}"}, status=400)
+        self.metrics.inc("api_requests_total", endpoint="domain")
+        
+        loop = asyncio.get_running_loop()
+        try:
+            record = await self.flights.run(("domain", domain), lambda: loop.run_in_executor(self.executor, self.finder._domain_record, domain))
+        except Exception as e:
+            record = {"input": domain, "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"), "results": {"error": str(e)}}
+        return web.json_response(record, dumps=self._dumps)
+    
+    async def social(self, request):
+        """GET /social/{platform}/{identifier}: extract a profile; platform "all" profiles every platform."""
+        from aiohttp import web
+        platform = platform_key(request.match_info["platform"])
+        identifier = request.match_info["identifier"]
+        if platform != "all" and platform not in SOCIAL_PLATFORMS:
+            return web.json_response({"error": f"Unsupported platform: {platform}",
+                                      "platforms": list(SOCIAL_PLATFORMS)}, status=400)
+        try:
+            fmt = self._format(request)
+        except ValueError as e:
+            return web.json_response({"error": str(e)}, status=400)
+        self.metrics.inc("api_requests_total", endpoint="social")
+        
+        platforms = SOCIAL_PLATFORMS if platform == "all" else [platform]
+        tasks = [asyncio.ensure_future(self._profile(name, identifier)) for name in platforms]
+        try:
+            if fmt != "json":
+                return await self._stream(request, fmt, tasks, identifier)
+            records = await asyncio.gather(*tasks)
+            if platform != "all":
+                return web.json_response(records[0], dumps=self._dumps)
+            return web.json_response({"identifier": identifier, "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                                      "results": {record["platform"]: record["results"] for record in records}},
+                                     dumps=self._dumps)
+        finally:
+            for task in tasks:
+                task.cancel()
+    
+    async def _profile(self, platform, identifier):
+        """Extract one profile, within the platform's concurrency limit and shared with concurrent requests."""
+        loop = asyncio.get_running_loop()
+        slots = self.platform_slots.get(platform)
+        if slots is None:
+            slots = self.platform_slots[platform] = asyncio.Semaphore(
+                SOCIAL_PLATFORM_CONCURRENCY.get(platform, DEFAULT_PLATFORM_CONCURRENCY))
+        
+        async def extract():
+            async with slots:
+                return await loop.run_in_executor(self.executor, self.finder.profile_record, platform, identifier)
+        
+        try:
+            return await self.flights.run(("social", platform, identifier), extract)
+        except Exception as e:
+            return {"platform": platform, "identifier": identifier,
+                    "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"), "results": {"error": str(e)}}
+    
+    async def _stream(self, request, fmt, tasks, target):
+        """Send each record as its task finishes, as NDJSON lines or server-sent events."""
+        from aiohttp import web
+        response = web.StreamResponse(headers={"Content-Type": STREAM_CONTENT_TYPES[fmt], "Cache-Control": "no-cache"})
+        await response.prepare(request)
+        for next_record in asyncio.as_completed(tasks):
+            await response.write(self._event(fmt, "result", await next_record))
+        if fmt == "sse":
+            await response.write(self._event(fmt, "done", {"input": target, "count": len(tasks)}))
+        await response.write_eof()
+        return response
+    
+    def _select_sites(self, query):
+        """The served sites narrowed by comma-separated ?tags= and ?sites= (names); raises ValueError on a bad pick."""
+        sites = self.finder.sites
+        if query.get("tags"):
+            tags = {tag.strip().lower() for tag in query["tags"].split(",")}
+            sites = [site for site in sites if tags & site.tags]
+        if query.get("sites"):
+            names = {name.strip().lower() for name in query["sites"].split(",") if name.strip()}
+            unknown = names - {site.name.lower() for site in self.finder.sites}
+            if unknown:
+                raise ValueError(f"unknown sites: {', '.join(sorted(unknown))}")
+            sites = [site for site in sites if site.name.lower() in names]
+        if not sites:
+            raise ValueError("no sites match the given sites/tags selection")
+        return sites
+    
+    @staticmethod
+    def _format(request):
+        """Response format from ?format= or the Accept header: json, ndjson or sse."""
+        fmt = request.query.get("format")
+        if fmt:
+            if fmt not in ("json", *STREAM_CONTENT_TYPES):
+                raise ValueError(f"unknown format: {fmt} (choose from json, ndjson, sse)")
+            return fmt
+        accept = request.headers.get("Accept", "")
+        for fmt, content_type in STREAM_CONTENT_TYPES.items():
+            if content_type in accept:
+                return fmt
+        return "json"
+    
+    @staticmethod
+    def _event(fmt, event, data):
+        """Encode one streamed record."""
+        text = json.dumps(data, default=str)
+        if fmt == "sse":
+            return f"event: {event}\ndata: {text}\n\n".encode()
+        return f"{text}\n".encode()
+    
+    @staticmethod
+    def _dumps(value):
+        return json.dumps(value, default=str)
+
+def read_watch_list(path):
+    """Yield (kind, target) pairs from a watch list (or stdin when path is '-').
+    
+    Lines are "username NAME", "domain DOMAIN" or "social PLATFORM IDENTIFIER";
+    social targets come out as "platform/identifier".
+    """
+    for line_number, line in enumerate(read_targets(path), 1):
+        fields = line.split()
+        kind = fields[0].lower()
+        if kind in ("username", "domain") and len(fields) == 2:
+            yield kind, fields[1].lower() if kind == "domain" else fields[1]
+        elif kind == "social" and len(fields) == 3 and platform_key(fields[1]) in SOCIAL_PLATFORMS:
+            yield kind, f"{platform_key(fields[1])}/{fields[2]}"
+        else:
+            print(f"{Fore.YELLOW}[!] Skipping line {line_number} of {path}: expected 'username NAME', "
+                  f"'domain DOMAIN' or 'social PLATFORM IDENTIFIER'")
+
+def _profile_fields(scope, profile):
+    return {f"{scope}.{key}": value for key, value in profile.items() if key not in MONITOR_IGNORED_FIELDS}
+
+def _sorted_values(value):
+    values = value if isinstance(value, (list, tuple)) else [value] if value else []
+    return sorted({str(item).lower() for item in values})
+
+def username_observation(records):
+    """Reduce a username's site records to (fields, scopes) for change tracking.
+    
+    Inconclusive probes (network errors, throttling, exhausted budgets) and
+    failed ones leave their site out, so a transient error is never reported
+    as a deleted account.
+    """
+    fields, scopes = {}, set()
+    for record in records:
+        if record["exists"] is None or record["message"].startswith("Error"):
+            continue
+        site = record["site"]
+        fields[f"{site}.exists"] = bool(record["exists"])
+        profile = record.get("profile")
+        if record["exists"] and profile and "error" in profile:
+            # Profile details unavailable this time: keep the ones last seen
+            scopes.add(f"{site}.exists")
+            continue
+        scopes.add(site)
+        if record["exists"] and profile:
+            fields.update(_profile_fields(site, profile))
+    return fields, scopes
+
+def domain_observation(results):
+    """Reduce a domain's results to (fields, scopes): WHOIS registration, DNS records, IP and HTTP server."""
+    fields, scopes = {}, set()
+    if "error" in results:
+        return fields, scopes
+    
+    whois_data = results["whois"]
+    if "error" not in whois_data:
+        scopes.add("whois")
+        fields.update({"whois.registrar": whois_data["registrar"],
+                       "whois.expiration_date": whois_data["expiration_date"],
+                       "whois.name_servers": _sorted_values(whois_data["name_servers"]),
+                       "whois.status": _sorted_values(whois_data["status"])})
+    for record_type, records in results["dns"].items():
+        if not isinstance(records, dict):
+            scopes.add(f"dns.{record_type}")
+            fields[f"dns.{record_type}"] = sorted(records)
+    if "address" in results["ip"]:
+        scopes.add("ip.address")
+        fields["ip.address"] = results["ip"]["address"]
+        if "geolocation" in results["ip"]:
+            scopes.add("ip.org")
+            fields["ip.org"] = results["ip"]["geolocation"].get("org")
+    if "error" not in results["http"]:
+        scopes.add("http")
+        fields.update({"http.status_code": results["http"]["status_code"],
+                       "http.server": results["http"]["headers"].get("Server"),
+                       "http.final_url": results["http"]["final_url"]})
+    return fields, scopes
+
+def social_observation(results):
+    """Reduce a social profile to (fields, scopes); a missing profile is observed, other errors are not."""
+    if results.get("error") == "Profile not found":
+        return {"profile.exists": False}, {"profile"}
+    if "error" in results:
+        return {}, set()
+    return dict(_profile_fields("profile", results), **{"profile.exists": True}), {"profile"}
+
+def merge_state(state, fields, scopes):
+    """Replace the fields under each observed scope (a field name or its prefix), keeping the rest."""
+    merged = {key: value for key, value in state.items()
+              if not any(key == scope or key.startswith(scope + ".") for scope in scopes)}
+    # Round-trip through JSON so values compare equal to states loaded from the store
+    merged.update(json.loads(json.dumps(fields, default=str)))
+    return merged
+
+def diff_states(old, new):
+    """List the fields whose value differs between two states."""
+    return [{"field": key, "old": old.get(key), "new": new.get(key)}
+            for key in sorted(old.keys() | new.keys()) if old.get(key) != new.get(key)]
+
+class MonitorStore:
+    """Last-known state and check schedule of every watched target, in a SQLite file.
+    
+    A state is a flat {field: value} dict stored as zlib-compressed JSON, and
+    targets are indexed by when they are next due, so finding the ones to
+    check is a single index range scan however long the watch list is.
+    """
+    
+    def __init__(self, path=DEFAULT_MONITOR_STORE):
+        self.path = path
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS targets ("
+            "kind TEXT NOT NULL, target TEXT NOT NULL, state BLOB, due REAL NOT NULL, quiet INTEGER NOT NULL DEFAULT 0, "
+            "checked REAL, changed REAL, PRIMARY KEY (kind, target)) WITHOUT ROWID"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS targets_due ON targets (due)")
+    
+    def sync(self, targets):
+        """Make the watched targets exactly the given (kind, target) pairs; new ones are due at once.
+        
+        Returns the number of targets added and removed.
+        """
+        wanted = set(targets)
+        existing = set(self.conn.execute("SELECT kind, target FROM targets"))
+        with self.conn:
+            self.conn.execute("BEGIN IMMEDIATE")
+            self.conn.executemany("INSERT INTO targets (kind, target, due) VALUES (?, ?, 0)", wanted - existing)
+            self.conn.executemany("DELETE FROM targets WHERE kind = ? AND target = ?", existing - wanted)
+        return len(wanted - existing), len(existing - wanted)
+    
+    def due(self, now, limit):
+        """Return up to limit targets due by now, most overdue first, with their last-known state."""
+        rows = self.conn.execute(
+            "SELECT kind, target, state, quiet FROM targets WHERE due <= ? ORDER BY due LIMIT ?", (now, limit)
+        ).fetchall()
+        return [{"kind": kind, "target": target, "quiet": quiet,
+                 "state": json.loads(zlib.decompress(state)) if state is not None else None}
+                for kind, target, state, quiet in rows]
+    
+    def next_due(self):
+        """When the next target is due, or None if nothing is watched."""
+        return self.conn.execute("SELECT MIN(due) FROM targets").fetchone()[0]
+    
+    def save(self, updates):
+        """Store (kind, target, state, due, quiet, changed) rows for checked targets; changed None keeps the old time."""
+        now = time.time()
+        rows = [(zlib.compress(json.dumps(state, separators=(",", ":")).encode("utf-8")), due, quiet, now, changed, kind, target)
+                for kind, target, state, due, quiet, changed in updates]
+        with self.conn:
+            self.conn.execute("BEGIN IMMEDIATE")
+            self.conn.executemany("UPDATE targets SET state = ?, due = ?, quiet = ?, checked = ?, changed = COALESCE(?, changed) "
+                                  "WHERE kind = ? AND target = ?", rows)
+    
+    def close(self):
+        self.conn.close()
+
+class Monitor:
+    """Re-check watched usernames, domains and social profiles as they fall due, emitting only changes.
+    
+    Each target has its own schedule: after a check that finds nothing new
+    its interval doubles, up to max_interval, and any change brings it back
+    to interval. Every interval is spread by a random +/- jitter fraction so
+    targets added together drift apart. The first check of a target records
+    its baseline without reporting anything.
+    """
+    
+    def __init__(self, finder, store, sink, interval=DEFAULT_MONITOR_INTERVAL, max_interval=DEFAULT_MONITOR_MAX_INTERVAL,
+                 jitter=DEFAULT_MONITOR_JITTER, batch=DEFAULT_MONITOR_BATCH):
+        self.finder = finder
+        self.store = store
+        self.sink = sink
+        self.interval = interval
+        self.max_interval = max(max_interval, interval)
+        self.jitter = jitter
+        self.batch = batch
+    
+    def run(self, watch_list, once=False):
+        """Check due targets until interrupted (or, with once, until none is due), re-reading the watch list when it changes."""
+        watched_mtime = self._sync(watch_list)
+        started = time.time()
+        changes = 0
+        while True:
+            # A single pass only takes targets due when it started, however short their interval
+            due = self.store.due(started if once else time.time(), self.batch)
+            if due:
+                changes += self.check(due)
+                continue
+            if once:
+                break
+            
+            next_due = self.store.next_due()
+            wait = MONITOR_IDLE_POLL if next_due is None else min(MONITOR_IDLE_POLL, max(0.0, next_due - time.time()))
+            time.sleep(wait)
+            if watch_list != "-" and os.path.getmtime(watch_list) != watched_mtime:
+                watched_mtime = self._sync(watch_list)
+        return changes
+    
+    def _sync(self, watch_list):
+        mtime = os.path.getmtime(watch_list) if watch_list != "-" else None
+        added, removed = self.store.sync(read_watch_list(watch_list))
+        print(f"{Fore.YELLOW}[*] Watch list {watch_list}: {added} targets added, {removed} removed")
+        return mtime
+    
+    def check(self, targets):
+        """Check one batch of due targets, emit their changes and reschedule them; returns how many changed."""
+        by_kind = {}
+        for target in targets:
+            by_kind.setdefault(target["kind"], {})[target["target"]] = target
+        
+        observations = []
+        if "username" in by_kind:
+            records = {}
+            for record in self.finder.iter_username_results(list(by_kind["username"])):
+                records.setdefault(record["username"], []).append(record)
+            observations += [(by_kind["username"][username], username_observation(records.get(username, [])))
+                             for username in by_kind["username"]]
+        if "domain" in by_kind:
+            observations += [(by_kind["domain"][record["input"]], domain_observation(record["results"]))
+                             for record in self.finder.iter_domain_results(list(by_kind["domain"]))]
+        if "social" in by_kind:
+            pairs = [tuple(target.split("/", 1)) for target in by_kind["social"]]
+            observations += [(by_kind["social"][f"{record['platform']}/{record['identifier']}"], social_observation(record["results"]))
+                             for record in self.finder.iter_profile_results(pairs)]
+        
+        updates = []
+        changed = baselines = 0
+        now = time.time()
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        for target, (fields, scopes) in observations:
+            if target["state"] is None:
+                if not scopes:
+                    # Nothing could be observed yet; try again after the base interval
+                    updates.append((target["kind"], target["target"], None, self._next_due(now, 0), 0, None))
+                    continue
+                baselines += 1
+                updates.append((target["kind"], target["target"], merge_state({}, fields, scopes), self._next_due(now, 0), 0, None))
+                continue
+            
+            state = merge_state(target["state"], fields, scopes)
+            changes = diff_states(target["state"], state)
+            if changes:
+                changed += 1
+                self._emit(target["kind"], target["target"], changes, timestamp)
+                updates.append((target["kind"], target["target"], state, self._next_due(now, 0), 0, now))
+            else:
+                quiet = target["quiet"] + 1
+                updates.append((target["kind"], target["target"], state, self._next_due(now, quiet), quiet, None))
+        self.store.save(updates)
+        
+        next_due = self.store.next_due()
+        print(f"{Fore.YELLOW}[*] Checked {len(observations)} targets: {changed} changed, {baselines} baselines recorded"
+              + (f"; next check in {max(0, round(next_due - time.time()))}s" if next_due is not None else ""))
+        return changed
+    
+    def _next_due(self, now, quiet):
+        """When a target that has been quiet for that many checks is due again."""
+        interval = min(self.interval * 2 ** min(quiet, 32), self.max_interval)
+        return now + interval * random.uniform(1 - self.jitter, 1 + self.jitter)
+    
+    def _emit(self, kind, target, changes, timestamp):
+        """Print a target's changes and write them to the sink as one record."""
+        for change in changes:
+            scope, _, name = change["field"].rpartition(".")
+            if name == "exists" and change["new"] is not None:
+                color, verb = (Fore.GREEN, "created") if change["new"] else (Fore.RED, "deleted")
+                print(f"{color}[{'+' if change['new'] else '-'}] {kind} {target}: {scope} {verb}")
+            else:
+                print(f"{Fore.CYAN}[*] {kind} {target}: {change['field']}: {change['old']} -> {change['new']}")
+        self.sink.write({"kind": kind, "target": target, "timestamp": timestamp, "changes": changes})
+
+def preload_modules():
+    """Import every heavy dependency now, so forked daemon jobs start with them already loaded."""
+    for module in (asyncio, bs4, dns, multiprocessing, requests, whois):
+        module._load()
+    html_backend()
+    for name in ("aiohttp", "httpx", "yaml", "zstandard"):
+        try:
+            importlib.import_module(name)
+        except ImportError:
+            pass
+
+def serve_daemon(path):
+    """Accept command lines on a Unix socket and run each in a forked copy of this warm process."""
+    if not hasattr(os, "fork") or not hasattr(socket, "AF_UNIX"):
+        raise RuntimeError("daemon mode needs fork() and Unix sockets")
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+        raise RuntimeError(f"a daemon is already listening on {path}")
+    except OSError:
+        pass
+    finally:
+        probe.close()
+    
+    start = time.perf_counter()
+    preload_modules()
+    print(f"{Fore.YELLOW}[*] Preloaded dependencies in {time.perf_counter() - start:.2f}s")
+    
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with contextlib.suppress(FileNotFoundError):
+        os.unlink(path)
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    # Create the socket owner-only from the start; a chmod after bind leaves a window where others can connect
+    umask = os.umask(0o177)
+    try:
+        server.bind(path)
+    finally:
+        os.umask(umask)
+    server.listen(64)
+    # Finished jobs are reaped by the kernel
+    signal.signal(signal.SIGCHLD, signal.SIG_IGN)
+    print(f"{Fore.GREEN}[+] Daemon listening on {path} (pid {os.getpid()})")
+    print(f"{Fore.YELLOW}[*] Use it with: export {DAEMON_ENV}={path}")
+    try:
+        while True:
+            conn, _ = server.accept()
+            sys.stdout.flush()
+            sys.stderr.flush()
+            if os.fork() == 0:
+                server.close()
+                _run_daemon_job(conn)
+            conn.close()
+    finally:
+        server.close()
+        with contextlib.suppress(OSError):
+            os.unlink(path)
+
+def _run_daemon_job(conn):
+    """Run one client's command line in a forked daemon child, with output sent back over conn. Never returns."""
+    code = 1
+    try:
+        signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+        signal.signal(signal.SIGINT, signal.default_int_handler)
+        job = json.loads(conn.makefile("rb").readline())
+        os.environ.clear()
+        os.environ.update(job["env"])
+        os.environ.pop(DAEMON_ENV, None)
+        os.chdir(job["cwd"])
+        os.dup2(conn.fileno(), 1)
+        os.dup2(conn.fileno(), 2)
+        sys.__stdout__.reconfigure(line_buffering=True)
+        sys.__stderr__.reconfigure(line_buffering=True)
+        code = run(job["argv"])
+    except SystemExit as e:
+        code = e.code if isinstance(e.code, int) else int(e.code is not None)
+    except BaseException:
+        code = 1
+    finally:
+        with contextlib.suppress(Exception):
+            sys.stdout.flush()
+            sys.stderr.flush()
+            conn.sendall(DAEMON_EXIT_MARKER + f"{code}\n".encode())
+        os._exit(code)
+
+def run_on_daemon(path, argv):
+    """Run a command line on a daemon and relay its output; returns the exit status, or None if no daemon answers."""
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        client.connect(path)
+    except OSError:
+        client.close()
+        print(f"{Fore.YELLOW}[!] No daemon on {path}, running locally", file=sys.stderr)
+        return None
+    
+    out = sys.__stdout__.buffer
+    pending = b""
+    with client:
+        client.sendall(json.dumps({"argv": argv, "cwd": os.getcwd(), "env": dict(os.environ)}).encode() + b"\n")
+        while True:
+            chunk = client.recv(65536)
+            if not chunk:
+                break
+            pending += chunk
+            end = pending.find(DAEMON_EXIT_MARKER)
+            if end >= 0:
+                out.write(pending[:end])
+                pending = pending[end:]
+                continue
+            # Hold back only what could be the start of a marker split across reads
+            cut = pending.find(b"\0", max(0, len(pending) - len(DAEMON_EXIT_MARKER) + 1))
+            cut = len(pending) if cut < 0 else cut
+            out.write(pending[:cut])
+            pending = pending[cut:]
+            out.flush()
+    out.flush()
+    if not pending.startswith(DAEMON_EXIT_MARKER):
+        out.write(pending)
+        print(f"{Fore.RED}[!] Daemon job ended without an exit status", file=sys.stderr)
+        return 1
+    return int(pending[len(DAEMON_EXIT_MARKER):].strip() or 1)
+
+def run(argv=None):
+    """Run the command line, reporting errors the way the script does, and return its exit status."""
+    try:
+        main(argv)
+    except KeyboardInterrupt:
+        print(f"\n{Fore.YELLOW}[!] Process interrupted by user")
+        return 0
+    except Exception as e:
+        print(f"\n{Fore.RED}[!] An error occurred: {str(e)}")
+        return 1
+    return 0
+
+def select_sites(args, command_parser):
+    """Load the sites chosen with --sites, --no-builtin-sites and --tags, exiting through command_parser on a bad pick."""
+    tags = [tag.strip() for tag in args.tags.split(",")] if args.tags else None
+    try:
+        sites = SiteDatabase.load(args.sites, builtin=not args.no_builtin_sites).select(tags)
+    except (OSError, ValueError, RuntimeError) as e:
+        command_parser.error(f"could not load site definitions: {e}")
+    if not sites:
+        command_parser.error("no sites match the given --sites/--tags selection")
+    return sites
+
 # The main() function should be outside the FinderBuster class
-def main():
+def main(argv=None):
     """Main function to run the tool."""
+    argv = sys.argv[1:] if argv is None else list(argv)
+    daemon_path = os.environ.get(DAEMON_ENV)
+    # Commands reading targets from stdin, and the daemon itself, always run in this process
+    if daemon_path and argv[:1] != ["daemon"] and "-" not in argv:
+        code = run_on_daemon(os.path.expanduser(daemon_path), argv)
+        if code is not None:
+            sys.exit(code)
+    
     parser = argparse.ArgumentParser(description="FinderBuster - OSINT Tool for Username Reconnaissance, Domain Information, and Social Media Profiling | Created By NunoGans")
     
+    # Options shared by every command
+    common_parser = argparse.ArgumentParser(add_help=False)
+    common_parser.add_argument("--no-cache", action="store_true", help="Do not read or write the result cache")
+    common_parser.add_argument("--refresh", action="store_true", help="Ignore cached results but store fresh ones")
+    common_parser.add_argument("--cache-path", default=DEFAULT_CACHE_PATH,
+                               help=f"Result cache database (default: {DEFAULT_CACHE_PATH})")
+    common_parser.add_argument("--timeout", type=float, default=REQUEST_TIMEOUT,
+                               help=f"Upper bound for per-request read timeouts, which adapt to each site's latency (default: {REQUEST_TIMEOUT})")
+    common_parser.add_argument("--budget", type=float, default=DEFAULT_TARGET_BUDGET,
+                               help=f"Overall seconds allowed per username or domain; 0 for no limit (default: {DEFAULT_TARGET_BUDGET})")
+    common_parser.add_argument("--pool-size", type=int,
+                               help="Keep-alive connections kept open per host (default: --concurrency)")
+    common_parser.add_argument("--http2", action="store_true",
+                               help="Use HTTP/2 for HTTPS hosts that support it (requires httpx[http2]; thread engine only)")
+    common_parser.add_argument("--no-preresolve", action="store_true", help="Do not resolve site hostnames before probing")
+    common_parser.add_argument("--stats", action="store_true", help="Print per-site and per-stage timing statistics at the end")
+    common_parser.add_argument("--metrics-json", metavar="PATH", help="Write collected metrics to a JSON file at the end")
+    common_parser.add_argument("--prometheus-file", metavar="PATH",
+                               help=f"Keep a Prometheus text-format metrics file updated (every {METRICS_EXPORT_INTERVAL}s)")
+    common_parser.add_argument("--prometheus-port", type=int, metavar="PORT",
+                               help="Serve Prometheus metrics on http://127.0.0.1:PORT/metrics while running")
+    
+    # Options for the lookup commands, which write result files
+    run_parser = argparse.ArgumentParser(add_help=False)
+    run_parser.add_argument("-o", "--output", help="Output file (default: timestamped file in finderbuster_results)")
+    run_parser.add_argument("--format", choices=["json", "jsonl"],
+                            help="Output format (default: json for single lookups, jsonl for --file runs)")
+    run_parser.add_argument("--compress", choices=["gzip", "zstd"], help="Compress the output file")
+    run_parser.add_argument("--compact", action="store_true", help="Write JSON without indentation")
+    run_parser.add_argument("--run-id", help="Name for a resumable --file run (default: command and timestamp)")
+    run_parser.add_argument("--resume", metavar="RUN_ID", help="Resume an interrupted --file run, skipping finished work")
+    run_parser.add_argument("--workers", type=int, default=1,
+                            help="Worker processes to spread a run over; --concurrency applies to each (default: 1)")
+    run_parser.add_argument("--queue", metavar="PATH",
+                            help="SQLite work queue shared by several hosts running the same command (implies worker processes)")
+    
     # Create subparsers for different functions
     subparsers = parser.add_subparsers(dest="command", help="Command to run")
     
     # Username Search Parser
-    username_parser = subparsers.add_parser("username", help="Search for username across different platforms")
-    username_parser.add_argument("username", help="Username to search for")
+    username_parser = subparsers.add_parser("username", parents=[common_parser, run_parser], help="Search for username across different platforms")
+    username_parser.add_argument("username", nargs="?", help="Username to search for")
+    username_parser.add_argument("-f", "--file", help="File with one username per line ('-' for stdin)")
+    username_parser.add_argument("--concurrency", type=int, default=DEFAULT_WORKERS,
+                                 help=f"Number of concurrent probes (default: {DEFAULT_WORKERS})")
+    username_parser.add_argument("--max-in-flight", type=int,
+                                 help="Maximum queued probes in bulk mode (default: 4x concurrency)")
+    username_parser.add_argument("--engine", choices=["thread", "async"], default="thread",
+                                 help="Probe engine: thread pool or asyncio/aiohttp (default: thread)")
+    username_parser.add_argument("--per-host", type=int, default=DEFAULT_PER_HOST_LIMIT,
+                                 help=f"Async engine connections per host (default: {DEFAULT_PER_HOST_LIMIT})")
+    username_parser.add_argument("--rate", type=float, default=DEFAULT_HOST_RATE,
+                                 help=f"Starting requests per second per site, adapted to 429/503 responses (default: {DEFAULT_HOST_RATE})")
+    username_parser.add_argument("--max-retries", type=int, default=DEFAULT_MAX_RETRIES,
+                                 help=f"Retries for rate-limited probes before reporting them inconclusive (default: {DEFAULT_MAX_RETRIES})")
+    username_parser.add_argument("--sites", action="append", default=[], metavar="PATH",
+                                 help="JSON/YAML site definition file or directory (repeatable)")
+    username_parser.add_argument("--no-builtin-sites", action="store_true", help="Only use sites loaded with --sites")
+    username_parser.add_argument("--tags", help="Comma-separated tags selecting a subset of sites (e.g. dev,social)")
+    username_parser.add_argument("--profile", action="store_true",
+                                 help="Extract profile details for found accounts from the page that found them")
+    username_parser.add_argument("--permute", nargs="?", const="all", metavar="RULES",
+                                 help=f"Also check variants of each username built from comma-separated rules: "
+                                      f"{', '.join(PERMUTATION_RULES)} (default: all)")
+    username_parser.add_argument("--suffixes", default=DEFAULT_PERMUTATION_SUFFIXES, metavar="RANGES",
+                                 help=f"Numeric suffixes for the suffix rule, e.g. 1-99,1990-2025,00-09 (default: {DEFAULT_PERMUTATION_SUFFIXES})")
+    username_parser.add_argument("--max-variants", type=int, help="Check at most this many variants per username")
+    username_parser.add_argument("--dedupe-window", type=int, default=DEFAULT_DEDUPE_WINDOW,
+                                 help=f"Recent (site, normalized username) pairs remembered to skip duplicate probes (default: {DEFAULT_DEDUPE_WINDOW})")
     
     # Domain Info Parser
-    domain_parser = subparsers.add_parser("domain", help="Gather information about a domain")
-    domain_parser.add_argument("domain", help="Domain to gather information about")
+    domain_parser = subparsers.add_parser("domain", parents=[common_parser, run_parser], help="Gather information about a domain")
+    domain_parser.add_argument("domain", nargs="?", help="Domain to gather information about")
+    domain_parser.add_argument("-f", "--file", help="File with one domain per line ('-' for stdin)")
+    domain_parser.add_argument("--concurrency", type=int, default=DEFAULT_WORKERS,
+                               help=f"Number of domains processed at once (default: {DEFAULT_WORKERS})")
+    domain_parser.add_argument("--nameservers", help="Comma-separated DNS servers to query instead of the system ones")
+    domain_parser.add_argument("--dns-timeout", type=float, default=DNS_TIMEOUT,
+                               help=f"Per-nameserver DNS timeout in seconds (default: {DNS_TIMEOUT})")
+    domain_parser.add_argument("--whois-concurrency", type=int, default=WHOIS_SERVER_CONCURRENCY,
+                               help=f"WHOIS queries sent to one server at once (default: {WHOIS_SERVER_CONCURRENCY})")
+    domain_parser.add_argument("--whois-rate", type=float, default=WHOIS_SERVER_RATE,
+                               help=f"WHOIS queries per second sent to one server (default: {WHOIS_SERVER_RATE})")
+    domain_parser.add_argument("--whois-raw", action="store_true", help="Include the raw WHOIS text in results")
     
     # Social Media Profile Parser
-    social_parser = subparsers.add_parser("social", help="Extract profile information from social media platforms")
-    social_parser.add_argument("platform", choices=["instagram", "twitter", "x", "github", "linkedin"], 
-                            help="Social media platform")
-    social_parser.add_argument("identifier", help="Username or profile identifier")
+    social_parser = subparsers.add_parser("social", parents=[common_parser, run_parser], help="Extract profile information from social media platforms")
+    social_parser.add_argument("platform", nargs="?", choices=[*SOCIAL_PLATFORMS, "x", "all"],
+                            help="Social media platform, or 'all' to profile the identifier on every platform")
+    social_parser.add_argument("identifier", nargs="?", help="Username or profile identifier")
+    social_parser.add_argument("-f", "--file",
+                            help="CSV/JSONL of platform,identifier pairs, or one identifier per line when a platform is given ('-' for stdin)")
+    social_parser.add_argument("--concurrency", type=int, default=DEFAULT_WORKERS,
+                            help=f"Number of concurrent extractions (default: {DEFAULT_WORKERS})")
+    social_parser.add_argument("--max-in-flight", type=int,
+                            help="Maximum queued profiles in bulk mode (default: 4x concurrency)")
+    social_parser.add_argument("--per-platform", type=int,
+                            help="Concurrent extractions allowed per platform (default: per-platform limits)")
+    
+    # API Server Parser
+    serve_parser = subparsers.add_parser("serve", parents=[common_parser], help="Serve username, domain and social lookups over an HTTP/JSON API")
+    serve_parser.add_argument("--host", default=DEFAULT_SERVE_HOST, help=f"Address to listen on (default: {DEFAULT_SERVE_HOST})")
+    serve_parser.add_argument("--port", type=int, default=DEFAULT_SERVE_PORT, help=f"Port to listen on (default: {DEFAULT_SERVE_PORT})")
+    serve_parser.add_argument("--max-probes", type=int, default=DEFAULT_ASYNC_CONCURRENCY,
+                              help=f"Username probes in flight across all requests (default: {DEFAULT_ASYNC_CONCURRENCY})")
+    serve_parser.add_argument("--concurrency", type=int, default=DEFAULT_WORKERS,
+                              help=f"Domain and social lookups run at once across all requests (default: {DEFAULT_WORKERS})")
+    serve_parser.add_argument("--per-host", type=int, default=DEFAULT_PER_HOST_LIMIT,
+                              help=f"Connections per site (default: {DEFAULT_PER_HOST_LIMIT})")
+    serve_parser.add_argument("--rate", type=float, default=DEFAULT_HOST_RATE,
+                              help=f"Starting requests per second per site, adapted to 429/503 responses (default: {DEFAULT_HOST_RATE})")
+    serve_parser.add_argument("--max-retries", type=int, default=DEFAULT_MAX_RETRIES,
+                              help=f"Retries for rate-limited probes before reporting them inconclusive (default: {DEFAULT_MAX_RETRIES})")
+    serve_parser.add_argument("--sites", action="append", default=[], metavar="PATH",
+                              help="JSON/YAML site definition file or directory (repeatable)")
+    serve_parser.add_argument("--no-builtin-sites", action="store_true", help="Only serve sites loaded with --sites")
+    serve_parser.add_argument("--tags", help="Comma-separated tags selecting the sites to serve")
+    serve_parser.add_argument("--profile", action="store_true",
+                              help="Extract profile details for found accounts from the page that found them")
+    serve_parser.add_argument("--nameservers", help="Comma-separated DNS servers to query instead of the system ones")
+    serve_parser.add_argument("--dns-timeout", type=float, default=DNS_TIMEOUT,
+                              help=f"Per-nameserver DNS timeout in seconds (default: {DNS_TIMEOUT})")
+    serve_parser.add_argument("--whois-concurrency", type=int, default=WHOIS_SERVER_CONCURRENCY,
+                              help=f"WHOIS queries sent to one server at once (default: {WHOIS_SERVER_CONCURRENCY})")
+    serve_parser.add_argument("--whois-rate", type=float, default=WHOIS_SERVER_RATE,
+                              help=f"WHOIS queries per second sent to one server (default: {WHOIS_SERVER_RATE})")
+    serve_parser.add_argument("--whois-raw", action="store_true", help="Include the raw WHOIS text in results")
+    
+    # Monitor Parser
+    monitor_parser = subparsers.add_parser("monitor", parents=[common_parser],
+                                           help="Watch usernames, domains and profiles, reporting only what changed")
+    monitor_parser.add_argument("-f", "--file", required=True,
+                                help="Watch list: lines 'username NAME', 'domain DOMAIN' or 'social PLATFORM IDENTIFIER' ('-' for stdin)")
+    monitor_parser.add_argument("-o", "--output", help="JSON Lines file changes are appended to (default: timestamped file in finderbuster_results)")
+    monitor_parser.add_argument("--store", default=DEFAULT_MONITOR_STORE,
+                                help=f"SQLite file keeping each target's last-known state (default: {DEFAULT_MONITOR_STORE})")
+    monitor_parser.add_argument("--interval", type=float, default=DEFAULT_MONITOR_INTERVAL,
+                                help=f"Seconds between checks of a target (default: {DEFAULT_MONITOR_INTERVAL})")
+    monitor_parser.add_argument("--max-interval", type=float, default=DEFAULT_MONITOR_MAX_INTERVAL,
+                                help=f"Longest interval a quiet target backs off to, in seconds (default: {DEFAULT_MONITOR_MAX_INTERVAL})")
+    monitor_parser.add_argument("--jitter", type=float, default=DEFAULT_MONITOR_JITTER,
+                                help=f"Random spread of each interval, as a fraction of it (default: {DEFAULT_MONITOR_JITTER})")
+    monitor_parser.add_argument("--batch", type=int, default=DEFAULT_MONITOR_BATCH,
+                                help=f"Due targets checked together (default: {DEFAULT_MONITOR_BATCH})")
+    monitor_parser.add_argument("--once", action="store_true", help="Check the targets that are due, then exit")
+    monitor_parser.add_argument("--concurrency", type=int, default=DEFAULT_WORKERS,
+                                help=f"Number of concurrent checks (default: {DEFAULT_WORKERS})")
+    monitor_parser.add_argument("--per-host", type=int, default=DEFAULT_PER_HOST_LIMIT,
+                                help=f"Connections per site (default: {DEFAULT_PER_HOST_LIMIT})")
+    monitor_parser.add_argument("--rate", type=float, default=DEFAULT_HOST_RATE,
+                                help=f"Starting requests per second per site, adapted to 429/503 responses (default: {DEFAULT_HOST_RATE})")
+    monitor_parser.add_argument("--max-retries", type=int, default=DEFAULT_MAX_RETRIES,
+                                help=f"Retries for rate-limited probes before reporting them inconclusive (default: {DEFAULT_MAX_RETRIES})")
+    monitor_parser.add_argument("--sites", action="append", default=[], metavar="PATH",
+                                help="JSON/YAML site definition file or directory (repeatable)")
+    monitor_parser.add_argument("--no-builtin-sites", action="store_true", help="Only watch sites loaded with --sites")
+    monitor_parser.add_argument("--tags", help="Comma-separated tags selecting the sites usernames are watched on")
+    monitor_parser.add_argument("--profile", action="store_true",
+                                help="Also track profile details (bio, followers, ...) of accounts found for watched usernames")
+    monitor_parser.add_argument("--nameservers", help="Comma-separated DNS servers to query instead of the system ones")
+    monitor_parser.add_argument("--dns-timeout", type=float, default=DNS_TIMEOUT,
+                                help=f"Per-nameserver DNS timeout in seconds (default: {DNS_TIMEOUT})")
+    monitor_parser.add_argument("--whois-concurrency", type=int, default=WHOIS_SERVER_CONCURRENCY,
+                                help=f"WHOIS queries sent to one server at once (default: {WHOIS_SERVER_CONCURRENCY})")
+    monitor_parser.add_argument("--whois-rate", type=float, default=WHOIS_SERVER_RATE,
+                                help=f"WHOIS queries per second sent to one server (default: {WHOIS_SERVER_RATE})")
+    
+    # Daemon Parser
+    daemon_parser = subparsers.add_parser("daemon", help="Keep a warm process that runs commands for FINDERBUSTER_DAEMON clients")
+    daemon_parser.add_argument("--socket", default=DEFAULT_DAEMON_SOCKET,
+                               help=f"Unix socket to listen on (default: {DEFAULT_DAEMON_SOCKET})")
     
     # Version argument
     parser.add_argument("--version", action="version", version=f"FinderBuster v{VERSION}")
     
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
+    
+    if args.command == "daemon":
+        serve_daemon(args.socket)
+        return
+    
+    if args.command == "username" and not (args.username or args.file or args.resume):
+        username_parser.error("a username, --file or --resume is required")
+    if args.command == "domain" and not (args.domain or args.file or args.resume):
+        domain_parser.error("a domain, --file or --resume is required")
+    if args.command == "social" and not ((args.platform and args.identifier) or args.file or args.resume):
+        social_parser.error("a platform and identifier, --file or --resume is required")
+    if getattr(args, "workers", 1) < 1:
+        parser.error("--workers must be at least 1")
+    if args.command == "monitor" and not (args.interval > 0 and 0 <= args.jitter < 1 and args.batch > 0):
+        monitor_parser.error("--interval and --batch must be positive and --jitter between 0 and 1")
+    if args.command and args.http2 and getattr(args, "engine", "thread") == "async":
+        parser.error("--http2 is only supported by the thread engine")
+    
+    metrics = Metrics()
+    exporter = None
+    if args.command and (args.prometheus_file or args.prometheus_port):
+        exporter = MetricsExporter(metrics, args.prometheus_file, args.prometheus_port).start()
+    
+    cache = None
+    if args.command and not args.no_cache:
+        # A monitor must see current data, so it only keeps the cache for conditional requests and WHOIS servers
+        ttls = {operation: 0 for operation in MONITOR_FRESH_OPERATIONS} if args.command == "monitor" else None
+        cache = ResultCache(args.cache_path, ttls=ttls, refresh=args.refresh, metrics=metrics)
+    
+    sites = None
+    if args.command in ("username", "serve", "monitor"):
+        sites = select_sites(args, subparsers.choices[args.command])
+
+    resolver = whois_client = None
+    if args.command in ("domain", "serve", "monitor"):
+        resolver = make_resolver(args.nameservers.split(",") if args.nameservers else None, args.dns_timeout)
+        whois_client = WhoisClient(cache, metrics, args.whois_concurrency, args.whois_rate)
     
     # Create FinderBuster instance
-    finder = FinderBuster()
+    finder = FinderBuster(max_workers=getattr(args, "concurrency", DEFAULT_WORKERS),
+                          engine=getattr(args, "engine", "thread"),
+                          per_host=getattr(args, "per_host", DEFAULT_PER_HOST_LIMIT),
+                          cache=cache,
+                          resolver=resolver,
+                          rate_limiter=HostRateLimiter(getattr(args, "rate", DEFAULT_HOST_RATE)),
+                          max_retries=getattr(args, "max_retries", DEFAULT_MAX_RETRIES),
+                          sites=sites,
+                          profile=getattr(args, "profile", False),
+                          metrics=metrics,
+                          health=HostHealth(max_read=args.timeout) if args.command else None,
+                          budget=args.budget if args.command else DEFAULT_TARGET_BUDGET,
+                          pool_size=args.pool_size if args.command else None,
+                          http2=args.command is not None and args.http2,
+                          preresolve=not (args.command and args.no_preresolve),
+                          workers=getattr(args, "workers", 1),
+                          work_queue=WorkQueue(args.queue) if getattr(args, "queue", None) else None,
+                          whois_client=whois_client,
+                          whois_raw=getattr(args, "whois_raw", False))
     finder.print_banner()
     
-    if args.command == "username":
+    bulk = args.command in ("username", "domain", "social") and (args.file or args.resume)
+    fanout = (args.command == "social" and args.platform == "all" or args.command == "username" and args.permute) and not bulk
+    checkpoint = None
+    if args.command in ("username", "domain", "social"):
+        fmt = args.format or ("jsonl" if bulk or fanout else "json")
+    
+    if bulk:
+        # Batch runs are journaled so they can be resumed with --resume <run-id>
+        run_id = args.resume or args.run_id or f"{args.command}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        checkpoint = Checkpoint(os.path.join(finder.output_dir, "runs", run_id), resume=bool(args.resume))
+        meta = checkpoint.load_meta()
+        
+        if args.resume:
+            if not meta or meta["command"] != args.command:
+                parser.error(f"no resumable {args.command} run named '{run_id}'")
+            if meta["format"] != "jsonl":
+                parser.error("only runs written as JSON Lines can be resumed")
+            args.file = args.file or meta["input"]
+            if args.command == "social":
+                args.platform = args.platform or meta.get("platform")
+            if args.command == "username" and meta.get("permute"):
+                # Variants must come out in the same order for the journal to line up
+                args.permute, args.suffixes, args.max_variants = meta["permute"], meta["suffixes"], meta["max_variants"]
+            if args.command == "username" and "sites" in meta:
+                # The remaining units are (username, site) pairs, so the run's own site selection applies
+                args.sites, args.tags, args.no_builtin_sites = meta["sites"], meta["tags"], meta["no_builtin_sites"]
+                finder.sites = select_sites(args, username_parser)
+            fmt, args.compress, filepath = meta["format"], meta["compression"], meta["output"]
+            if args.file == "-" and sys.stdin.isatty():
+                parser.error("this run read its targets from stdin; pipe them in again to resume")
+            print(f"{Fore.YELLOW}[*] Resuming run '{run_id}' ({len(checkpoint.done)} units already done)")
+        else:
+            name = os.path.basename(args.file) if args.file != "-" else "stdin"
+            filepath = os.path.abspath(args.output or finder.output_path(f"{args.command}_bulk_{name}", fmt, args.compress))
+            checkpoint.save_meta({"command": args.command, "input": os.path.abspath(args.file) if args.file != "-" else "-",
+                                  "output": filepath, "format": fmt, "compression": args.compress, "complete": False,
+                                  "platform": getattr(args, "platform", None), "permute": getattr(args, "permute", None),
+                                  "suffixes": getattr(args, "suffixes", None), "max_variants": getattr(args, "max_variants", None),
+                                  "sites": [os.path.abspath(path) for path in getattr(args, "sites", [])],
+                                  "tags": getattr(args, "tags", None), "no_builtin_sites": getattr(args, "no_builtin_sites", False)})
+            print(f"{Fore.YELLOW}[*] Run ID: {run_id} (resume with --resume {run_id})")
+    
+    if args.command == "username" and (bulk or fanout):
+        usernames = read_targets(args.file) if bulk else [args.username]
+        dedupe = None
+        if args.permute:
+            try:
+                rules, suffixes = parse_permutation_rules(args.permute), parse_suffixes(args.suffixes)
+            except ValueError as e:
+                username_parser.error(str(e))
+            usernames = permute_usernames(usernames, rules, suffixes, args.max_variants)
+            dedupe = DedupeWindow(args.dedupe_window)
+            print(f"{Fore.YELLOW}[*] Checking variants built from rules: {', '.join(rules)}")
+        if not bulk:
+            filepath = os.path.abspath(args.output or finder.output_path(f"username_variants_{args.username}", fmt, args.compress))
+        with open_sink(filepath, fmt, args.compress, args.compact, append=bool(args.resume)) as sink:
+            finder.check_usernames(usernames, sink, args.max_in_flight, checkpoint, dedupe)
+        print(f"{Fore.GREEN}[+] Results saved to {filepath}")
+    
+    elif args.command == "username":
         results = finder.check_username(args.username)
-        finder.save_results(f"username_{args.username}")
+        finder.save_results(f"username_{args.username}", fmt, args.compress, args.compact, args.output)
+    
+    elif args.command == "domain" and bulk:
+        with open_sink(filepath, fmt, args.compress, args.compact, append=bool(args.resume)) as sink:
+            finder.check_domains(read_targets(args.file), sink, checkpoint=checkpoint)
+        print(f"{Fore.GREEN}[+] Results saved to {filepath}")
     
     elif args.command == "domain":
         results = finder.get_domain_info(args.domain)
-        finder.save_results(f"domain_{args.domain}")
+        finder.save_results(f"domain_{args.domain}", fmt, args.compress, args.compact, args.output)
+    
+    elif args.command == "social" and (bulk or fanout):
+        platforms = SOCIAL_PLATFORMS if args.platform == "all" else [args.platform] if args.platform else None
+        if bulk:
+            targets = read_profile_targets(args.file, platforms)
+        else:
+            targets = ((platform, args.identifier) for platform in platforms)
+            filepath = os.path.abspath(args.output or finder.output_path(f"social_all_{args.identifier}", fmt, args.compress))
+        with open_sink(filepath, fmt, args.compress, args.compact, append=bool(args.resume)) as sink:
+            finder.check_profiles(targets, sink, args.max_in_flight, args.per_platform, checkpoint)
+        print(f"{Fore.GREEN}[+] Results saved to {filepath}")
     
     elif args.command == "social":
         results = finder.get_social_media_profile(args.platform, args.identifier)
-        finder.save_results(f"social_{args.platform}_{args.identifier}")
+        finder.save_results(f"social_{args.platform}_{args.identifier}", fmt, args.compress, args.compact, args.output)
+    
+    elif args.command == "serve":
+        ApiServer(finder, args.host, args.port, args.max_probes).run()
+    
+    elif args.command == "monitor":
+        filepath = os.path.abspath(args.output or finder.output_path("monitor_changes", "jsonl"))
+        store = MonitorStore(args.store)
+        print(f"{Fore.YELLOW}[*] Monitoring {args.file}, changes go to {filepath}")
+        try:
+            with open_sink(filepath, "jsonl", append=True) as sink:
+                Monitor(finder, store, sink, args.interval, args.max_interval, args.jitter, args.batch).run(args.file, args.once)
+        finally:
+            store.close()
+        print(f"{Fore.GREEN}[+] Changes saved to {filepath}")
     
     else:
         parser.print_help()
         sys.exit(1)
+    
+    if checkpoint:
+        checkpoint.close(complete=True)
+    if cache:
+        cache.close()
+    if finder.work_queue:
+        finder.work_queue.close()
+    if exporter:
+        exporter.close()
+    if args.metrics_json:
+        metrics.write_json(args.metrics_json)
+        print(f"{Fore.GREEN}[+] Metrics saved to {args.metrics_json}")
+    if args.stats:
+        metrics.print_summary()
 
 if __name__ == "__main__":
-    try:
-        main()
-    except KeyboardInterrupt:
-        print(f"\n{Fore.YELLOW}[!] Process interrupted by user")
-        sys.exit(0)
-    except Exception as e:
-        print(f"\n{Fore.RED}[!] An error occurred: {str(e)}")
-        sys.exit(1)
\ No newline at end of file
+    sys.exit(run())
\ No newline at end of file
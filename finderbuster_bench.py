@@ -0,0 +1,472 @@
+#!/usr/bin/env python3
+# FinderBuster - Offline benchmark suite
+# Runs the username, domain and social workloads against a local mock server with stub DNS and a mock WHOIS server,
+# so throughput can be measured reproducibly without touching live sites.
+
+import argparse
+import concurrent.futures
+import http.server
+import json
+import multiprocessing
+import os
+import random
+import socketserver
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import zlib
+from urllib.parse import urlparse
+
+import requests
+from colorama import Fore, init
+
+import finderbuster as fb
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+# Initialize colorama
+init(autoreset=True)
+
+# Default mock server behaviour; every value can be overridden from the command line
+DEFAULT_SCENARIO = {
+    "latency_ms": 50,
+    "jitter_ms": 20,
+    "body_kb": 64,
+    "found_rate": 0.5,
+    "throttle_rate": 0.0,
+    "timeout_rate": 0.0,
+    "request_timeout": 2.0,
+    "dns_latency_ms": 5,
+    "whois_latency_ms": 100,
+    "seed": 1
+}
+
+# Marker the mock server embeds in "not found" pages for message-based sites
+MOCK_MISSING_MARKER = "FinderBuster mock: no such account"
+
+SUITES = ("username", "domain", "social")
+
+# Startup budget: median milliseconds for a fresh `import finderbuster` and `finderbuster.py --version`,
+# and the dependencies that must stay unloaded until a command actually needs them
+STARTUP_BUDGET_MS = 250
+STARTUP_RUNS = 7
+HEAVY_MODULES = ("asyncio", "aiohttp", "bs4", "dns.resolver", "httpx", "lxml", "multiprocessing",
+                 "requests", "selectolax", "whois", "yaml", "zstandard")
+
+class MockHandler(http.server.BaseHTTPRequestHandler):
+    """Serve fake site, profile, geolocation and domain pages with simulated latency and failures.
+
+    Paths are /site/<status|message>/<username> for username probes and
+    /route/<original host><original path> for traffic rerouted by MockAdapter.
+    """
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self._respond(send_body=True)
+
+    def do_HEAD(self):
+        self._respond(send_body=False)
+
+    def _respond(self, send_body):
+        scenario = self.server.scenario
+        rng = random.Random(f"{scenario['seed']}:{self.path}:{time.monotonic_ns()}")
+
+        latency = scenario["latency_ms"] + rng.uniform(-scenario["jitter_ms"], scenario["jitter_ms"])
+        time.sleep(max(0.0, latency) / 1000)
+
+        roll = rng.random()
+        if roll < scenario["timeout_rate"]:
+            # Hang past the client's timeout, then give up on the connection
+            time.sleep(scenario["request_timeout"] + 0.5)
+            self.close_connection = True
+            return
+        if roll < scenario["timeout_rate"] + scenario["throttle_rate"]:
+            self._send(429, b"Too Many Requests", send_body, {"Retry-After": "1"})
+            return
+
+        path = urlparse(self.path).path
+        if path.startswith("/site/"):
+            _, _, mode, username = path.split("/", 3)
+            found = zlib.crc32(username.encode()) % 1000 < scenario["found_rate"] * 1000
+            if found:
+                self._send(200, self.server.page(), send_body)
+            elif mode == "status":
+                self._send(404, b"Not Found", send_body)
+            else:
+                self._send(200, self.server.page(MOCK_MISSING_MARKER), send_body)
+        elif path.startswith("/route/ipinfo.io/"):
+            ip = path.split("/")[3]
+            body = json.dumps({"ip": ip, "city": "Mocktown", "country": "ZZ", "org": "AS0 FinderBuster Mock"}).encode()
+            self._send(200, body, send_body, {"Content-Type": "application/json"})
+        elif path.startswith("/route/"):
+            self._send(200, self.server.page(), send_body, {"Server": "finderbuster-mock"})
+        else:
+            self._send(404, b"Not Found", send_body)
+
+    def _send(self, status, body, send_body, headers=None):
+        try:
+            self.send_response(status)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            if send_body:
+                self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            # Status-only probes hang up as soon as the headers arrive
+            self.close_connection = True
+
+class MockListener(socketserver.ThreadingMixIn, http.server.HTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        pass
+
+class MockServer:
+    """A set of mock listeners on 127.0.0.1, one port per simulated site so per-host limits apply as they would live."""
+
+    def __init__(self, scenario, listeners=len(fb.SITES)):
+        self.scenario = scenario
+        self.listeners = []
+        self.pages = {}
+        for _ in range(listeners):
+            listener = MockListener(("127.0.0.1", 0), MockHandler)
+            listener.scenario = scenario
+            listener.page = self.page
+            self.listeners.append(listener)
+
+    def __enter__(self):
+        for listener in self.listeners:
+            threading.Thread(target=listener.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc_info):
+        for listener in self.listeners:
+            listener.shutdown()
+            listener.server_close()
+
+    @property
+    def ports(self):
+        return [listener.server_address[1] for listener in self.listeners]
+
+    def page(self, marker=""):
+        """Build (once) a profile-like HTML page of the configured size, optionally carrying a marker."""
+        if marker not in self.pages:
+            head = ('<html><head><title>Mock User (@mock)</title>'
+                    '<meta property="og:title" content="Mock User (@mock)">'
+                    '<meta property="og:description" content="Benchmark profile">'
+                    '<meta property="og:image" content="https://example.com/mock.png"></head><body>'
+                    '<span itemprop="name">Mock User</span><div class="p-note">Benchmark bio</div>'
+                    '<li itemprop="homeLocation">Nowhere</li>'
+                    '<a href="/mock?tab=followers"><span class="text-bold">42</span> followers</a>'
+                    '<a href="/mock?tab=repositories">Repositories <span class="Counter">7</span></a>')
+            filler = "<div><p>lorem ipsum dolor sit amet</p></div>"
+            half = filler * max(0, (self.scenario["body_kb"] * 1024 - len(head)) // (2 * len(filler)))
+            self.pages[marker] = (head + half + marker + half + "</body></html>").encode()
+        return self.pages[marker]
+
+class MockAdapter(requests.adapters.HTTPAdapter):
+    """Transport adapter that reroutes every non-mock request (profiles, ipinfo, domain HTTP) to the mock server."""
+
+    def __init__(self, base, **kwargs):
+        self.base = base
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        parsed = urlparse(request.url)
+        if parsed.hostname != "127.0.0.1":
+            request.url = f"{self.base}/route/{parsed.netloc}{parsed.path or '/'}"
+        return super().send(request, **kwargs)
+
+class StubResolver:
+    """Stand-in for dns.resolver.Resolver answering every query after a fixed delay."""
+
+    ANSWERS = {
+        "A": ["127.0.0.1"],
+        "AAAA": ["::1"],
+        "MX": ["10 mail.example.com."],
+        "NS": ["ns1.example.com.", "ns2.example.com."],
+        "TXT": ['"v=spf1 -all"'],
+        "CNAME": []
+    }
+
+    def __init__(self, latency_ms):
+        self.latency = latency_ms / 1000
+
+    def resolve(self, domain, record_type):
+        time.sleep(self.latency)
+        return list(self.ANSWERS.get(record_type, []))
+
+class MockWhoisHandler(socketserver.StreamRequestHandler):
+    """Answer WHOIS queries: TLDs with an IANA-style referral back to this server, domains with a fixed record after a delay."""
+
+    RECORD = ("   Domain Name: {domain}\r\n"
+              "   Registrar: Mock Registrar\r\n"
+              "   Updated Date: 2021-01-01T00:00:00Z\r\n"
+              "   Creation Date: 2001-01-01T00:00:00Z\r\n"
+              "   Registry Expiry Date: 2031-01-01T00:00:00Z\r\n"
+              "   Domain Status: ok\r\n"
+              "   Name Server: NS1.EXAMPLE.COM\r\n"
+              "   Name Server: NS2.EXAMPLE.COM\r\n"
+              "   Registrant Organization: Mock Org\r\n"
+              "   Registrant Country: ZZ\r\n"
+              "   Registrant Email: hostmaster@{domain}\r\n")
+
+    def handle(self):
+        query = self.rfile.readline().decode().strip()
+        if "." not in query:
+            self.wfile.write(f"domain: {query.upper()}\r\nrefer: 127.0.0.1\r\n".encode())
+            return
+        time.sleep(self.server.latency)
+        self.wfile.write(self.RECORD.format(domain=query.upper()).encode())
+
+class MockWhoisServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    """Mock WHOIS server on 127.0.0.1 standing in for IANA and every registry."""
+
+    daemon_threads = True
+    request_queue_size = 128
+
+    def __init__(self, latency_ms):
+        self.latency = latency_ms / 1000
+        super().__init__(("127.0.0.1", 0), MockWhoisHandler)
+
+    def handle_error(self, request, client_address):
+        pass
+
+    def start(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+def mock_sites(ports):
+    """Point every built-in site at the mock server, keeping its detection style, tags and profile parser."""
+    sites = []
+    for index, (name, definition) in enumerate(fb.SITES.items()):
+        site = fb.Site(name, definition)
+        mode = "message" if site.needs_body else "status"
+        mocked = {"url": f"http://127.0.0.1:{ports[index % len(ports)]}/site/{mode}/{{}}", "tags": sorted(site.tags)}
+        if mode == "message":
+            mocked["not_found_message"] = MOCK_MISSING_MARKER
+        else:
+            mocked["not_found_status"] = 404
+        if site.profile:
+            mocked["profile"] = site.profile
+        sites.append(fb.Site(name, mocked))
+    return sites
+
+def percentile(values, q):
+    """Nearest-rank percentile of a sorted list."""
+    if not values:
+        return None
+    return values[min(len(values) - 1, max(0, int(round(q / 100 * len(values))) - 1))]
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB, or None where unavailable."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+def run_case(suite, engine, concurrency, count, scenario, ports, rate):
+    """Run one workload in this (fresh) process and return its measurements."""
+    fb.REQUEST_TIMEOUT = scenario["request_timeout"]
+    whois_server = MockWhoisServer(scenario["whois_latency_ms"]).start()
+
+    sites = mock_sites(ports)
+    finder = fb.FinderBuster(max_workers=concurrency, engine=engine, per_host=concurrency,
+                             resolver=StubResolver(scenario["dns_latency_ms"]),
+                             rate_limiter=fb.HostRateLimiter(rate) if rate else fb.HostRateLimiter(1e9),
+                             max_retries=1, sites=sites,
+                             whois_client=fb.WhoisClient(max_concurrency=concurrency, rate=1e9, iana_server="127.0.0.1",
+                                                         port=whois_server.server_address[1]))
+
+    adapter = MockAdapter(f"http://127.0.0.1:{ports[0]}", pool_connections=len(ports), pool_maxsize=concurrency)
+    finder.session.mount("https://", adapter)
+    finder.session.mount("http://", adapter)
+
+    latencies = []
+    errors = 0
+
+    def timed(func):
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                latencies.append(time.perf_counter() - start)
+        return wrapper
+
+    def async_timed(func):
+        async def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                latencies.append(time.perf_counter() - start)
+        return wrapper
+
+    baseline_rss = peak_rss_mb()
+    start = time.perf_counter()
+    operations = 0
+
+    if suite == "username":
+        # Latency is per HTTP request, excluding time spent queued for a worker or connection slot
+        finder._probe_once = timed(finder._probe_once)
+        fb.AsyncProbeEngine._probe_once = async_timed(fb.AsyncProbeEngine._probe_once)
+        usernames = (f"bench_user_{i}" for i in range(count))
+        for record in finder.iter_username_results(usernames):
+            operations += 1
+            errors += record["exists"] is None or record["message"].startswith(("Error", "Connection", "Request"))
+
+    elif suite == "domain":
+        finder._domain_record = timed(finder._domain_record)
+        domains = (f"bench-{i}.example.com" for i in range(count))
+        for record in finder.iter_domain_results(domains):
+            operations += 1
+            errors += "error" in record["results"] or "error" in record["results"]["http"]
+
+    else:
+        finder.profile_record = timed(finder.profile_record)
+        targets = ((fb.SOCIAL_PLATFORMS[i % len(fb.SOCIAL_PLATFORMS)], f"bench_user_{i}") for i in range(count))
+        for record in finder.iter_profile_results(targets, per_platform=concurrency):
+            operations += 1
+            errors += "error" in record["results"]
+
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "suite": suite,
+        "engine": engine if suite == "username" else "thread",
+        "concurrency": concurrency,
+        "operations": operations,
+        "errors": errors,
+        "seconds": round(elapsed, 3),
+        "ops_per_sec": round(operations / elapsed, 1) if elapsed else None,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 1) if latencies else None,
+        "p95_ms": round(percentile(latencies, 95) * 1000, 1) if latencies else None,
+        "p99_ms": round(percentile(latencies, 99) * 1000, 1) if latencies else None,
+        "baseline_rss_mb": baseline_rss,
+        "peak_rss_mb": peak_rss_mb()
+    }
+
+def run_suite(suites, engines, concurrency_levels, count, scenario, rate=None):
+    """Run every suite/engine/concurrency combination, each in a fresh process, and return the results."""
+    results = []
+    context = multiprocessing.get_context("spawn")
+
+    with MockServer(scenario) as server:
+        for suite in suites:
+            for engine in (engines if suite == "username" else ["thread"]):
+                for concurrency in concurrency_levels:
+                    with concurrent.futures.ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+                        result = pool.submit(run_case, suite, engine, concurrency, count, scenario, server.ports, rate).result()
+                    print_result(result)
+                    results.append(result)
+    return results
+
+def print_result(result):
+    """Print one benchmark row."""
+    color = Fore.GREEN if not result["errors"] else Fore.YELLOW
+    print(f"{color}[+] {result['suite']:<8} {result['engine']:<6} c={result['concurrency']:<5} "
+          f"{result['ops_per_sec']:>8} ops/s  p50 {result['p50_ms']} ms  p95 {result['p95_ms']} ms  "
+          f"p99 {result['p99_ms']} ms  errors {result['errors']}/{result['operations']}  "
+          f"peak RSS {result['peak_rss_mb']} MB (baseline {result['baseline_rss_mb']} MB)")
+
+def measure_startup(runs):
+    """Median wall time of fresh interpreters importing finderbuster and running --version, plus eager heavy imports."""
+    script = os.path.join(os.path.dirname(os.path.abspath(fb.__file__)), "finderbuster.py")
+    probe = f"import sys, finderbuster; print(','.join(name for name in {HEAVY_MODULES!r} if name in sys.modules))"
+    env = {name: value for name, value in os.environ.items() if name != fb.DAEMON_ENV}
+    commands = {"import": [sys.executable, "-c", "import finderbuster"], "version": [sys.executable, script, "--version"]}
+    timings = {}
+    for name, command in commands.items():
+        samples = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            subprocess.run(command, check=True, stdout=subprocess.DEVNULL, env=env, cwd=os.path.dirname(script))
+            samples.append((time.perf_counter() - start) * 1000)
+        timings[name] = round(statistics.median(samples), 1)
+    eager = subprocess.run([sys.executable, "-c", probe], check=True, capture_output=True, text=True,
+                           env=env, cwd=os.path.dirname(script)).stdout.strip()
+    return {"import_ms": timings["import"], "version_ms": timings["version"], "eager_modules": eager.split(",") if eager else []}
+
+def check_startup(runs, budget_ms):
+    """Report startup time against the budget; returns True when it fits and nothing heavy loads eagerly."""
+    result = measure_startup(runs)
+    ok = result["version_ms"] <= budget_ms and not result["eager_modules"]
+    color = Fore.GREEN if ok else Fore.RED
+    print(f"{color}[+] startup  import {result['import_ms']} ms  --version {result['version_ms']} ms  "
+          f"(budget {budget_ms} ms, median of {runs})")
+    if result["eager_modules"]:
+        print(f"{Fore.RED}[-] Loaded at import time: {', '.join(result['eager_modules'])}")
+    return dict(result, budget_ms=budget_ms, ok=ok)
+
+def main():
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description="FinderBuster offline benchmark: mock sites, stub DNS, mock WHOIS, no live traffic")
+    parser.add_argument("--suite", nargs="+", choices=SUITES, default=list(SUITES), help="Workloads to run (default: all)")
+    parser.add_argument("--engine", nargs="+", choices=["thread", "async"], default=["thread"],
+                        help="Probe engines for the username suite (default: thread)")
+    parser.add_argument("--concurrency", nargs="+", type=int, default=[10, 50], help="Concurrency levels (default: 10 50)")
+    parser.add_argument("--count", type=int, default=50,
+                        help="Usernames, domains or profiles per run (default: 50; each username is probed on every site)")
+    parser.add_argument("--latency", type=float, default=DEFAULT_SCENARIO["latency_ms"], help="Mean server latency in ms")
+    parser.add_argument("--jitter", type=float, default=DEFAULT_SCENARIO["jitter_ms"], help="Latency jitter in ms (+/-)")
+    parser.add_argument("--body-size", type=int, default=DEFAULT_SCENARIO["body_kb"], help="Page size in KB")
+    parser.add_argument("--found-rate", type=float, default=DEFAULT_SCENARIO["found_rate"],
+                        help="Fraction of usernames that exist on a site")
+    parser.add_argument("--throttle-rate", type=float, default=DEFAULT_SCENARIO["throttle_rate"],
+                        help="Fraction of requests answered with 429")
+    parser.add_argument("--timeout-rate", type=float, default=DEFAULT_SCENARIO["timeout_rate"],
+                        help="Fraction of requests that hang past the request timeout")
+    parser.add_argument("--request-timeout", type=float, default=DEFAULT_SCENARIO["request_timeout"],
+                        help="Client request timeout in seconds during the benchmark")
+    parser.add_argument("--dns-latency", type=float, default=DEFAULT_SCENARIO["dns_latency_ms"], help="Stub DNS delay in ms")
+    parser.add_argument("--whois-latency", type=float, default=DEFAULT_SCENARIO["whois_latency_ms"], help="Mock WHOIS server delay in ms")
+    parser.add_argument("--rate", type=float, help="Per-host rate limit in requests/second (default: unlimited)")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SCENARIO["seed"], help="Seed for simulated latency and failures")
+    parser.add_argument("--json", help="Write the results to this JSON file")
+    parser.add_argument("--startup", action="store_true",
+                        help="Only check startup time and eager imports; exits non-zero when over budget")
+    parser.add_argument("--startup-budget", type=float, default=STARTUP_BUDGET_MS,
+                        help=f"Startup budget for --version in ms (default: {STARTUP_BUDGET_MS})")
+    args = parser.parse_args()
+
+    if args.startup:
+        result = check_startup(STARTUP_RUNS, args.startup_budget)
+        if args.json:
+            with open(args.json, "w", encoding="utf-8") as f:
+                json.dump({"startup": result}, f, indent=4)
+            print(f"{Fore.GREEN}[+] Results saved to {args.json}")
+        sys.exit(0 if result["ok"] else 1)
+
+    scenario = dict(DEFAULT_SCENARIO, latency_ms=args.latency, jitter_ms=args.jitter, body_kb=args.body_size,
+                    found_rate=args.found_rate, throttle_rate=args.throttle_rate, timeout_rate=args.timeout_rate,
+                    request_timeout=args.request_timeout, dns_latency_ms=args.dns_latency,
+                    whois_latency_ms=args.whois_latency, seed=args.seed)
+
+    print(f"{Fore.YELLOW}[*] FinderBuster benchmark: {', '.join(args.suite)} at concurrency {args.concurrency}, "
+          f"{args.latency}+/-{args.jitter} ms latency, {args.body_size} KB pages")
+    results = run_suite(args.suite, args.engine, args.concurrency, args.count, scenario, args.rate)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"scenario": scenario, "results": results}, f, indent=4)
+        print(f"{Fore.GREEN}[+] Results saved to {args.json}")
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        print(f"\n{Fore.YELLOW}[!] Benchmark interrupted by user")
+        sys.exit(0)